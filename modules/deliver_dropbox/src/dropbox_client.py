@@ -34,6 +34,10 @@ class DropboxClient(Protocol):
     def create_or_get_share_link(self, *, remote_path: str) -> str:
         ...
 
+    def close(self) -> None:
+        """Release per-run resources; called once when the delivery run ends."""
+        ...
+
 
 def _http_post_json(url: str, token: str, payload: Dict[str, Any], timeout: int = 30) -> Dict[str, Any]:
     import urllib.request
@@ -72,6 +76,9 @@ class DropboxHttpClient:
     def __init__(self, token: str):
         self._token = token
 
+    def close(self) -> None:
+        pass
+
     def upload_resumable(self, *, local_path: Path, remote_path: str, chunk_bytes: int) -> None:
         # Dropbox content API endpoints
         start_url = "https://content.dropboxapi.com/2/files/upload_session/start"
@@ -156,6 +163,11 @@ class DropboxDevStubClient:
     def __init__(self, stub_root: Path):
         self._root = stub_root
         self._root.mkdir(parents=True, exist_ok=True)
+        # Re-checks of an unchanged stub object reuse its persisted digest; the index is
+        # saved once, by close().
+        from platform.utils.hashing import digest_cache
+
+        self._digests = digest_cache(self._root)
 
     def upload_resumable(self, *, local_path: Path, remote_path: str, chunk_bytes: int) -> None:
         # Simulate chunked upload by copying.
@@ -185,18 +197,21 @@ class DropboxDevStubClient:
         if not p.exists() or not p.is_file():
             return None
 
-        import hashlib
+        from platform.utils.hashing import sha256_file
 
-        h = hashlib.sha256()
-        with p.open("rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                h.update(chunk)
-        return DropboxMetadata(path_display=str(remote_path), size=int(p.stat().st_size), content_hash="", sha256=h.hexdigest())
+        sha = sha256_file(p, self._digests)
+        return DropboxMetadata(path_display=str(remote_path), size=int(p.stat().st_size), content_hash="", sha256=sha)
 
     def create_or_get_share_link(self, *, remote_path: str) -> str:
         # Local pseudo-link
         return f"file://{(self._root / remote_path.lstrip('/')).resolve()}"
 
+    def close(self) -> None:
+        try:
+            self._digests.save()  # type: ignore[union-attr]
+        except OSError:
+            pass
+
 
 def _dev_stub_root(outputs_dir: Path) -> Path:
     """Return a stable dev stub root for Dropbox across reruns.
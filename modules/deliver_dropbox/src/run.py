@@ -56,14 +56,11 @@ def _int_or(v: Any, default: int) -> int:
         return default
 
 
-def _sha256_file(p: Path) -> str:
-    import hashlib
+def _sha256_file(p: Path, runtime_dir: str = "") -> str:
+    # Shared digest cache: the orchestrator has usually hashed this package already.
+    from platform.utils.hashing import digest_cache, sha256_file
 
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    return sha256_file(p, digest_cache(runtime_dir))
 
 
 def _deterministic_remote_path(
@@ -153,7 +150,7 @@ def run(*, params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
         # In orchestrator context, the bound OutputRecord may carry a sha256 hint. If that hint
         # is stale or malformed, trusting it can cause false negatives during post-upload verification.
         sha_hint = str(pkg_meta.get("sha256") or "").strip()
-        pkg_sha256 = _sha256_file(pkg_path)
+        pkg_sha256 = _sha256_file(pkg_path, str((params.get("_platform") or {}).get("runtime_dir") or ""))
 
         remote_path = _deterministic_remote_path(
             tenant_id=tenant_id,
@@ -289,3 +286,6 @@ def run(*, params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
             "output_ref": str(outputs_dir),
             "refund_eligible": refund_eligible,
         }
+    finally:
+        if client is not None:
+            client.close()
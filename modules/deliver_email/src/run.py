@@ -3,7 +3,6 @@ from __future__ import annotations
 import json
 import os
 import smtplib
-import hashlib
 from datetime import datetime, timezone
 from email.message import EmailMessage
 from email.utils import formatdate, make_msgid
@@ -25,12 +24,11 @@ def _write_json(path: Path, obj: Dict[str, Any]) -> None:
     path.write_text(json.dumps(obj, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
 
-def _sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+def _sha256_file(p: Path, runtime_dir: str = "") -> str:
+    # Shared digest cache: the orchestrator has usually hashed this package already.
+    from platform.utils.hashing import digest_cache, sha256_file
+
+    return sha256_file(p, digest_cache(runtime_dir))
 
 
 def _as_local_path(inp: Any) -> Tuple[Path, Dict[str, Any]]:
@@ -262,7 +260,7 @@ def run(*, params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
     pkg_sha256 = ""
     try:
         if bytes_stat > 0:
-            pkg_sha256 = _sha256_file(pkg_path)
+            pkg_sha256 = _sha256_file(pkg_path, str((params.get("_platform") or {}).get("runtime_dir") or ""))
     except Exception:
         pkg_sha256 = ""
 
@@ -35,6 +35,10 @@ class OneDriveClient(Protocol):
     def create_or_get_share_link(self, *, remote_path: str) -> str:
         ...
 
+    def close(self) -> None:
+        """Release per-run resources; called once when the delivery run ends."""
+        ...
+
 
 def _http_json(
     *,
@@ -131,6 +135,9 @@ class OneDriveHttpClient:
     def __init__(self, token: str):
         self._token = token
 
+    def close(self) -> None:
+        pass
+
     def upload_resumable(self, *, local_path: Path, remote_path: str, chunk_bytes: int) -> None:
         rp = remote_path if remote_path.startswith("/") else "/" + remote_path
         # Create an upload session. Graph requires URL encoding for path segments; we keep the path raw
@@ -216,6 +223,11 @@ class OneDriveDevStubClient:
     def __init__(self, stub_root: Path):
         self._root = stub_root
         self._root.mkdir(parents=True, exist_ok=True)
+        # Re-checks of an unchanged stub object reuse its persisted digest; the index is
+        # saved once, by close().
+        from platform.utils.hashing import digest_cache
+
+        self._digests = digest_cache(self._root)
 
     def upload_resumable(self, *, local_path: Path, remote_path: str, chunk_bytes: int) -> None:
         rp = remote_path.lstrip("/")
@@ -243,25 +255,28 @@ class OneDriveDevStubClient:
         if not p.exists() or not p.is_file():
             return None
 
-        import hashlib
+        from platform.utils.hashing import sha256_file
 
-        h = hashlib.sha256()
-        with p.open("rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                h.update(chunk)
+        sha = sha256_file(p, self._digests)
 
         return OneDriveMetadata(
             remote_path=remote_path,
             size=int(p.stat().st_size),
             item_id="devstub",
             web_url="",
-            sha256=h.hexdigest(),
+            sha256=sha,
         )
 
     def create_or_get_share_link(self, *, remote_path: str) -> str:
         # No real links in dev stub.
         return ""
 
+    def close(self) -> None:
+        try:
+            self._digests.save()  # type: ignore[union-attr]
+        except OSError:
+            pass
+
 
 def _dev_stub_root(outputs_dir: Path) -> Path:
     """Locate the stub root at the runtime directory (the parent of the "runs" folder) when possible."""
@@ -50,14 +50,11 @@ def _int_or(v: Any, default: int) -> int:
         return int(default)
 
 
-def _sha256_file(p: Path) -> str:
-    import hashlib
+def _sha256_file(p: Path, runtime_dir: str = "") -> str:
+    # Shared digest cache: the orchestrator has usually hashed this package already.
+    from platform.utils.hashing import digest_cache, sha256_file
 
-    h = hashlib.sha256()
-    with p.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    return sha256_file(p, digest_cache(runtime_dir))
 
 
 def _deterministic_remote_path(
@@ -136,7 +133,7 @@ def run(*, params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
         pkg_bytes = actual_bytes
 
         sha_hint = str(pkg_meta.get("sha256") or "").strip()
-        pkg_sha256 = _sha256_file(pkg_path)
+        pkg_sha256 = _sha256_file(pkg_path, str((params.get("_platform") or {}).get("runtime_dir") or ""))
 
         base_path = str((inputs or {}).get("remote_base_path") or "/Apps/Platform").strip()
 
@@ -234,3 +231,6 @@ def run(*, params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
             "output_ref": str(outputs_dir),
             "refund_eligible": refund_eligible,
         }
+    finally:
+        if client is not None:
+            client.close()
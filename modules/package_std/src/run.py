@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import csv
 import json
-import os
 import re
+import shutil
+import tempfile
 import zipfile
 from dataclasses import asdict
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
-from platform.utils.hashing import sha256_file
+from platform.artifacts.packaging import package_key
+from platform.utils.hashing import DigestCache, digest_cache
+from platform.artifacts.parallel_zip import DeflatedEntry, deflate_in_order, write_deflated
 
 
 MODULE_ID = "package_std"
@@ -107,35 +110,132 @@ def _write_manifest_csv(path: Path, files: List[Dict[str, Any]]) -> None:
             w.writerow(out_row)
 
 
-def _zip_deterministic(zip_path: Path, manifest_json: Path, manifest_csv: Path, staged_root: Path, files: List[Dict[str, Any]]) -> None:
-    # Deterministic ZIP: stable entry order, stable timestamps, stable permissions.
-    fixed_dt = (1980, 1, 1, 0, 0, 0)
+_FIXED_DT = (1980, 1, 1, 0, 0, 0)
 
-    def _zipinfo(name: str) -> zipfile.ZipInfo:
-        zi = zipfile.ZipInfo(filename=name, date_time=fixed_dt)
-        zi.compress_type = zipfile.ZIP_DEFLATED
-        zi.create_system = 3
-        zi.external_attr = (0o644 & 0xFFFF) << 16
-        return zi
 
-    entries: List[Tuple[str, Path]] = []
-    entries.append(("manifest.json", manifest_json))
-    entries.append(("manifest.csv", manifest_csv))
-    for row in files:
-        dp = str(row.get("dest_path") or "").replace("\\\\", "/")
-        sp = staged_root / dp
-        entries.append((dp, sp))
+def _zipinfo(name: str) -> zipfile.ZipInfo:
+    # Deterministic ZIP: stable timestamps, stable permissions.
+    zi = zipfile.ZipInfo(filename=name, date_time=_FIXED_DT)
+    zi.compress_type = zipfile.ZIP_DEFLATED
+    zi.create_system = 3
+    zi.external_attr = (0o644 & 0xFFFF) << 16
+    return zi
 
-    # Ensure order is stable.
-    entries = sorted(entries, key=lambda t: t[0])
 
+def _write_package(
+    outputs_dir: Path, sources: Dict[str, Tuple[Path, Dict[str, Any]]], missing_pairs: List[Dict[str, str]]
+) -> List[Dict[str, Any]]:
+    """Build package.zip plus manifest.{json,csv} in one read of every source file.
+
+    Entries are deflated concurrently (platform.artifacts.parallel_zip), hashing each source in
+    the same pass, and written in name order. manifest.{csv,json} sit among them but need every
+    file's sha256, so compressed entries sorting after manifest.csv are held on disk until the
+    manifests exist. Returns the manifest rows (dest_path, bytes, sha256, ...) of the packaged files.
+    """
+    zip_path = outputs_dir / "package.zip"
     if zip_path.exists():
         zip_path.unlink()
 
-    with zipfile.ZipFile(zip_path, "w") as zf:
-        for arcname, src in entries:
-            data = src.read_bytes()
-            zf.writestr(_zipinfo(arcname), data)
+    names = sorted(sources)
+    files_meta: List[Dict[str, Any]] = []
+    held: List[DeflatedEntry] = []
+    try:
+        with zipfile.ZipFile(zip_path, "w") as zf:
+            items = ((_zipinfo(n), sources[n][0]) for n in names)
+            for entry in deflate_in_order(items, sha256=True):
+                dest_path = entry.zinfo.filename
+                files_meta.append({"dest_path": dest_path, "bytes": entry.file_size, "sha256": entry.sha256, **sources[dest_path][1]})
+                # A bound file named like a manifest sorts before the manifest entry itself.
+                if dest_path <= "manifest.csv":
+                    write_deflated(zf, entry)
+                    entry.close()
+                else:
+                    entry.raw.rollover()  # type: ignore[union-attr]
+                    held.append(entry)
+
+            manifest = {
+                "schema_version": 1,
+                "module_id": MODULE_ID,
+                "files": files_meta,
+                "missing_outputs": missing_pairs,
+            }
+            manifest_json_path = outputs_dir / "manifest.json"
+            manifest_csv_path = outputs_dir / "manifest.csv"
+            _write_manifest_json(manifest_json_path, manifest)
+            _write_manifest_csv(manifest_csv_path, files_meta)
+
+            zf.writestr(_zipinfo("manifest.csv"), manifest_csv_path.read_bytes())
+            manifest_json_written = False
+            for entry in held:
+                if not manifest_json_written and entry.zinfo.filename > "manifest.json":
+                    zf.writestr(_zipinfo("manifest.json"), manifest_json_path.read_bytes())
+                    manifest_json_written = True
+                write_deflated(zf, entry)
+            if not manifest_json_written:
+                zf.writestr(_zipinfo("manifest.json"), manifest_json_path.read_bytes())
+    finally:
+        for entry in held:
+            entry.close()
+    return files_meta
+
+
+PACKAGE_FILES = ("package.zip", "manifest.json", "manifest.csv")
+
+
+def _package_key(
+    files: List[Tuple[str, int, str]],
+    sources: Dict[str, Tuple[Path, Dict[str, Any]]],
+    missing_pairs: List[Dict[str, str]],
+) -> str:
+    # Everything that ends up in the archive: file identity plus the per-file manifest columns.
+    meta = [[dest_path, sources[dest_path][1]] for dest_path in sorted(sources)]
+    return package_key(files, {"module_id": MODULE_ID, "schema_version": 1, "meta": meta, "missing_outputs": missing_pairs})
+
+
+def _known_package_key(
+    sources: Dict[str, Tuple[Path, Dict[str, Any]]],
+    missing_pairs: List[Dict[str, str]],
+    digests: DigestCache,
+) -> Optional[str]:
+    # Only digests already known for the sources' current stat are used, so a miss never
+    # reads an input twice: the deflate pass hashes it and the key is derived from that.
+    files = []
+    for dest_path in sorted(sources):
+        src_file = sources[dest_path][0]
+        sha = digests.lookup(src_file)
+        if sha is None:
+            return None
+        files.append((dest_path, src_file.stat().st_size, sha))
+    return _package_key(files, sources, missing_pairs)
+
+
+def _copy_files(src_dir: Path, dst_dir: Path) -> None:
+    # Copies, not hard links: a later in-place write to an output must not reach the cache.
+    for n in PACKAGE_FILES:
+        shutil.copyfile(src_dir / n, dst_dir / n)
+
+
+def _reuse_package(cached: Path, outputs_dir: Path) -> bool:
+    if not all((cached / n).is_file() for n in PACKAGE_FILES):
+        return False
+    _copy_files(cached, outputs_dir)
+    return True
+
+
+def _save_package(outputs_dir: Path, cached: Path) -> None:
+    if cached.exists():
+        return
+    cached.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=cached.parent, prefix=".pkg-"))
+    try:
+        _copy_files(outputs_dir, tmp)
+        try:
+            tmp.rename(cached)
+        except OSError:
+            pass  # a concurrent run saved the same key first
+    finally:
+        if tmp.exists():
+            shutil.rmtree(tmp, ignore_errors=True)
 
 
 def run(params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
@@ -147,18 +247,9 @@ def run(params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
     if not isinstance(bound, list) or not bound:
         return _error(outputs_dir, "missing_required_input", "Input 'bound_outputs' is required and must be a non-empty list")
 
-    staging = outputs_dir / "_staging"
-    if staging.exists():
-        # Clean staging deterministically.
-        for root, dirs, files in os.walk(staging, topdown=False):
-            for fn in files:
-                Path(root, fn).unlink(missing_ok=True)
-            for dn in dirs:
-                Path(root, dn).rmdir()
-        staging.rmdir()
-    staging.mkdir(parents=True, exist_ok=True)
-
-    files_meta: List[Dict[str, Any]] = []
+    # dest_path -> (source file, manifest metadata). Sources are read once, while zipping;
+    # a later binding to the same dest_path replaces the earlier one.
+    sources: Dict[str, Tuple[Path, Dict[str, Any]]] = {}
     missing_outputs: List[Dict[str, Any]] = []
 
     for i, item in enumerate(bound):
@@ -201,25 +292,16 @@ def run(params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
             return _error(outputs_dir, "bad_input_format", f"bound_outputs[{i}] invalid as_path: {e}")
 
         def _stage_one(src_file: Path, dest_path: str) -> None:
-            dest_abs = staging / dest_path
-            dest_abs.parent.mkdir(parents=True, exist_ok=True)
-            dest_abs.write_bytes(src_file.read_bytes())
-
-            sha = sha256_file(dest_abs)
-            bs = int(dest_abs.stat().st_size)
-
-            files_meta.append(
+            sources[dest_path] = (
+                src_file,
                 {
-                    "dest_path": dest_path,
-                    "bytes": bs,
-                    "sha256": sha,
                     "content_type": str(rec.get("content_type") or ""),
                     "source_step_id": str(rec.get("step_id") or ""),
                     "source_module_id": str(rec.get("module_id") or ""),
                     "source_output_id": str(rec.get("output_id") or ""),
                     "source_path": str(rec.get("path") or ""),
                     "source_uri": str(rec.get("uri") or uri),
-                }
+                },
             )
 
         if src_path.is_file():
@@ -261,32 +343,49 @@ def run(params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
         for m in (missing_outputs or [])
     ]
 
-    # Deterministic ordering.
-    files_meta = sorted(files_meta, key=lambda r: (str(r.get("dest_path") or ""), str(r.get("sha256") or "")))
-
-    if not files_meta:
+    if not sources:
         return _fail(outputs_dir, "package_failed", {"message": "No files were staged for packaging", "missing_outputs": missing_pairs})
 
-    manifest = {
-        "schema_version": 1,
-        "module_id": MODULE_ID,
-        "files": files_meta,
-        "missing_outputs": missing_pairs,
-    }
-
-    manifest_json_path = outputs_dir / "manifest.json"
-    manifest_csv_path = outputs_dir / "manifest.csv"
-    package_zip_path = outputs_dir / "package.zip"
+    # With a cache dir (set by the orchestrator), an unchanged set of inputs reuses the
+    # previously built package instead of recompressing it. Saved packages are reported in
+    # cache_refs so the orchestrator indexes them in cache_index for pruning.
+    plat = params.get("_platform") or {}
+    cache_dir = str(plat.get("cache_dir") or "").strip()
+    digests: Optional[DigestCache] = None
+    if cache_dir:
+        digests = digest_cache(plat.get("runtime_dir") or cache_dir)
+        key = _known_package_key(sources, missing_pairs, digests) if digests is not None else None
+        cached = Path(cache_dir) / "packages" / key if key else None
+        if cached is not None and _reuse_package(cached, outputs_dir):
+            return {
+                "status": "COMPLETED",
+                "files": list(PACKAGE_FILES),
+                "metadata": {"module_id": MODULE_ID, "file_count": len(sources), "reused": True},
+                "cache_refs": [str(cached)],
+            }
 
-    _write_manifest_json(manifest_json_path, manifest)
-    _write_manifest_csv(manifest_csv_path, files_meta)
-    _zip_deterministic(package_zip_path, manifest_json_path, manifest_csv_path, staging, files_meta)
+    stats = {dest_path: src.stat() for dest_path, (src, _) in sources.items()}
+    files_meta = _write_package(outputs_dir, sources, missing_pairs)
+    cache_refs: List[str] = []
+    if digests is not None:
+        for m in files_meta:
+            digests.remember(sources[m["dest_path"]][0], m["sha256"], stats[m["dest_path"]])
+        if not plat.get("runtime_dir"):
+            digests.save()  # the module owns a digest index rooted at its cache dir
+        key = _package_key([(m["dest_path"], int(m["bytes"]), m["sha256"]) for m in files_meta], sources, missing_pairs)
+        cached = Path(cache_dir) / "packages" / key
+        try:
+            _save_package(outputs_dir, cached)
+            cache_refs.append(str(cached))
+        except OSError as e:
+            print(f"[package_std][WARN] could not save package for reuse: {e}")
 
     return {
         "status": "COMPLETED",
-        "files": ["package.zip", "manifest.json", "manifest.csv"],
+        "files": list(PACKAGE_FILES),
         "metadata": {
             "module_id": MODULE_ID,
             "file_count": len(files_meta),
         },
+        "cache_refs": cache_refs,
     }
@@ -3,15 +3,30 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from platform.cache.search_responses import SearchResponseCache, search_response_cache
 
 
 MODULE_ID = "wxi"
 
+SEARCH_ENDPOINT = "https://www.googleapis.com/customsearch/v1"
+
+# Downloads run on a bounded pool while result pages are still being fetched. Each host gets
+# at most DOWNLOADS_PER_HOST concurrent connections; files larger than MAX_DOWNLOAD_BYTES are
+# dropped like failed downloads.
+DOWNLOAD_WORKERS = 8
+DOWNLOADS_PER_HOST = 4
+MAX_DOWNLOAD_BYTES = 25 * 1024 * 1024
+
 
 def run(params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
     """Google Custom Search Images.
@@ -143,12 +158,14 @@ def run(params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
             return {"status": "COMPLETED", "files": files, "metadata": {"total_written": total_written, "mock_mode": True}}
 
         # Real API path
-        with results_path.open("w", encoding="utf-8") as out_f:
-            # Open indexes lazily only if downloading
-            thumbs_idx = thumbs_index_path.open("w", encoding="utf-8") if download_thumbnails else None
-            imgs_idx = imgs_index_path.open("w", encoding="utf-8") if download_images else None
-
-            try:
+        search_cache = search_response_cache(params)
+        downloader = _Downloader(workers=DOWNLOAD_WORKERS, per_host=DOWNLOADS_PER_HOST, max_bytes=MAX_DOWNLOAD_BYTES)
+        # (url, query, download) per result, in result order; index files are written from
+        # these once every download has finished.
+        thumb_jobs: List[Tuple[str, str, "Future[Optional[Path]]"]] = []
+        image_jobs: List[Tuple[str, str, "Future[Optional[Path]]"]] = []
+        try:
+            with results_path.open("w", encoding="utf-8") as out_f:
                 for qi, q in enumerate(queries, start=1):
                     written_for_q = 0
                     page = 0
@@ -168,6 +185,7 @@ def run(params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
                             img_type=img_type,
                             img_color_type=img_color_type,
                             img_dominant_color=img_dominant_color,
+                            cache=search_cache,
                         )
                         items = batch.get("items") or []
                         if not items and batch.get("error"):
@@ -186,29 +204,24 @@ def run(params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
                             if download_thumbnails:
                                 url = norm.get("thumbnailLink") or ""
                                 if url:
-                                    fp = _download_file(session, url, thumbs_dir)
-                                    if fp is not None:
-                                        thumbs_idx.write(json.dumps({"url": url, "path": str(fp.relative_to(outputs_dir)), "query": q}, ensure_ascii=False) + "\n")
-                                        total_downloaded_thumbs += 1
+                                    thumb_jobs.append((url, q, downloader.submit(url, thumbs_dir)))
 
                             if download_images:
                                 url = norm.get("link") or ""
                                 if url:
-                                    fp = _download_file(session, url, imgs_dir)
-                                    if fp is not None:
-                                        imgs_idx.write(json.dumps({"url": url, "path": str(fp.relative_to(outputs_dir)), "query": q}, ensure_ascii=False) + "\n")
-                                        total_downloaded_images += 1
+                                    image_jobs.append((url, q, downloader.submit(url, imgs_dir)))
 
                         start += 10
                         time.sleep(0.05)
 
                     per_query.append({"query_index": qi, "query": q, "requested": max_items_per_query, "written": written_for_q, "pages_requested": page, "last_error": last_error})
+        finally:
+            downloader.close()
 
-            finally:
-                if thumbs_idx is not None:
-                    thumbs_idx.close()
-                if imgs_idx is not None:
-                    imgs_idx.close()
+        if download_thumbnails:
+            total_downloaded_thumbs = _write_download_index(thumbs_index_path, thumb_jobs, outputs_dir)
+        if download_images:
+            total_downloaded_images = _write_download_index(imgs_index_path, image_jobs, outputs_dir)
 
         report = {
             "module_id": MODULE_ID,
@@ -222,6 +235,7 @@ def run(params: Dict[str, Any], outputs_dir: Path) -> Dict[str, Any]:
             "downloaded_thumbnails": total_downloaded_thumbs,
             "downloaded_images": total_downloaded_images,
             "per_query": per_query,
+            "search_cache": search_cache.stats() if search_cache is not None else None,
             "elapsed_ms": int((time.time() - t0) * 1000),
         }
         report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
@@ -264,6 +278,7 @@ def _fetch_page(
     img_type: Optional[str],
     img_color_type: Optional[str],
     img_dominant_color: Optional[str],
+    cache: Optional[SearchResponseCache] = None,
 ) -> Dict[str, Any]:
     params: Dict[str, Any] = {
         "key": api_key,
@@ -283,12 +298,21 @@ def _fetch_page(
     if img_dominant_color:
         params["imgDominantColor"] = img_dominant_color
 
-    r = session.get("https://www.googleapis.com/customsearch/v1", params=params, timeout=30)
+    if cache is not None:
+        cached = cache.get(SEARCH_ENDPOINT, params)
+        if cached is not None:
+            return cached
+
+    r = session.get(SEARCH_ENDPOINT, params=params, timeout=30)
     try:
         data = r.json()
     except Exception:
         data = {"error": {"message": f"Non-JSON response (status={r.status_code})"}}
-    return data if isinstance(data, dict) else {"error": {"message": "Invalid JSON"}}
+    if not isinstance(data, dict):
+        return {"error": {"message": "Invalid JSON"}}
+    if cache is not None and r.status_code == 200:
+        cache.put(SEARCH_ENDPOINT, params, data)
+    return data
 
 
 def _normalize_item(module_id: str, query: str, query_index: int, item: Dict[str, Any], batch_meta: Dict[str, Any]) -> Dict[str, Any]:
@@ -308,8 +332,28 @@ def _normalize_item(module_id: str, query: str, query_index: int, item: Dict[str
     }
 
 
-def _download_file(session: requests.Session, url: str, out_dir: Path) -> Optional[Path]:
-    """Best-effort downloader. Returns file path or None."""
+def _canonical_url(url: str) -> str:
+    """URL identity for download dedupe: scheme/host case, default ports and fragments ignored."""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port if parts.port not in ({"http": 80, "https": 443}.get(scheme), None) else None
+    netloc = host if port is None else f"{host}:{port}"
+    if parts.username or parts.password:
+        netloc = parts.netloc.rsplit("@", 1)[0] + "@" + netloc
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+def _download_file(session: requests.Session, url: str, out_dir: Path, max_bytes: int = MAX_DOWNLOAD_BYTES) -> Optional[Path]:
+    """Best-effort downloader. Returns file path or None.
+
+    The body is streamed to a .part file and renamed once complete; bodies over max_bytes
+    are discarded.
+    """
+    part: Optional[Path] = None
     try:
         h = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
         # Guess extension
@@ -321,20 +365,92 @@ def _download_file(session: requests.Session, url: str, out_dir: Path) -> Option
         fp = out_dir / f"{h}{ext}"
         if fp.exists():
             return fp
-        r = session.get(url, stream=True, timeout=30)
-        if r.status_code >= 400:
-            return None
-        with fp.open("wb") as f:
-            for chunk in r.iter_content(chunk_size=1024 * 64):
-                if chunk:
-                    f.write(chunk)
+        with session.get(url, stream=True, timeout=30) as r:
+            if r.status_code >= 400:
+                return None
+            if _int(r.headers.get("Content-Length"), default=0) > max_bytes:
+                return None
+            part = fp.with_name(fp.name + ".part")
+            size = 0
+            with part.open("wb") as f:
+                for chunk in r.iter_content(chunk_size=1024 * 64):
+                    if chunk:
+                        size += len(chunk)
+                        if size > max_bytes:
+                            return None
+                        f.write(chunk)
         # Avoid zero-byte artifacts
-        if fp.stat().st_size == 0:
-            fp.unlink(missing_ok=True)
+        if size == 0:
             return None
+        part.replace(fp)
+        part = None
         return fp
     except Exception:
         return None
+    finally:
+        if part is not None:
+            part.unlink(missing_ok=True)
+
+
+class _Downloader:
+    """Bounded concurrent downloads, deduplicated by canonical URL per output directory."""
+
+    def __init__(self, *, workers: int, per_host: int, max_bytes: int) -> None:
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="wxi-dl")
+        self._per_host = max(1, per_host)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, threading.BoundedSemaphore] = {}
+        self._jobs: Dict[Tuple[str, Path], "Future[Optional[Path]]"] = {}
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        # requests.Session is not thread-safe: one per worker thread.
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({"User-Agent": "PlatformModule/wxi google_search_images"})
+            adapter = HTTPAdapter(pool_connections=self._per_host, pool_maxsize=self._per_host)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    def _host_slot(self, canonical: str) -> threading.BoundedSemaphore:
+        host = urlsplit(canonical).netloc
+        with self._lock:
+            slot = self._hosts.get(host)
+            if slot is None:
+                slot = self._hosts[host] = threading.BoundedSemaphore(self._per_host)
+            return slot
+
+    def _fetch(self, url: str, canonical: str, out_dir: Path) -> Optional[Path]:
+        with self._host_slot(canonical):
+            return _download_file(self._session(), url, out_dir, self._max_bytes)
+
+    def submit(self, url: str, out_dir: Path) -> "Future[Optional[Path]]":
+        canonical = _canonical_url(url)
+        key = (canonical, out_dir)
+        with self._lock:
+            fut = self._jobs.get(key)
+            if fut is None:
+                fut = self._jobs[key] = self._pool.submit(self._fetch, url, canonical, out_dir)
+            return fut
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+def _write_download_index(index_path: Path, jobs: List[Tuple[str, str, "Future[Optional[Path]]"]], outputs_dir: Path) -> int:
+    """Write one index line per successfully downloaded result, in result order."""
+    written = 0
+    with index_path.open("w", encoding="utf-8") as idx:
+        for url, query, fut in jobs:
+            fp = fut.result()
+            if fp is not None:
+                idx.write(json.dumps({"url": url, "path": str(fp.relative_to(outputs_dir)), "query": query}, ensure_ascii=False) + "\n")
+                written += 1
+    return written
 
 
 def _error(outputs_dir: Path, reason_slug: str, message: str) -> Dict[str, Any]:
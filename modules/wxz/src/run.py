@@ -3,7 +3,9 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
@@ -11,9 +13,26 @@ from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
 
+from platform.cache.search_responses import SearchResponseCache, search_response_cache
+
+from wxz_paging import SeenUrls, TokenBucket
+
 
 MODULE_ID = "wxz"
 
+SEARCH_ENDPOINT = "https://www.googleapis.com/customsearch/v1"
+
+# Queries are paged concurrently; every request (retries included) takes a token from one
+# shared bucket so the step stays within the upstream per-second quota.
+QUERY_WORKERS = 5
+REQUESTS_PER_SECOND = 5.0
+REQUEST_BURST = 5
+
+# only_new_results: URL keys emitted by earlier runs are kept per tenant under the module's
+# _platform.cache_dir as 8-byte sha256 prefixes, oldest first, capped at
+# wxz_paging.MAX_SEEN_URLS.
+SEEN_URLS_FILE = "seen_urls.u64"
+
 
 TRACKING_PARAMS_PREFIXES = (
     "utm_",
@@ -73,6 +92,7 @@ def run(params: Dict[str, Any], outputs_dir: str) -> Dict[str, Any]:
     dedupe_cfg = params.get("dedupe") or {}
     dedupe_enabled = bool(dedupe_cfg.get("enabled", True))
     strip_tracking = bool(dedupe_cfg.get("strip_tracking_params", True))
+    only_new_results = bool(params.get("only_new_results", False))
     # Optional mock mode (must be explicitly requested by the workorder).
     # If enabled, the module will not call Google and will instead emit a small
     # deterministic result set.
@@ -149,71 +169,139 @@ def run(params: Dict[str, Any], outputs_dir: str) -> Dict[str, Any]:
             report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
             return {"status": "COMPLETED", "files": ["results.jsonl", "report.json"], "metadata": {"total_written": total_written, "mock_mode": True}}
 
-        with results_path.open("w", encoding="utf-8") as out_f:
-            for qi, q in enumerate(queries, start=1):
-                written_for_q = 0
-                fetched_for_q = 0
-                page = 0
-                last_error: Optional[str] = None
-                start = 1  # Google start index is 1-based.
-                while written_for_q < max_items_per_query:
-                    page += 1
-                    batch = _fetch_page(
-                        session=session,
-                        api_key=api_key,
-                        engine_id=engine_id,
-                        query=q,
-                        start=start,
-                        safe=safe,
-                        filter_duplicates=filter_duplicates,
-                        params=params,
-                    )
-                    items = batch.get("items") or []
-                    if not items and batch.get("error"):
-                        last_error = str((batch.get("error") or {}).get("message") or "")
-                    if not items:
+        limiter = TokenBucket(REQUESTS_PER_SECOND, REQUEST_BURST)
+        search_cache = search_response_cache(params)
+        seen: Optional[SeenUrls] = None
+        cache_dir = str((params.get("_platform") or {}).get("cache_dir") or "").strip()
+        if only_new_results and cache_dir:
+            seen = SeenUrls(Path(cache_dir) / SEEN_URLS_FILE)
+        local = threading.local()
+
+        def _page(q: str, start: int) -> Dict[str, Any]:
+            # requests.Session is not thread-safe: one per worker thread.
+            sess = getattr(local, "session", None)
+            if sess is None:
+                sess = local.session = requests.Session()
+                sess.headers.update(session.headers)
+            return _fetch_page(
+                session=sess,
+                api_key=api_key,
+                engine_id=engine_id,
+                query=q,
+                start=start,
+                safe=safe,
+                filter_duplicates=filter_duplicates,
+                params=params,
+                limiter=limiter,
+                cache=search_cache,
+            )
+
+        def _url_key(norm: Dict[str, Any]) -> str:
+            url_key = norm.get("canonical_url") or norm.get("url") or ""
+            if strip_tracking and url_key:
+                url_key = _strip_tracking(url_key)
+            if url_key:
+                url_key = _canonicalize_url(url_key)
+            return url_key
+
+        def _fully_seen(items: List[Dict[str, Any]]) -> bool:
+            # A page made only of results emitted by earlier runs ends the query: later pages
+            # of a recurring search are older still.
+            return seen is not None and all(seen.seen_before(_url_key({"url": str(it.get("link") or "").strip()})) for it in items)
+
+        def _prefetch(q: str) -> List[Dict[str, Any]]:
+            # Pages this query needs even before cross-query dedupe. Dedupe across queries
+            # only removes results, so the ordered pass below may need more pages, never fewer.
+            pages: List[Dict[str, Any]] = []
+            own: set[str] = set()
+            written = 0
+            while written < max_items_per_query:
+                batch = _page(q, 1 + 10 * len(pages))
+                pages.append(batch)
+                items = batch.get("items") or []
+                if not items or _fully_seen(items):
+                    break
+                for it in items:
+                    if written >= max_items_per_query:
                         break
-                    for it in items:
-                        fetched_for_q += 1
-                        if written_for_q >= max_items_per_query:
+                    key = _url_key({"url": str(it.get("link") or "").strip()})
+                    if seen is not None and seen.seen_before(key):
+                        continue
+                    if dedupe_enabled and key:
+                        if key in own:
+                            continue
+                        own.add(key)
+                    written += 1
+            return pages
+
+        with ThreadPoolExecutor(max_workers=max(1, min(QUERY_WORKERS, len(queries))), thread_name_prefix="wxz") as pool:
+            prefetched = list(pool.map(_prefetch, queries))
+
+            # Ordered pass: same results, dedupe and stats as paging the queries one by one.
+            with results_path.open("w", encoding="utf-8") as out_f:
+                for qi, q in enumerate(queries, start=1):
+                    pages = prefetched[qi - 1]
+                    written_for_q = 0
+                    fetched_for_q = 0
+                    previously_seen_for_q = 0
+                    page = 0
+                    last_error: Optional[str] = None
+                    start = 1  # Google start index is 1-based.
+                    while written_for_q < max_items_per_query:
+                        page += 1
+                        batch = pages[page - 1] if page <= len(pages) else _page(q, start)
+                        items = batch.get("items") or []
+                        if not items and batch.get("error"):
+                            last_error = str((batch.get("error") or {}).get("message") or "")
+                        if not items:
                             break
-                        norm = _normalize_item(
-                            module_id=MODULE_ID,
-                            query=q,
-                            query_index=qi,
-                            item=it,
-                            batch_meta=batch,
-                        )
-                        url_key = norm.get("canonical_url") or norm.get("url") or ""
-                        if strip_tracking and url_key:
-                            url_key = _strip_tracking(url_key)
-                        if url_key:
-                            url_key = _canonicalize_url(url_key)
-                        if dedupe_enabled and url_key:
-                            if url_key in seen_urls:
+                        if _fully_seen(items):
+                            fetched_for_q += len(items)
+                            previously_seen_for_q += len(items)
+                            break
+                        for it in items:
+                            fetched_for_q += 1
+                            if written_for_q >= max_items_per_query:
+                                break
+                            norm = _normalize_item(
+                                module_id=MODULE_ID,
+                                query=q,
+                                query_index=qi,
+                                item=it,
+                                batch_meta=batch,
+                            )
+                            url_key = _url_key(norm)
+                            if seen is not None and seen.seen_before(url_key):
+                                previously_seen_for_q += 1
                                 continue
-                            seen_urls.add(url_key)
-                        norm["canonical_url"] = url_key
-                        out_f.write(json.dumps(norm, ensure_ascii=False) + "\n")
-                        written_for_q += 1
-                        total_written += 1
+                            if dedupe_enabled and url_key:
+                                if url_key in seen_urls:
+                                    continue
+                                seen_urls.add(url_key)
+                            norm["canonical_url"] = url_key
+                            out_f.write(json.dumps(norm, ensure_ascii=False) + "\n")
+                            written_for_q += 1
+                            total_written += 1
+                            if seen is not None:
+                                seen.add(url_key)
+
+                        start += 10  # fixed 10 per page
 
-                    start += 10  # fixed 10 per page
-                    # A small backoff to reduce risk of burst throttling.
-                    time.sleep(0.05)
-
-                per_query_stats.append(
-                    {
-                        "query_index": qi,
-                        "query": q,
-                        "requested": max_items_per_query,
-                        "written": written_for_q,
-                        "fetched_items_total": fetched_for_q,
-                        "pages_requested": page,
-                        "last_error": last_error,
-                    }
-                )
+                    per_query_stats.append(
+                        {
+                            "query_index": qi,
+                            "query": q,
+                            "requested": max_items_per_query,
+                            "written": written_for_q,
+                            "fetched_items_total": fetched_for_q,
+                            "pages_requested": page,
+                            "previously_seen": previously_seen_for_q,
+                            "last_error": last_error,
+                        }
+                    )
 
+        # Only after results.jsonl is complete, so a failed run does not hide results next time.
+        seen_added = seen.save() if seen is not None else 0
         report = {
             "module_id": MODULE_ID,
             "queries_count": len(queries),
@@ -226,6 +314,13 @@ def run(params: Dict[str, Any], outputs_dir: str) -> Dict[str, Any]:
             },
             "total_written": total_written,
             "per_query": per_query_stats,
+            "search_cache": search_cache.stats() if search_cache is not None else None,
+            "only_new_results": {
+                "requested": only_new_results,
+                "active": seen is not None,
+                "known_before": seen.known_before if seen is not None else 0,
+                "added": seen_added,
+            },
         }
         report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
@@ -266,8 +361,10 @@ def _fetch_page(
     safe: str,
     filter_duplicates: bool,
     params: Dict[str, Any],
+    limiter: Optional["TokenBucket"] = None,
+    cache: Optional[SearchResponseCache] = None,
 ) -> Dict[str, Any]:
-    url = "https://www.googleapis.com/customsearch/v1"
+    url = SEARCH_ENDPOINT
     q = query
     if params.get("low_range") and params.get("high_range"):
         q = f"{q} {params.get('low_range')}..{params.get('high_range')}"
@@ -301,9 +398,16 @@ def _fetch_page(
 
     # Non-image search only: do NOT send searchType=image even if present.
 
+    if cache is not None:
+        cached = cache.get(url, p)
+        if cached is not None:
+            return cached
+
     last_err: Optional[str] = None
     for attempt in range(1, 4):
         try:
+            if limiter is not None:
+                limiter.acquire()
             resp = session.get(url, params=p, timeout=30)
             if resp.status_code >= 500:
                 last_err = f"HTTP {resp.status_code}"
@@ -315,6 +419,8 @@ def _fetch_page(
                 err = data.get("error") or {}
                 msg = err.get("message") or f"HTTP {resp.status_code}"
                 raise RuntimeError(msg)
+            if cache is not None:
+                cache.put(url, p, data)
             return data
         except Exception as e:
             last_err = str(e)
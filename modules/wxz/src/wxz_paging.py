@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+# Request pacing and only_new_results bookkeeping for the wxz search runner (run.py).
+MAX_SEEN_URLS = 200_000
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self._rate = max(float(rate), 0.001)
+        self._capacity = float(max(1, burst))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class SeenUrls:
+    """URL keys emitted by earlier runs of a tenant, stored as 8-byte sha256 prefixes.
+
+    Lookups go against the set as loaded at the start of the run; keys added during the run
+    are persisted by save(), which merges with whatever another run saved in the meantime.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._before = frozenset(self._load(path))
+        self._added: Dict[int, None] = {}
+
+    @property
+    def known_before(self) -> int:
+        return len(self._before)
+
+    @staticmethod
+    def _load(path: Path) -> List[int]:
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return []
+        data = data[: len(data) - len(data) % 8]
+        return [v for (v,) in struct.iter_unpack(">Q", data)]
+
+    @staticmethod
+    def _digest(url_key: str) -> int:
+        return int.from_bytes(hashlib.sha256(url_key.encode("utf-8")).digest()[:8], "big")
+
+    def seen_before(self, url_key: str) -> bool:
+        return bool(url_key) and self._digest(url_key) in self._before
+
+    def add(self, url_key: str) -> None:
+        if url_key:
+            self._added[self._digest(url_key)] = None
+
+    def save(self) -> int:
+        """Persist the keys added during this run; returns how many were new to the file."""
+        if not self._added:
+            return 0
+        current = self._load(self.path)
+        present = set(current)
+        new = [d for d in self._added if d not in present]
+        merged = (current + new)[-MAX_SEEN_URLS:]
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(struct.pack(f">{len(merged)}Q", *merged))
+            os.replace(tmp, self.path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return len(new)
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Optional
 
+from ..utils.hashing import DigestCache
 from ..utils.hashing import sha256_file as _sha256_file
 
 
-def sha256_file(path: Path) -> str:
+def sha256_file(path: Path, cache: Optional[DigestCache] = None) -> str:
     """Compute SHA-256 for a file.
 
     A single canonical implementation is exposed here so packaging, publishing,
-    and delivery verification can depend on one stable import path.
+    and delivery verification can depend on one stable import path. Pass a
+    DigestCache (platform.utils.hashing.digest_cache) to skip unchanged files.
     """
 
-    return _sha256_file(path)
+    return _sha256_file(path, cache)
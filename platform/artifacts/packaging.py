@@ -1,12 +1,14 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import zipfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from .checksums import sha256_file
+from .parallel_zip import file_zipinfo, write_entries
 
 
 @dataclass(frozen=True)
@@ -15,23 +17,89 @@ class ZipEntry:
     source_path: Path
 
 
-def create_zip(*, zip_path: Path, entries: Iterable[ZipEntry]) -> Tuple[str, int]:
+PACKAGE_KEY_SIDECAR_SUFFIX = ".package_key.json"
+
+
+def package_key(files: Iterable[Tuple[str, int, str]], options: Optional[Dict[str, Any]] = None) -> str:
+    """Identity of a package build: its sorted (path, size, sha256) inputs plus packaging options.
+
+    Two builds with the same key produce equivalent archives, so an existing archive with the
+    key can be reused instead of recompressed.
+    """
+    payload = {
+        "version": 1,
+        "files": sorted([str(p), int(n), str(h)] for p, n, h in files),
+        "options": options or {},
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _key_sidecar(zip_path: Path) -> Path:
+    return zip_path.with_name(zip_path.name + PACKAGE_KEY_SIDECAR_SUFFIX)
+
+
+def reusable_package(zip_path: Path, reuse_key: str) -> Optional[Tuple[str, int]]:
+    """(sha256, bytes_size) of the archive at zip_path if it was built with reuse_key, else None."""
+    sidecar = _key_sidecar(zip_path)
+    if not zip_path.exists() or not sidecar.exists():
+        return None
+    try:
+        rec = json.loads(sidecar.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    size = int(zip_path.stat().st_size)
+    if rec.get("package_key") != reuse_key or int(rec.get("bytes", -1)) != size or not rec.get("sha256"):
+        return None
+    return str(rec["sha256"]), size
+
+
+def _record_package(zip_path: Path, reuse_key: Optional[str], digest: str, size: int) -> None:
+    sidecar = _key_sidecar(zip_path)
+    if not reuse_key:
+        sidecar.unlink(missing_ok=True)
+        return
+    sidecar.write_text(json.dumps({"package_key": reuse_key, "sha256": digest, "bytes": size}, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def _write_zip_entries(zf: zipfile.ZipFile, entries: Iterable[ZipEntry], workers: Optional[int]) -> None:
+    items = []
+    for e in entries:
+        src = e.source_path
+        if not src.exists():
+            raise FileNotFoundError(f"ZIP entry source not found: {src}")
+        items.append((file_zipinfo(zf, src, e.arcname), src))
+    # Entries are deflated concurrently and written in order (see parallel_zip).
+    write_entries(zf, items, workers=workers)
+
+
+def create_zip(
+    *,
+    zip_path: Path,
+    entries: Iterable[ZipEntry],
+    workers: Optional[int] = None,
+    reuse_key: Optional[str] = None,
+) -> Tuple[str, int]:
     """Create a ZIP archive deterministically.
 
+    With reuse_key (see package_key), an archive already built at zip_path with the same key is
+    returned as-is.
+
     Returns:
         (sha256, bytes_size)
     """
+    if reuse_key:
+        hit = reusable_package(zip_path, reuse_key)
+        if hit is not None:
+            return hit
     zip_path.parent.mkdir(parents=True, exist_ok=True)
 
     with zipfile.ZipFile(zip_path, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for e in entries:
-            src = e.source_path
-            if not src.exists():
-                raise FileNotFoundError(f"ZIP entry source not found: {src}")
-            zf.write(src, arcname=e.arcname)
+        _write_zip_entries(zf, entries, workers)
 
     digest = sha256_file(zip_path)
     size = int(zip_path.stat().st_size)
+    _record_package(zip_path, reuse_key, digest, size)
     return digest, size
 
 
@@ -47,9 +115,18 @@ def zip_with_manifest(
     entries: List[ZipEntry],
     manifest: Dict[str, Any],
     manifest_arcname: str = "manifest.json",
+    workers: Optional[int] = None,
+    reuse_key: Optional[str] = None,
 ) -> Tuple[str, int]:
-    """Create a ZIP and include a manifest inside the archive."""
+    """Create a ZIP and include a manifest inside the archive.
 
+    With reuse_key, an archive already built at zip_path with the same key (manifest included)
+    is returned as-is.
+    """
+    if reuse_key:
+        hit = reusable_package(zip_path, reuse_key)
+        if hit is not None:
+            return hit
     zip_path.parent.mkdir(parents=True, exist_ok=True)
 
     tmp_manifest = zip_path.parent / (zip_path.name + ".manifest.tmp.json")
@@ -57,12 +134,7 @@ def zip_with_manifest(
 
     try:
         with zipfile.ZipFile(zip_path, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
-            for e in entries:
-                src = e.source_path
-                if not src.exists():
-                    raise FileNotFoundError(f"ZIP entry source not found: {src}")
-                zf.write(src, arcname=e.arcname)
-            zf.write(tmp_manifest, arcname=manifest_arcname)
+            _write_zip_entries(zf, [*entries, ZipEntry(arcname=manifest_arcname, source_path=tmp_manifest)], workers)
     finally:
         try:
             tmp_manifest.unlink(missing_ok=True)
@@ -71,4 +143,5 @@ def zip_with_manifest(
 
     digest = sha256_file(zip_path)
     size = int(zip_path.stat().st_size)
+    _record_package(zip_path, reuse_key, digest, size)
     return digest, size
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Deque, Iterable, Iterator, Optional, Tuple, Union
+
+
+# Parallel DEFLATE for ZIP archives.
+#
+# Entries are compressed concurrently (zlib releases the GIL) into raw deflate streams, then
+# written in the caller's order with the same local header, CRC and central-directory record
+# that ZipFile.open(zinfo, "w") produces. zlib output does not depend on how the input is
+# chunked, so archives are byte-identical to sequential packaging.
+CHUNK_SIZE = 1024 * 1024
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+EntrySource = Union[Path, bytes]
+
+
+def default_workers() -> int:
+    return min(32, os.cpu_count() or 1)
+
+
+@dataclass
+class DeflatedEntry:
+    zinfo: zipfile.ZipInfo
+    raw: Optional[IO[bytes]]  # raw deflate stream; None for directory entries
+    declared_size: int  # size known before compressing; decides zip64 like ZipFile.open("w")
+    file_size: int
+    compress_size: int
+    crc: int
+    sha256: str = ""
+
+    def close(self) -> None:
+        if self.raw is not None:
+            self.raw.close()
+
+
+def deflate_entry(zinfo: zipfile.ZipInfo, source: EntrySource, *, sha256: bool = False) -> DeflatedEntry:
+    """Compress one entry into a spooled raw deflate stream (bounded memory)."""
+    if zinfo.is_dir():
+        return DeflatedEntry(zinfo=zinfo, raw=None, declared_size=0, file_size=0, compress_size=0, crc=0)
+    if zinfo.compress_type != zipfile.ZIP_DEFLATED:
+        raise ValueError(f"parallel_zip only supports ZIP_DEFLATED entries: {zinfo.filename}")
+    level = getattr(zinfo, "_compresslevel", None)
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION if level is None else level, zlib.DEFLATED, -15)
+    h = hashlib.sha256() if sha256 else None
+    raw = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    crc = 0
+    n = 0
+
+    def _feed(chunk: bytes) -> None:
+        nonlocal crc, n
+        crc = zlib.crc32(chunk, crc)
+        n += len(chunk)
+        if h is not None:
+            h.update(chunk)
+        raw.write(compressor.compress(chunk))
+
+    try:
+        if isinstance(source, bytes):
+            declared = len(source)
+            for i in range(0, len(source), CHUNK_SIZE):
+                _feed(source[i : i + CHUNK_SIZE])
+        else:
+            declared = source.stat().st_size
+            with source.open("rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    _feed(chunk)
+        raw.write(compressor.flush())
+    except BaseException:
+        raw.close()
+        raise
+    compress_size = raw.tell()
+    raw.seek(0)
+    return DeflatedEntry(
+        zinfo=zinfo,
+        raw=raw,
+        declared_size=declared,
+        file_size=n,
+        compress_size=compress_size,
+        crc=crc,
+        sha256=h.hexdigest() if h is not None else "",
+    )
+
+
+def write_deflated(zf: zipfile.ZipFile, entry: DeflatedEntry) -> None:
+    """Append a pre-compressed entry to `zf` (a seekable archive open for writing)."""
+    zi = entry.zinfo
+    if entry.raw is None:
+        zi.compress_size = 0
+        zi.CRC = 0
+        zf.mkdir(zi)
+        return
+    zip64 = entry.declared_size * 1.05 > zipfile.ZIP64_LIMIT
+    if not zip64 and max(entry.file_size, entry.compress_size) > zipfile.ZIP64_LIMIT:
+        raise RuntimeError(f"File size too large for a non-zip64 entry: {zi.filename}")
+    zi.flag_bits = 0x00
+    if not zi.external_attr:
+        zi.external_attr = 0o600 << 16
+    zi.file_size = entry.file_size
+    zi.compress_size = entry.compress_size
+    zi.CRC = entry.crc
+    zf.fp.seek(zf.start_dir)
+    zi.header_offset = zf.fp.tell()
+    zf.fp.write(zi.FileHeader(zip64))
+    for chunk in iter(lambda: entry.raw.read(CHUNK_SIZE), b""):  # type: ignore[union-attr]
+        zf.fp.write(chunk)
+    zf.start_dir = zf.fp.tell()
+    zf.filelist.append(zi)
+    zf.NameToInfo[zi.filename] = zi
+
+
+def deflate_in_order(
+    items: Iterable[Tuple[zipfile.ZipInfo, EntrySource]],
+    *,
+    workers: Optional[int] = None,
+    sha256: bool = False,
+) -> Iterator[DeflatedEntry]:
+    """Deflate `items` on a thread pool and yield the results in input order.
+
+    At most 2 * workers entries are in flight, so memory stays bounded by the spool size.
+    The caller owns (and must close) each yielded entry.
+    """
+    workers = max(1, int(workers or default_workers()))
+    if workers == 1:
+        for zinfo, source in items:
+            yield deflate_entry(zinfo, source, sha256=sha256)
+        return
+    window: Deque[Future] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="deflate") as pool:
+        try:
+            for zinfo, source in items:
+                window.append(pool.submit(deflate_entry, zinfo, source, sha256=sha256))
+                if len(window) >= 2 * workers:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+        finally:
+            for fut in window:
+                if not fut.cancel() and fut.exception() is None:
+                    fut.result().close()
+
+
+def write_entries(
+    zf: zipfile.ZipFile,
+    items: Iterable[Tuple[zipfile.ZipInfo, EntrySource]],
+    *,
+    workers: Optional[int] = None,
+) -> None:
+    """Compress `items` concurrently and write them to `zf` in order."""
+    for entry in deflate_in_order(items, workers=workers):
+        try:
+            write_deflated(zf, entry)
+        finally:
+            entry.close()
+
+
+def file_zipinfo(zf: zipfile.ZipFile, source_path: Path, arcname: str) -> zipfile.ZipInfo:
+    """The ZipInfo ZipFile.write(source_path, arcname) would use."""
+    zinfo = zipfile.ZipInfo.from_file(source_path, arcname, strict_timestamps=getattr(zf, "_strict_timestamps", True))
+    if not zinfo.is_dir():
+        zinfo.compress_type = zf.compression
+        zinfo._compresslevel = zf.compresslevel  # type: ignore[attr-defined]
+    return zinfo
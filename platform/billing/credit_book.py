@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from ..common.id_codec import canon_tenant_id
+from ..infra.errors import ConflictError, NotFoundError
+from ..utils.time import utcnow_iso
+
+
+@dataclass(frozen=True)
+class Reservation:
+    tenant_id: str
+    amount: int
+
+
+class CreditBook:
+    """Keyed view over tenants_credits rows with reserve/commit/release holds.
+
+    The book indexes the caller's row dicts by tenant_id (latest updated_at wins, as in
+    dedupe_tenants_credits) and mutates them in place; tenants first seen by the book are
+    appended to `rows`, so persisting `rows` afterwards persists the book.
+
+    A reservation holds credits for an admitted workorder: `available()` already excludes it,
+    so concurrent workorders of one tenant can never overspend. `commit()` settles the hold
+    into credits_available, `release()` drops it. Reservations are keyed (e.g. by the spend
+    idempotency key), so reserving the same key twice is a no-op.
+
+    With a `ledger` that has `reserve_credits` (the SQL ledgers), every hold is also debited
+    from the shared tenants_credits table under a row lock, so workers on other hosts see
+    it; releases and refunds are returned there. Tenants without a balance row in the
+    ledger are held in this book only.
+    """
+
+    def __init__(self, rows: List[Dict[str, Any]], *, ledger: Any = None) -> None:
+        self.rows = rows
+        self.ledger = ledger if hasattr(ledger, "reserve_credits") else None
+        self._by_tenant: Dict[str, Dict[str, Any]] = {}
+        for r in rows:
+            tid = canon_tenant_id(r.get("tenant_id", ""))
+            if not tid:
+                continue
+            prev = self._by_tenant.get(tid)
+            if prev is None or str(r.get("updated_at", "")) >= str(prev.get("updated_at", "")):
+                self._by_tenant[tid] = r
+        self._held: Dict[str, int] = {}
+        self._reservations: Dict[str, Reservation] = {}
+        # Tenants whose holds are mirrored in the ledger's locked balance.
+        self._ledger_tenants: Set[str] = set()
+        self._lock = threading.RLock()
+
+    def _row(self, tenant_id: str) -> Dict[str, Any]:
+        row = self._by_tenant.get(tenant_id)
+        if row is None:
+            row = {"tenant_id": tenant_id, "credits_available": "0", "updated_at": utcnow_iso(), "status": "active"}
+            self.rows.append(row)
+            self._by_tenant[tenant_id] = row
+        return row
+
+    @staticmethod
+    def _balance(row: Dict[str, Any]) -> int:
+        return int(str(row.get("credits_available", "0")).strip() or "0")
+
+    def _set_balance(self, row: Dict[str, Any], value: int) -> None:
+        row["credits_available"] = str(value)
+        row["updated_at"] = utcnow_iso()
+
+    def balance(self, tenant_id: str) -> int:
+        """Settled credits_available (holds not subtracted)."""
+        with self._lock:
+            return self._balance(self._row(tenant_id))
+
+    def held(self, tenant_id: str) -> int:
+        with self._lock:
+            return self._held.get(tenant_id, 0)
+
+    def available(self, tenant_id: str) -> int:
+        """Credits a new reservation can use: balance minus outstanding holds."""
+        with self._lock:
+            return self._balance(self._row(tenant_id)) - self._held.get(tenant_id, 0)
+
+    def reservation(self, key: str) -> Optional[Reservation]:
+        with self._lock:
+            return self._reservations.get(key)
+
+    def reserve(self, tenant_id: str, key: str, amount: int) -> bool:
+        """Hold `amount` credits under `key`; False (nothing held) if they are not available."""
+        with self._lock:
+            if key in self._reservations:
+                return True
+            if self.available(tenant_id) < int(amount):
+                return False
+            if self.ledger is not None and not self._reserve_in_ledger(tenant_id, int(amount)):
+                return False
+            self._reservations[key] = Reservation(tenant_id=tenant_id, amount=int(amount))
+            self._held[tenant_id] = self._held.get(tenant_id, 0) + int(amount)
+            return True
+
+    def _reserve_in_ledger(self, tenant_id: str, amount: int) -> bool:
+        try:
+            self.ledger.reserve_credits(tenant_id, amount)
+        except NotFoundError:
+            return True
+        except ConflictError:
+            return False
+        self._ledger_tenants.add(tenant_id)
+        return True
+
+    def _return_to_ledger(self, tenant_id: str, amount: int) -> None:
+        if amount and tenant_id in self._ledger_tenants:
+            self.ledger.release_credits(tenant_id, amount)
+
+    def commit(self, key: str) -> int:
+        """Settle the hold under `key` into credits_available. Returns the amount charged."""
+        with self._lock:
+            res = self._reservations.pop(key, None)
+            if res is None:
+                return 0
+            self._held[res.tenant_id] -= res.amount
+            row = self._row(res.tenant_id)
+            self._set_balance(row, self._balance(row) - res.amount)
+            return res.amount
+
+    def release(self, key: str) -> int:
+        """Drop the hold under `key` without charging. Returns the amount released."""
+        with self._lock:
+            res = self._reservations.pop(key, None)
+            if res is None:
+                return 0
+            self._held[res.tenant_id] -= res.amount
+            self._return_to_ledger(res.tenant_id, res.amount)
+            return res.amount
+
+    def credit(self, tenant_id: str, amount: int) -> None:
+        """Add settled credits (top-ups, refunds)."""
+        with self._lock:
+            row = self._row(tenant_id)
+            self._set_balance(row, self._balance(row) + int(amount))
+            self._return_to_ledger(tenant_id, int(amount))
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..utils.csvio import append_csv_rows, read_csv, write_csv
+from ..utils.fs import atomic_write_text
+from ..utils.hashing import sha256_file
+from ..utils.time import utcnow_iso
+
+
+# Optional monthly partitioning of the append-only billing-state tables.
+#
+# A partitioned table `<stem>.csv` is stored as `<stem>/<YYYY-MM>.csv` (month of created_at)
+# and listed in partitions_manifest.json. Partitions before the current month can be closed:
+# a closed partition is immutable, its sha256 is pinned in the manifest, and the manifest
+# keeps just enough summary (work orders touched, per-tenant credit deltas) that a normal run
+# never has to read it.
+PARTITIONS_MANIFEST_NAME = "partitions_manifest.json"
+PARTITIONS_MANIFEST_VERSION = "v1"
+PARTITIONABLE_TABLES = ("transactions.csv", "transaction_items.csv")
+
+_PERIOD_RE = re.compile(r"^(\d{4})-(\d{2})")
+UNDATED_PERIOD = "0000-00"
+
+
+def partition_period(created_at: Any) -> str:
+    """Partition key (YYYY-MM) for a created_at timestamp; undated rows share UNDATED_PERIOD."""
+    m = _PERIOD_RE.match(str(created_at or "").strip())
+    return f"{m.group(1)}-{m.group(2)}" if m else UNDATED_PERIOD
+
+
+def partition_asset_name(table: str, period: str) -> str:
+    """Flat release-asset name for a partition (release assets cannot contain '/')."""
+    return f"{Path(table).stem}.{period}.csv"
+
+
+def load_manifest(root: Path) -> Dict[str, Any]:
+    p = root / PARTITIONS_MANIFEST_NAME
+    if not p.exists():
+        return {"version": PARTITIONS_MANIFEST_VERSION, "tables": {}}
+    data = json.loads(p.read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or str(data.get("version", "")) != PARTITIONS_MANIFEST_VERSION:
+        raise ValueError(f"Unsupported partitions manifest: {p}")
+    data.setdefault("tables", {})
+    return data
+
+
+def save_manifest(root: Path, manifest: Dict[str, Any]) -> None:
+    manifest["updated_at"] = utcnow_iso()
+    atomic_write_text(root / PARTITIONS_MANIFEST_NAME, json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+
+
+def table_entry(manifest: Dict[str, Any], table: str) -> Optional[Dict[str, Any]]:
+    entry = manifest.get("tables", {}).get(table)
+    return entry if isinstance(entry, dict) else None
+
+
+def partition_path(root: Path, table: str, period: str) -> Path:
+    return root / Path(table).stem / f"{period}.csv"
+
+
+def group_by_period(rows: Iterable[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    out: Dict[str, List[Dict[str, Any]]] = {}
+    for r in rows:
+        out.setdefault(partition_period(r.get("created_at")), []).append(r)
+    return out
+
+
+def _work_order_keys(rows: Iterable[Dict[str, Any]]) -> List[str]:
+    keys = {f"{r.get('tenant_id', '')}/{r.get('work_order_id', '')}" for r in rows if str(r.get("work_order_id", "") or "")}
+    return sorted(keys)
+
+
+def select_periods(
+    entry: Dict[str, Any], *, open_only: bool = False, work_orders: Optional[Iterable[Tuple[str, str]]] = None
+) -> List[str]:
+    """Periods a reader has to load, oldest first.
+
+    Without filters every partition is returned. `open_only` restricts to open partitions;
+    `work_orders` adds the closed partitions that mention any of those (tenant_id, work_order_id).
+    """
+    parts: Dict[str, Dict[str, Any]] = entry.get("partitions", {})
+    if not open_only and work_orders is None:
+        return sorted(parts.keys())
+    wanted: Set[str] = {f"{t}/{w}" for t, w in (work_orders or ())}
+    out = []
+    for period, info in parts.items():
+        if not info.get("closed"):
+            out.append(period)
+        elif wanted and wanted.intersection(info.get("work_orders", [])):
+            out.append(period)
+    return sorted(out)
+
+
+def read_partitions(root: Path, table: str, periods: Iterable[str]) -> List[Dict[str, str]]:
+    rows: List[Dict[str, str]] = []
+    for period in periods:
+        rows.extend(read_csv(partition_path(root, table, period)))
+    return rows
+
+
+def _row_tuple(row: Dict[str, Any], headers: List[str]) -> Tuple[str, ...]:
+    return tuple("" if row.get(h) is None else str(row.get(h)) for h in headers)
+
+
+def write_partitioned(root: Path, table: str, rows: List[Dict[str, Any]], headers: List[str]) -> None:
+    """Rewrite the open partitions of `table` from `rows`; closed partitions are never written.
+
+    Rows dated in a closed partition must be exactly the rows on disk (i.e. the rows the
+    caller loaded), otherwise ValueError is raised and nothing is written.
+    """
+    manifest = load_manifest(root)
+    entry = table_entry(manifest, table)
+    if entry is None:
+        raise ValueError(f"{table} is not partitioned")
+    parts: Dict[str, Dict[str, Any]] = entry.setdefault("partitions", {})
+    grouped = group_by_period(rows)
+    for period, prow in grouped.items():
+        info = parts.get(period) or {}
+        if not info.get("closed"):
+            continue
+        on_disk = read_csv(partition_path(root, table, period))
+        if [_row_tuple(r, headers) for r in prow] != [_row_tuple(r, headers) for r in on_disk]:
+            raise ValueError(f"{table}: closed partition {period} is immutable")
+    for period in sorted(set(grouped.keys()) | {p for p, i in parts.items() if not i.get("closed")}):
+        info = parts.setdefault(period, {"closed": False})
+        if info.get("closed"):
+            continue
+        prow = grouped.get(period, [])
+        write_csv(partition_path(root, table, period), prow, headers)
+        info["rows"] = len(prow)
+    entry["headers"] = list(headers)
+    save_manifest(root, manifest)
+
+
+def append_partitioned(root: Path, table: str, rows: List[Dict[str, Any]], headers: List[str]) -> int:
+    """Append rows to their monthly partitions without rewriting them (see append_csv_rows)."""
+    manifest = load_manifest(root)
+    entry = table_entry(manifest, table)
+    if entry is None:
+        raise ValueError(f"{table} is not partitioned")
+    parts: Dict[str, Dict[str, Any]] = entry.setdefault("partitions", {})
+    grouped = group_by_period(rows)
+    closed = sorted(p for p in grouped if (parts.get(p) or {}).get("closed"))
+    if closed:
+        raise ValueError(f"{table}: cannot append to closed partitions {closed}")
+    n = 0
+    for period in sorted(grouped.keys()):
+        written = append_csv_rows(partition_path(root, table, period), grouped[period], headers)
+        info = parts.setdefault(period, {"closed": False})
+        info["rows"] = int(info.get("rows", 0)) + written
+        n += written
+    save_manifest(root, manifest)
+    return n
+
+
+def partition_table(root: Path, table: str, headers: List[str]) -> Dict[str, int]:
+    """Split the monolithic `<table>` into monthly partitions and register them in the manifest.
+
+    The monolithic file is removed once every partition is written. Returns rows per period.
+    """
+    if table not in PARTITIONABLE_TABLES:
+        raise ValueError(f"Table is not partitionable: {table}")
+    manifest = load_manifest(root)
+    if table_entry(manifest, table) is not None:
+        raise ValueError(f"{table} is already partitioned")
+    src = root / table
+    grouped = group_by_period(read_csv(src))
+    parts: Dict[str, Dict[str, Any]] = {}
+    for period in sorted(grouped.keys()):
+        write_csv(partition_path(root, table, period), grouped[period], headers)
+        parts[period] = {"closed": False, "rows": len(grouped[period])}
+    manifest["tables"][table] = {"headers": list(headers), "partitions": parts}
+    save_manifest(root, manifest)
+    if src.exists():
+        src.unlink()
+    return {p: int(i["rows"]) for p, i in parts.items()}
+
+
+def close_partitions(root: Path, before_period: str) -> List[str]:
+    """Close every open partition older than `before_period` (YYYY-MM). Returns closed names.
+
+    Closing pins sha256 and row count, and records the work orders a partition touches; for
+    transactions.csv it also records per-tenant credit deltas so balances can be computed
+    without reading closed history.
+    """
+    from .recompute_credits import _fold_transactions
+
+    if before_period > partition_period(utcnow_iso()):
+        raise ValueError(f"Cannot close partitions at or after the current month: {before_period}")
+    manifest = load_manifest(root)
+    closed: List[str] = []
+    for table, entry in sorted(manifest.get("tables", {}).items()):
+        for period, info in sorted(entry.get("partitions", {}).items()):
+            if info.get("closed") or period >= before_period:
+                continue
+            path = partition_path(root, table, period)
+            rows = read_csv(path)
+            info.update({
+                "closed": True,
+                "rows": len(rows),
+                "sha256": sha256_file(path) if path.exists() else "",
+                "work_orders": _work_order_keys(rows),
+            })
+            if table == "transactions.csv":
+                deltas: Dict[str, int] = {}
+                _fold_transactions(deltas, rows)
+                info["credit_deltas"] = {t: deltas[t] for t in sorted(deltas.keys())}
+            closed.append(partition_asset_name(table, period))
+    save_manifest(root, manifest)
+    return closed
+
+
+def verify_closed_partitions(root: Path) -> List[str]:
+    """Names of closed partitions whose file is missing or no longer matches its pinned sha256."""
+    manifest = load_manifest(root)
+    bad: List[str] = []
+    for table, entry in sorted(manifest.get("tables", {}).items()):
+        for period, info in sorted(entry.get("partitions", {}).items()):
+            if not info.get("closed"):
+                continue
+            path = partition_path(root, table, period)
+            if not path.exists() or sha256_file(path) != str(info.get("sha256", "")):
+                bad.append(partition_asset_name(table, period))
+    return bad
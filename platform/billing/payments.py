@@ -8,6 +8,7 @@ from typing import Dict, List, Optional, Tuple
 from ..utils.csvio import read_csv, require_headers
 from ..common.id_codec import canon_payment_id, canon_tenant_id, canon_topup_method_id, id_key
 from ..common.id_policy import validate_id
+from ..common.id_allocator import IdAllocator
 from .state import BillingState
 from .topup import TopupRequest, apply_admin_topup
 
@@ -121,6 +122,7 @@ def reconcile_repo_payments_into_billing_state(repo_root: Path, billing: Billing
             applied_payment_ids.add(pid)
 
     applied_tx_ids: List[str] = []
+    ids = IdAllocator(billing.root)
     applied = 0
     skipped = 0
     eligible = 0
@@ -152,6 +154,7 @@ def reconcile_repo_payments_into_billing_state(repo_root: Path, billing: Billing
                 reference=reference,
                 note=note,
             ),
+            ids=ids,
         )
 
         # Patch the topup transaction metadata to include payment_id as idempotency marker
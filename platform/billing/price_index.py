@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..utils.csvio import read_csv
+
+
+# Admin-managed pricing (platform/billing/module_prices.csv) compiled into disjoint
+# effective-date segments per (module_id, deliverable_id).
+#
+# Row selection policy (shared by the orchestrator and the CSV LedgerWriter):
+#   - only active=true rows are considered
+#   - empty or unparsable effective_from means "since forever"
+#   - empty effective_to means "open-ended"; an unparsable one excludes the row, so a
+#     malformed end date can never keep a retired price valid
+#   - when several rows cover a date, the latest effective_from wins; ties keep file order
+
+
+@dataclass(frozen=True)
+class PriceSegment:
+    start: date
+    end: Optional[date]  # exclusive; None = open-ended
+    row: Dict[str, str]
+
+
+def _parse_ymd(s: object) -> Optional[date]:
+    ss = str(s or "").strip()
+    if not ss:
+        return None
+    try:
+        return datetime.strptime(ss, "%Y-%m-%d").date()
+    except Exception:
+        return None
+
+
+def _compile_segments(intervals: List[Tuple[date, Optional[date], int, Dict[str, str]]]) -> List[PriceSegment]:
+    bounds = sorted({s for s, _, _, _ in intervals} | {e for _, e, _, _ in intervals if e is not None})
+    segments: List[PriceSegment] = []
+    for i, seg_start in enumerate(bounds):
+        seg_end = bounds[i + 1] if i + 1 < len(bounds) else None
+        best: Optional[Tuple[date, int, Dict[str, str]]] = None
+        for s, e, order, row in intervals:
+            if s > seg_start or (e is not None and e <= seg_start):
+                continue
+            if best is None or s > best[0] or (s == best[0] and order < best[1]):
+                best = (s, order, row)
+        if best is None:
+            continue
+        prev = segments[-1] if segments else None
+        if prev is not None and prev.end == seg_start and prev.row is best[2]:
+            segments[-1] = PriceSegment(start=prev.start, end=seg_end, row=prev.row)
+        else:
+            segments.append(PriceSegment(start=seg_start, end=seg_end, row=best[2]))
+    return segments
+
+
+class PriceIndex:
+    """Effective-dated price rows searchable in O(log n) per (module_id, deliverable_id)."""
+
+    def __init__(self, segments_by_key: Dict[Tuple[str, str], List[PriceSegment]]) -> None:
+        self._segments = segments_by_key
+        self._starts = {k: [s.start for s in segs] for k, segs in segments_by_key.items()}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, str]], *, effective_to_inclusive: bool = False) -> "PriceIndex":
+        grouped: Dict[Tuple[str, str], List[Tuple[date, Optional[date], int, Dict[str, str]]]] = {}
+        for order, r in enumerate(rows):
+            mid = str(r.get("module_id", "") or "").strip()
+            did = str(r.get("deliverable_id", "") or "").strip()
+            if not mid or not did:
+                continue
+            if str(r.get("active", "") or "").strip().lower() != "true":
+                continue
+            start = _parse_ymd(r.get("effective_from", "")) or date.min
+            end = _parse_ymd(r.get("effective_to", ""))
+            if end is None and str(r.get("effective_to", "") or "").strip():
+                continue
+            if end is not None and effective_to_inclusive:
+                end = end + timedelta(days=1) if end < date.max else None
+            if end is not None and end <= start:
+                continue
+            grouped.setdefault((mid, did), []).append((start, end, order, r))
+        return cls({k: _compile_segments(v) for k, v in grouped.items()})
+
+    def keys(self) -> List[Tuple[str, str]]:
+        return sorted(self._segments.keys())
+
+    def resolve_row(self, module_id: str, deliverable_id: str, as_of: date) -> Optional[Dict[str, str]]:
+        key = (str(module_id or "").strip(), str(deliverable_id or "").strip())
+        starts = self._starts.get(key)
+        if not starts:
+            return None
+        i = bisect_right(starts, as_of) - 1
+        if i < 0:
+            return None
+        seg = self._segments[key][i]
+        if seg.end is not None and as_of >= seg.end:
+            return None
+        return seg.row
+
+
+_CACHE_LOCK = threading.Lock()
+_CACHE: Dict[Tuple[str, bool], Tuple[Tuple[int, int], PriceIndex]] = {}
+
+
+def load_price_index(path: Path, *, effective_to_inclusive: bool = False) -> PriceIndex:
+    """Return the compiled index for a prices CSV, re-reading it only when the file changes."""
+    key = (str(path.resolve()), bool(effective_to_inclusive))
+    try:
+        st = path.stat()
+        stamp = (int(st.st_mtime_ns), int(st.st_size))
+    except FileNotFoundError:
+        stamp = (-1, -1)
+
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None and hit[0] == stamp:
+            return hit[1]
+
+    rows = read_csv(path) if stamp[0] >= 0 else []
+    index = PriceIndex.from_rows(rows, effective_to_inclusive=effective_to_inclusive)
+    with _CACHE_LOCK:
+        _CACHE[key] = (stamp, index)
+    return index
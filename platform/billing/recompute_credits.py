@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import csv
+import hashlib
+import io
+import json
 from pathlib import Path
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
+from ..utils.fs import atomic_write_text
 from ..utils.time import utcnow_iso
+from . import partitions as _partitions
 
 
 TENANTS_CREDITS_HEADERS = ["tenant_id", "credits_available", "updated_at", "status"]
@@ -20,6 +25,13 @@ TRANSACTIONS_HEADERS = [
     "metadata_json",
 ]
 
+# Derived helper state: balances per tenant as of a byte high-water mark of transactions.csv.
+# It is never treated as SoT; a digest mismatch always falls back to a full replay.
+CREDITS_CHECKPOINT_NAME = "tenants_credits_checkpoint.json"
+CREDITS_CHECKPOINT_VERSION = "v1"
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
 
 def _read_csv_rows(path: Path) -> List[Dict[str, str]]:
     if not path.exists():
@@ -45,7 +57,198 @@ def _parse_int(v: str) -> int:
         return 0
 
 
-def recompute_tenants_credits(billing_state_dir: Path) -> None:
+def _fold_transactions(balance: Dict[str, int], transactions: List[Dict[str, str]]) -> int:
+    """Apply credit movements to balance in place. Returns number of rows consumed."""
+    n = 0
+    for tx in transactions:
+        n += 1
+        tid = str(tx.get("tenant_id", "")).strip()
+        if not tid:
+            continue
+        ttype = str(tx.get("type", "")).strip().upper()
+        amt = _parse_int(tx.get("amount_credits", "0"))
+
+        if ttype == "TOPUP":
+            balance[tid] = balance.get(tid, 0) + amt
+        elif ttype == "SPEND":
+            balance[tid] = balance.get(tid, 0) - amt
+        elif ttype in ("REFUND", "CREDIT"):
+            balance[tid] = balance.get(tid, 0) + amt
+        elif ttype in ("DEBIT",):
+            balance[tid] = balance.get(tid, 0) - amt
+        else:
+            continue
+    return n
+
+
+def _load_checkpoint(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(data, dict) or str(data.get("version", "")) != CREDITS_CHECKPOINT_VERSION:
+        return None
+    if not isinstance(data.get("balances"), dict):
+        return None
+    return data
+
+
+def _hash_prefix(f: Any, length: int) -> Optional[Any]:
+    h = hashlib.sha256()
+    remaining = int(length)
+    while remaining > 0:
+        chunk = f.read(min(_HASH_CHUNK_BYTES, remaining))
+        if not chunk:
+            return None
+        h.update(chunk)
+        remaining -= len(chunk)
+    return h
+
+
+def _parse_rows(header: List[str], data: bytes) -> List[Dict[str, str]]:
+    if not data:
+        return []
+    reader = csv.DictReader(io.StringIO(data.decode("utf-8"), newline=""), fieldnames=header)
+    return [dict(r) for r in reader]
+
+
+def _complete_records_len(data: bytes) -> int:
+    """Byte length of the leading records the csv reader completes at a line end.
+
+    A quoted field may span lines, so a newline is only a row boundary when the reader
+    says so; a final record that ends only at EOF (no trailing newline, or an open quote)
+    is left out.
+    """
+    consumed = 0
+    exhausted = False
+
+    def lines() -> Any:
+        nonlocal consumed, exhausted
+        for line in io.BytesIO(data):
+            consumed += len(line)
+            yield line.decode("utf-8")
+        exhausted = True
+
+    end = 0
+    for _ in csv.reader(lines()):
+        if exhausted or data[consumed - 1 : consumed] != b"\n":
+            break
+        end = consumed
+    return end
+
+
+def _scan_transactions(
+    path: Path, checkpoint: Optional[Dict[str, Any]]
+) -> Tuple[bool, List[Dict[str, str]], List[Dict[str, str]], int, str]:
+    """Read the part of transactions.csv that is not covered by a valid checkpoint.
+
+    Returns (resumed, rows, partial_rows, new_offset, new_prefix_sha256). Offsets only
+    advance over newline-terminated content so a later append can never extend a covered
+    row; a final row without a trailing newline is returned in partial_rows instead.
+    """
+    with path.open("rb") as f:
+        header_line = f.readline()
+        if not header_line.endswith(b"\n"):
+            return False, [], [], 0, ""
+        header = next(csv.reader([header_line.decode("utf-8").rstrip("\r\n")]), [])
+
+        h: Optional[Any] = None
+        start = len(header_line)
+        if checkpoint is not None:
+            cp_offset = _parse_int(checkpoint.get("byte_offset", 0))
+            cp_digest = str(checkpoint.get("prefix_sha256", "") or "")
+            if cp_offset >= start and cp_digest:
+                f.seek(0)
+                h = _hash_prefix(f, cp_offset)
+                if h is not None and h.hexdigest() == cp_digest:
+                    start = cp_offset
+                else:
+                    h = None
+        resumed = h is not None
+        if h is None:
+            h = hashlib.sha256(header_line)
+        f.seek(start)
+        tail = f.read()
+
+    cut = _complete_records_len(tail)
+    complete = tail[:cut]
+    h.update(complete)
+    return resumed, _parse_rows(header, complete), _parse_rows(header, tail[cut:]), start + len(complete), h.hexdigest()
+
+
+def compute_tenant_balances(billing_state_dir: Path, *, use_checkpoint: bool = True) -> Dict[str, int]:
+    """Return credit balances per tenant, folding only rows past the checkpoint when possible.
+
+    The checkpoint covers a newline-terminated byte prefix of transactions.csv. It is
+    used only when the sha256 of that prefix still matches; any rewrite of covered
+    history triggers a full replay. The checkpoint is refreshed after every call.
+    Partitioned transactions skip the checkpoint: closed partitions contribute their
+    pinned credit deltas and only open partitions are read.
+    """
+    billing_state_dir = billing_state_dir.resolve()
+    entry = _partitions.table_entry(_partitions.load_manifest(billing_state_dir), "transactions.csv")
+    if entry is not None:
+        return _partitioned_balances(billing_state_dir, entry)
+
+    transactions_path = billing_state_dir / "transactions.csv"
+    checkpoint_path = billing_state_dir / CREDITS_CHECKPOINT_NAME
+
+    if not transactions_path.exists():
+        return {}
+
+    cp = _load_checkpoint(checkpoint_path) if use_checkpoint else None
+    resumed, new_rows, partial_rows, new_offset, new_digest = _scan_transactions(transactions_path, cp)
+
+    balance: Dict[str, int] = {}
+    rows_covered = 0
+    if resumed and cp is not None:
+        balance = {str(k): _parse_int(v) for k, v in cp["balances"].items()}
+        rows_covered = _parse_int(cp.get("rows_covered", 0))
+    rows_covered += _fold_transactions(balance, new_rows)
+
+    if new_offset > 0 and new_digest:
+        checkpoint = {
+            "version": CREDITS_CHECKPOINT_VERSION,
+            "byte_offset": new_offset,
+            "prefix_sha256": new_digest,
+            "rows_covered": rows_covered,
+            "updated_at": utcnow_iso(),
+            "balances": {tid: balance[tid] for tid in sorted(balance.keys())},
+        }
+        atomic_write_text(checkpoint_path, json.dumps(checkpoint, indent=2, sort_keys=False) + "\n")
+    # An unterminated last row counts towards the balance but stays outside the checkpoint.
+    _fold_transactions(balance, partial_rows)
+    return balance
+
+
+def _partitioned_balances(billing_state_dir: Path, entry: Dict[str, Any]) -> Dict[str, int]:
+    # Closed partitions contribute their pinned credit deltas; only open ones are read.
+    balance: Dict[str, int] = {}
+    for period, info in sorted(entry.get("partitions", {}).items()):
+        if info.get("closed"):
+            for tid, amt in (info.get("credit_deltas") or {}).items():
+                balance[str(tid)] = balance.get(str(tid), 0) + _parse_int(amt)
+        else:
+            _fold_transactions(balance, _read_csv_rows(_partitions.partition_path(billing_state_dir, "transactions.csv", period)))
+    return balance
+
+
+def full_replay_balances(billing_state_dir: Path) -> Dict[str, int]:
+    """Return credit balances per tenant by replaying all of transactions.csv (no checkpoint I/O)."""
+    billing_state_dir = billing_state_dir.resolve()
+    entry = _partitions.table_entry(_partitions.load_manifest(billing_state_dir), "transactions.csv")
+    balance: Dict[str, int] = {}
+    if entry is None:
+        _fold_transactions(balance, _read_csv_rows(billing_state_dir / "transactions.csv"))
+        return balance
+    for period in sorted(entry.get("partitions", {}).keys()):
+        _fold_transactions(balance, _read_csv_rows(_partitions.partition_path(billing_state_dir, "transactions.csv", period)))
+    return balance
+
+
+def recompute_tenants_credits(billing_state_dir: Path, *, incremental: bool = True, verify: bool = False) -> None:
     """Recompute tenants_credits.csv deterministically from the append-only ledger.
 
     Policy:
@@ -56,13 +259,16 @@ def recompute_tenants_credits(billing_state_dir: Path) -> None:
 
     This recomputation is safe even if tenants_credits.csv was seeded incorrectly
     because ledger history is not rewritten.
+
+    With incremental=True, balances are resumed from tenants_credits_checkpoint.json
+    and only transactions appended since the checkpoint are folded in; incremental=False
+    replays the full ledger without touching the checkpoint. verify=True additionally
+    replays the full ledger and raises ValueError on any difference.
     """
 
     billing_state_dir = billing_state_dir.resolve()
-    transactions_path = billing_state_dir / "transactions.csv"
     tenants_credits_path = billing_state_dir / "tenants_credits.csv"
 
-    transactions = _read_csv_rows(transactions_path)
     existing = _read_csv_rows(tenants_credits_path)
 
     status_by_tenant: Dict[str, str] = {}
@@ -72,24 +278,15 @@ def recompute_tenants_credits(billing_state_dir: Path) -> None:
             continue
         status_by_tenant[tid] = str(r.get("status", "active") or "active").strip() or "active"
 
-    balance: Dict[str, int] = {}
-    for tx in transactions:
-        tid = str(tx.get("tenant_id", "")).strip()
-        if not tid:
-            continue
-        ttype = str(tx.get("type", "")).strip().upper()
-        amt = _parse_int(tx.get("amount_credits", "0"))
-
-        if ttype == "TOPUP":
-            balance[tid] = balance.get(tid, 0) + amt
-        elif ttype == "SPEND":
-            balance[tid] = balance.get(tid, 0) - amt
-        elif ttype in ("REFUND", "CREDIT"):
-            balance[tid] = balance.get(tid, 0) + amt
-        elif ttype in ("DEBIT",):
-            balance[tid] = balance.get(tid, 0) - amt
-        else:
-            continue
+    if incremental:
+        balance = compute_tenant_balances(billing_state_dir)
+    else:
+        balance = full_replay_balances(billing_state_dir)
+    if verify:
+        expected = full_replay_balances(billing_state_dir)
+        if balance != expected:
+            diff = sorted(t for t in (balance.keys() | expected.keys()) if balance.get(t) != expected.get(t))
+            raise ValueError(f"Incremental credits recompute diverged from full replay for tenants: {diff}")
 
     now = utcnow_iso()
     rows: List[Dict[str, str]] = []
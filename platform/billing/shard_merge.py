@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import filecmp
+import json
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from ..common.id_allocator import ID_BLOCKS_NAME, merge_id_blocks
+from ..common.id_codec import dedupe_tenants_credits
+from ..utils.fs import atomic_write_text
+from .recompute_credits import recompute_tenants_credits
+from .state import BillingState
+
+
+# Merging tenant-sharded orchestrator outputs (`orchestrate --shard i/n`).
+#
+# Every shard starts from the same base billing-state and touches only its own tenants, so:
+#   - append-only tables are the base rows followed by the union of rows the shards added,
+#     deduplicated by idempotency key (falling back to the row id) and put in a deterministic
+#     order; two different rows sharing a row id and no idempotency key are an id collision
+#     and fail the merge rather than losing one of them;
+#   - cache_index is merged per (place, type, ref) key from each shard's changes vs. base;
+#   - runtime_evidence_zips/ is the union of the shards' evidence files;
+#   - tenants_credits keeps the latest status per tenant, with balances replayed from the
+#     merged ledger;
+#   - id_blocks.json takes the highest reserved block per id_type.
+# The result matches a single-runner tick up to generated ids and wall-clock timestamps.
+
+TENANTS_CREDITS_HEADERS = ["tenant_id", "credits_available", "updated_at", "status"]
+CACHE_INDEX_HEADERS = ["place", "type", "ref", "created_at", "expires_at"]
+
+
+def _idem_or(id_col: str) -> Callable[[Dict[str, str]], str]:
+    def key(r: Dict[str, str]) -> str:
+        try:
+            meta = json.loads(str(r.get("metadata_json") or "{}"))
+        except Exception:
+            meta = {}
+        idem = str(meta.get("idempotency_key") or "").strip() if isinstance(meta, dict) else ""
+        return f"idem:{idem}" if idem else f"id:{str(r.get(id_col, '')).strip()}"
+
+    return key
+
+
+def _col(id_col: str) -> Callable[[Dict[str, str]], str]:
+    return lambda r: f"id:{str(r.get(id_col, '')).strip()}"
+
+
+# table -> (headers, dedupe key)
+APPEND_ONLY_TABLES: Dict[str, Tuple[List[str], Callable[[Dict[str, str]], str]]] = {
+    "transactions.csv": (
+        ["transaction_id", "tenant_id", "work_order_id", "type", "amount_credits", "created_at", "reason_code", "note", "metadata_json"],
+        _idem_or("transaction_id"),
+    ),
+    "transaction_items.csv": (
+        [
+            "transaction_item_id", "transaction_id", "tenant_id", "module_id", "work_order_id", "step_id",
+            "deliverable_id", "feature", "type", "amount_credits", "created_at", "note", "metadata_json",
+        ],
+        _idem_or("transaction_item_id"),
+    ),
+    "promotion_redemptions.csv": (
+        ["redemption_id", "tenant_id", "promo_code", "credits_granted", "created_at", "note", "metadata_json"],
+        _idem_or("redemption_id"),
+    ),
+    "github_releases_map.csv": (
+        ["release_id", "github_release_id", "tag", "tenant_id", "work_order_id", "created_at"],
+        _col("release_id"),
+    ),
+    "github_assets_map.csv": (
+        ["asset_id", "github_asset_id", "release_id", "asset_name", "created_at"],
+        _col("asset_id"),
+    ),
+}
+
+
+def merge_append_only(
+    base: List[Dict[str, str]], shards: Sequence[List[Dict[str, str]]], key: Callable[[Dict[str, str]], str]
+) -> List[Dict[str, str]]:
+    """Base rows in order, then rows new in any shard, deduplicated and sorted deterministically.
+
+    Raises ValueError when two different rows share an `id:` key (no idempotency key to
+    tell a retry from a cross-shard id collision).
+    """
+    seen = {key(r): r for r in base}
+    added: Dict[str, Dict[str, str]] = {}
+    for rows in shards:
+        for r in rows:
+            k = key(r)
+            prev = seen.get(k, added.get(k))
+            if prev is None:
+                added[k] = r
+            elif k.startswith("id:") and prev != r:
+                raise ValueError(f"Shard merge id collision on {k[3:]!r}: rows differ across shards")
+    order = sorted(
+        added.items(),
+        key=lambda kv: (str(kv[1].get("created_at", "")), str(kv[1].get("tenant_id", "")), str(kv[1].get("work_order_id", "")), kv[0]),
+    )
+    return list(base) + [r for _, r in order]
+
+
+def _cache_key(r: Dict[str, str]) -> Tuple[str, str, str]:
+    return (str(r.get("place", "")), str(r.get("type", "")), str(r.get("ref", "")))
+
+
+def merge_cache_index(base: List[Dict[str, str]], shards: Sequence[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    """Apply every shard's removals, then its additions/updates vs. base; the newest entry wins."""
+    base_by = {_cache_key(r): r for r in base}
+    merged = dict(base_by)
+    updates: Dict[Tuple[str, str, str], Dict[str, str]] = {}
+    for rows in shards:
+        current = {_cache_key(r): r for r in rows}
+        for k in base_by:
+            if k not in current:
+                merged.pop(k, None)
+        for k, r in current.items():
+            if base_by.get(k) == r:
+                continue
+            prev = updates.get(k)
+            if prev is None or (str(r.get("created_at", "")), str(r.get("expires_at", ""))) > (
+                str(prev.get("created_at", "")), str(prev.get("expires_at", ""))
+            ):
+                updates[k] = r
+    merged.update(updates)
+    return [merged[k] for k in sorted(merged.keys())]
+
+
+def merge_tenant_statuses(base: List[Dict[str, str]], shards: Sequence[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    """tenants_credits rows with the latest status change per tenant; balances are left to recompute."""
+    base_by = {str(r.get("tenant_id", "")): r for r in dedupe_tenants_credits(base)}
+    out = {t: dict(r) for t, r in base_by.items()}
+    for rows in shards:
+        for r in dedupe_tenants_credits(rows):
+            tid = str(r.get("tenant_id", ""))
+            if base_by.get(tid) == r:
+                continue
+            cur = out.setdefault(tid, {"tenant_id": tid, "credits_available": "0", "updated_at": "", "status": r.get("status", "")})
+            if str(r.get("updated_at", "")) >= str(cur.get("updated_at", "")):
+                cur["updated_at"] = str(r.get("updated_at", ""))
+                cur["status"] = str(r.get("status", ""))
+    return [out[t] for t in sorted(out.keys())]
+
+
+EVIDENCE_DIR_NAME = "runtime_evidence_zips"
+
+
+def _plan_evidence(shard_dirs: Sequence[Path], dest: Path) -> List[Path]:
+    """Shard evidence files missing from `dest`; raises ValueError before anything is copied."""
+    chosen: Dict[str, Path] = {}
+    for d in shard_dirs:
+        src = d / EVIDENCE_DIR_NAME
+        if not src.is_dir():
+            continue
+        for f in sorted(p for p in src.iterdir() if p.is_file()):
+            other = chosen.get(f.name) or (dest / f.name)
+            if other.exists():
+                if not filecmp.cmp(f, other, shallow=False):
+                    raise ValueError(f"Shard merge evidence conflict: {f.name} differs across shards")
+                continue
+            chosen[f.name] = f
+    return [chosen[n] for n in sorted(chosen)]
+
+
+def merge_evidence_dirs(shard_dirs: Sequence[Path], out_dir: Path) -> int:
+    """Copy every shard's runtime evidence file missing from `out_dir`. Returns files copied."""
+    dest = out_dir / EVIDENCE_DIR_NAME
+    files = _plan_evidence(shard_dirs, dest)
+    for f in files:
+        dest.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(f, dest / f.name)
+    return len(files)
+
+
+def merge_shard_states(base_dir: Path, shard_dirs: Sequence[Path], out_dir: Path) -> Dict[str, int]:
+    """Merge shard billing-state directories (all started from `base_dir`) into `out_dir`.
+
+    `out_dir` may be `base_dir` itself; otherwise it starts as a copy of `base_dir`, so
+    untouched tables and closed partitions carry over. Returns the merged row count per table
+    (plus the number of evidence files copied from the shards). Nothing is written when the
+    merge fails with ValueError.
+    """
+    base = BillingState(base_dir)
+    shards = [BillingState(d) for d in shard_dirs]
+    report: Dict[str, int] = {}
+
+    merged_tables: Dict[str, Tuple[List[Dict[str, str]], List[str]]] = {}
+    for name, (headers, key) in APPEND_ONLY_TABLES.items():
+        # Shards only append to open partitions, so closed history never needs reading.
+        rows = merge_append_only(
+            base.load_table(name, open_only=True), [s.load_table(name, open_only=True) for s in shards], key
+        )
+        merged_tables[name] = (rows, headers)
+    merged_tables["cache_index.csv"] = (
+        merge_cache_index(base.load_table("cache_index.csv"), [s.load_table("cache_index.csv") for s in shards]),
+        CACHE_INDEX_HEADERS,
+    )
+    merged_tables["tenants_credits.csv"] = (
+        merge_tenant_statuses(base.load_table("tenants_credits.csv"), [s.load_table("tenants_credits.csv") for s in shards]),
+        TENANTS_CREDITS_HEADERS,
+    )
+    # Check evidence against base (what out_dir will hold) before writing anything.
+    _plan_evidence(shard_dirs, base_dir / EVIDENCE_DIR_NAME)
+    if out_dir.resolve() != base_dir.resolve():
+        shutil.copytree(base_dir, out_dir, dirs_exist_ok=True)
+    report[EVIDENCE_DIR_NAME] = merge_evidence_dirs(shard_dirs, out_dir)
+    out = BillingState(out_dir)
+    for name, (rows, headers) in merged_tables.items():
+        out.save_table(name, rows, headers)
+        report[name] = len(rows)
+    # Balances come from the merged ledger; the merged rows only contribute statuses.
+    recompute_tenants_credits(out_dir, incremental=False)
+    blocks = merge_id_blocks([d / ID_BLOCKS_NAME for d in [base_dir, *shard_dirs]])
+    if blocks:
+        atomic_write_text(out_dir / ID_BLOCKS_NAME, json.dumps(blocks, indent=2, sort_keys=True) + "\n")
+    return report
@@ -3,11 +3,12 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from ..utils.csvio import read_csv, write_csv
-from ..utils.hashing import sha256_file
+from ..utils.csvio import append_csv_rows, read_csv, write_csv
+from ..utils.hashing import DigestCache, sha256_files
 from ..utils.time import utcnow_iso
+from . import partitions as _partitions
 
 
 # Billing-state assets are the accounting source of truth and live in GitHub Release assets.
@@ -40,28 +41,84 @@ class BillingState:
         They may pass required_files=[...].
         """
         required = required_files or DEFAULT_REQUIRED_FILES
-        missing = [n for n in required if not self.path(n).exists()]
+        missing = [n for n in required if not self.path(n).exists() and not self.is_partitioned(n)]
         if missing:
             raise FileNotFoundError(f"Billing-state is missing required files: {missing}")
 
-    def load_table(self, name: str) -> List[Dict[str, str]]:
-        return read_csv(self.path(name))
+    def is_partitioned(self, name: str) -> bool:
+        return _partitions.table_entry(_partitions.load_manifest(self.root), name) is not None
+
+    def load_table(
+        self,
+        name: str,
+        *,
+        open_only: bool = False,
+        work_orders: Optional[Iterable[Tuple[str, str]]] = None,
+    ) -> List[Dict[str, str]]:
+        """Load a table; partitioned tables are read partition by partition.
+
+        For partitioned tables, `open_only` skips closed partitions and `work_orders` loads
+        only the closed partitions that mention those (tenant_id, work_order_id) pairs.
+        Both are ignored for unpartitioned tables, which are always read in full.
+        """
+        entry = _partitions.table_entry(_partitions.load_manifest(self.root), name)
+        if entry is None:
+            return read_csv(self.path(name))
+        periods = _partitions.select_periods(entry, open_only=open_only, work_orders=work_orders)
+        return _partitions.read_partitions(self.root, name, periods)
 
     def save_table(self, name: str, rows: List[Dict[str, str]], headers: List[str]) -> None:
+        if self.is_partitioned(name):
+            _partitions.write_partitioned(self.root, name, rows, headers)
+            return
         write_csv(self.path(name), rows, headers)
 
-    def write_state_manifest(self, names: Optional[List[str]] = None) -> Path:
+    def append_rows(self, name: str, rows: List[Dict[str, Any]], headers: List[str]) -> int:
+        """Append rows without rewriting the table (routed to monthly partitions if partitioned)."""
+        if self.is_partitioned(name):
+            return _partitions.append_partitioned(self.root, name, rows, headers)
+        return append_csv_rows(self.path(name), rows, headers)
+
+    def write_state_manifest(self, names: Optional[List[str]] = None, *, digests: Optional[DigestCache] = None) -> Path:
         """Write a manifest containing sha256 of selected assets.
 
-        If names is omitted, uses DEFAULT_REQUIRED_FILES.
+        If names is omitted, uses DEFAULT_REQUIRED_FILES. With `digests`, assets unchanged
+        since they were last hashed are not read again.
         """
-        assets: List[Dict[str, str]] = []
+        assets: List[Dict[str, Any]] = []
+        # (asset, path) pairs whose sha256 is filled in below, hashed concurrently.
+        to_hash: List[Tuple[Dict[str, Any], Path]] = []
         use = names or DEFAULT_REQUIRED_FILES
+        pmanifest = _partitions.load_manifest(self.root)
         for n in use:
+            entry = _partitions.table_entry(pmanifest, n)
+            if entry is not None:
+                # Closed partitions are immutable: reuse the pinned digest instead of re-hashing.
+                for period, info in sorted(entry.get("partitions", {}).items()):
+                    pp = _partitions.partition_path(self.root, n, period)
+                    closed = bool(info.get("closed"))
+                    if not closed and not pp.exists():
+                        continue
+                    asset = {
+                        "name": _partitions.partition_asset_name(n, period),
+                        "sha256": str(info.get("sha256", "")) if closed else "",
+                        "closed": closed,
+                    }
+                    if not closed:
+                        to_hash.append((asset, pp))
+                    assets.append(asset)
+                continue
             p = self.path(n)
             if not p.exists():
                 continue
-            assets.append({"name": n, "sha256": sha256_file(p)})
+            assets.append({"name": n, "sha256": ""})
+            to_hash.append((assets[-1], p))
+        if pmanifest.get("tables"):
+            pm = self.path(_partitions.PARTITIONS_MANIFEST_NAME)
+            assets.append({"name": pm.name, "sha256": ""})
+            to_hash.append((assets[-1], pm))
+        for (asset, _), digest in zip(to_hash, sha256_files([pth for _, pth in to_hash], cache=digests)):
+            asset["sha256"] = digest
 
         manifest = {
             "billing_state_version": "v1",
@@ -3,10 +3,10 @@ from __future__ import annotations
 import json
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Dict, Optional
 
-from ..common.id_codec import canon_tenant_id, canon_topup_method_id, id_key, dedupe_tenants_credits
-from ..common.id_policy import generate_unique_id
+from ..common.id_codec import canon_tenant_id, canon_topup_method_id, dedupe_tenants_credits
+from ..common.id_allocator import IdAllocator
 from ..utils.csvio import read_csv
 from ..utils.time import utcnow_iso
 from .state import BillingState
@@ -21,10 +21,6 @@ class TopupRequest:
     note: Optional[str] = None
 
 
-def _new_id(id_type: str, used: Set[str]) -> str:
-    return generate_unique_id(id_type, used)
-
-
 def _load_topup_methods(repo_root: Path) -> Dict[str, Dict[str, str]]:
     cfg = repo_root / "platform" / "billing" / "topup_instructions.csv"
     rows = read_csv(cfg)
@@ -68,9 +64,11 @@ def resolve_default_admin_topup_method_id(repo_root: Path) -> str:
 
 
 
-def apply_admin_topup(repo_root: Path, billing: BillingState, req: TopupRequest) -> str:
+def apply_admin_topup(repo_root: Path, billing: BillingState, req: TopupRequest, *, ids: Optional[IdAllocator] = None) -> str:
     """Apply a manual top-up by appending ledger entries and updating balance.
 
+    `ids` lets a caller applying several top-ups share one allocator (and its reserved blocks).
+
     Billing-state release assets remain the accounting system of record; this function updates the
     local billing-state tables which are later uploaded back to the billing-state release.
     """
@@ -97,11 +95,6 @@ def apply_admin_topup(repo_root: Path, billing: BillingState, req: TopupRequest)
         raise ValueError(f"topup_method_id is disabled: {topup_method_id!r}")
 
     tenants_credits = dedupe_tenants_credits(billing.load_table("tenants_credits.csv"))
-    transactions = billing.load_table("transactions.csv")
-    transaction_items = billing.load_table("transaction_items.csv")
-
-    used_tx: Set[str] = {id_key(r.get("transaction_id")) for r in transactions if id_key(r.get("transaction_id"))}
-    used_ti: Set[str] = {id_key(r.get("transaction_item_id")) for r in transaction_items if id_key(r.get("transaction_item_id"))}
 
     # Ensure tenant exists
     trow = None
@@ -118,8 +111,11 @@ def apply_admin_topup(repo_root: Path, billing: BillingState, req: TopupRequest)
     except Exception as e:
         raise ValueError(f"Invalid credits_available for tenant_id {tenant_id}: {trow.get('credits_available')!r}") from e
 
-    tx_id = _new_id("transaction_id", used_tx)
-    ti_id = _new_id("transaction_item_id", used_ti)
+    if ids is None:
+        ids = IdAllocator(billing.root)
+    # Reserved ID blocks never overlap, so the ledger is appended to without reading it.
+    tx_id = ids.new_id("transaction_id")
+    ti_id = ids.new_id("transaction_item_id")
 
     # Human-readable note (kept in CSV); structured identifiers stay in metadata_json.
     method_name = str(method.get("name") or "").strip()
@@ -135,7 +131,7 @@ def apply_admin_topup(repo_root: Path, billing: BillingState, req: TopupRequest)
     if req.reference:
         meta["reference"] = str(req.reference)
 
-    transactions.append({
+    tx_row = {
         "transaction_id": tx_id,
         "tenant_id": tenant_id,
         "work_order_id": "",
@@ -145,9 +141,9 @@ def apply_admin_topup(repo_root: Path, billing: BillingState, req: TopupRequest)
         "reason_code": "",
         "note": human_note,
         "metadata_json": json.dumps(meta, separators=(",", ":")),
-    })
+    }
 
-    transaction_items.append({
+    item_row = {
         "transaction_item_id": ti_id,
         "transaction_id": tx_id,
         "tenant_id": tenant_id,
@@ -161,14 +157,14 @@ def apply_admin_topup(repo_root: Path, billing: BillingState, req: TopupRequest)
         "created_at": utcnow_iso(),
         "note": human_note,
         "metadata_json": json.dumps(meta, separators=(",", ":")),
-    })
+    }
 
     new_balance = current + int(req.amount_credits)
     trow["credits_available"] = str(new_balance)
     trow["updated_at"] = utcnow_iso()
 
     billing.save_table("tenants_credits.csv", tenants_credits, ["tenant_id","credits_available","updated_at","status"])
-    billing.save_table("transactions.csv", transactions, ["transaction_id","tenant_id","work_order_id","type","amount_credits","created_at","reason_code","note","metadata_json"])
-    billing.save_table("transaction_items.csv", transaction_items, ["transaction_item_id","transaction_id","tenant_id","module_id","work_order_id","step_id","deliverable_id","feature","type","amount_credits","created_at","note","metadata_json"])
+    billing.append_rows("transactions.csv", [tx_row], ["transaction_id","tenant_id","work_order_id","type","amount_credits","created_at","reason_code","note","metadata_json"])
+    billing.append_rows("transaction_items.csv", [item_row], ["transaction_item_id","transaction_id","tenant_id","module_id","work_order_id","step_id","deliverable_id","feature","type","amount_credits","created_at","note","metadata_json"])
 
     return tx_id
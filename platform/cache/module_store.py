@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import shutil
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, List, Optional
+
+from ..infra.contracts import ArtifactStore
+from ..utils.hashing import sha256_file
+
+
+# Two-tier module output cache.
+#
+# L1 is the runner-local tree under runtime/cache_outputs (one directory per cache key).
+# L2 is optional: any ArtifactStore configured as the `module_cache_store` runtime-profile
+# adapter. An L2 entry is a manifest (<prefix>/manifests/<sha256(cache_key)>.json) listing the
+# entry's files, whose contents are stored once as content-addressed blobs
+# (<prefix>/blobs/<sha[:2]>/<sha>). Blobs are uploaded before the manifest, so a visible
+# manifest always refers to complete blobs.
+#
+# L2 entries carry expires_at (same TTL as cache_index module_run rows) and expired entries are
+# ignored; deleting them is left to the store's lifecycle rules.
+#
+# Stores are serialized per cache key: a store waits for the previous write-through of the same
+# key before replacing its L1 directory, so a background upload never hashes a half-copied tree.
+L2_PREFIX = "module-cache"
+MANIFEST_VERSION = 1
+DEFAULT_IO_WORKERS = 8
+
+
+def _dir_has_files(p: Path) -> bool:
+    return p.is_dir() and any(fp.is_file() for fp in p.rglob("*"))
+
+
+def _copy_tree(src: Path, dst: Path) -> None:
+    if dst.exists():
+        shutil.rmtree(dst)
+    shutil.copytree(src, dst)
+
+
+def _safe_relpath(rel: str) -> PurePosixPath:
+    p = PurePosixPath(str(rel or ""))
+    if not p.parts or p.is_absolute() or ".." in p.parts:
+        raise ValueError(f"unsafe cache manifest path: {rel!r}")
+    return p
+
+
+class ModuleOutputCache:
+    def __init__(
+        self,
+        l2: Optional[ArtifactStore] = None,
+        *,
+        prefix: str = L2_PREFIX,
+        ttl_days: Optional[int] = None,
+        io_workers: int = DEFAULT_IO_WORKERS,
+    ) -> None:
+        self.l2 = l2
+        self.prefix = str(prefix or L2_PREFIX).strip("/")
+        self.ttl_days = ttl_days
+        self.io_workers = max(1, int(io_workers))
+        self._lock = threading.Lock()
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._pending: List[Future] = []
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._inflight: Dict[str, Future] = {}
+
+    def manifest_key(self, cache_key: str) -> str:
+        return f"{self.prefix}/manifests/{hashlib.sha256(cache_key.encode('utf-8')).hexdigest()}.json"
+
+    def blob_key(self, sha256: str) -> str:
+        return f"{self.prefix}/blobs/{sha256[:2]}/{sha256}"
+
+    def fetch(self, cache_key: str, cache_dir: Path) -> bool:
+        """True when `cache_dir` holds the entry, pulling it from L2 on an L1 miss."""
+        if _dir_has_files(cache_dir):
+            return True
+        if self.l2 is None:
+            return False
+        try:
+            return self._fetch_l2(cache_key, cache_dir)
+        except Exception as e:
+            print(f"[cache_l2][WARN] fetch failed for {cache_key}: {e}")
+            return False
+
+    def _fetch_l2(self, cache_key: str, cache_dir: Path) -> bool:
+        assert self.l2 is not None
+        mkey = self.manifest_key(cache_key)
+        if not self.l2.exists(mkey):
+            return False
+        cache_dir.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=cache_dir.parent, prefix=".l2-") as tmp:
+            mpath = Path(tmp) / "manifest.json"
+            self.l2.get_to_file(mkey, mpath)
+            manifest = json.loads(mpath.read_text(encoding="utf-8"))
+            if manifest.get("cache_key") != cache_key:
+                return False
+            expires_at = str(manifest.get("expires_at") or "")
+            if expires_at and datetime.fromisoformat(expires_at.replace("Z", "+00:00")) <= datetime.now(timezone.utc):
+                return False
+            files: List[Dict[str, Any]] = list(manifest.get("files") or [])
+            if not files:
+                return False
+            staging = Path(tmp) / "outputs"
+
+            def _get(entry: Dict[str, Any]) -> None:
+                sha = str(entry.get("sha256") or "")
+                dest = staging.joinpath(*_safe_relpath(entry.get("path", "")).parts)
+                self.l2.get_to_file(self.blob_key(sha), dest)  # type: ignore[union-attr]
+                if sha256_file(dest) != sha:
+                    raise ValueError(f"blob digest mismatch for {entry.get('path')}")
+
+            with ThreadPoolExecutor(max_workers=min(self.io_workers, len(files))) as pool:
+                list(pool.map(_get, files))
+            if cache_dir.exists():
+                shutil.rmtree(cache_dir)
+            staging.rename(cache_dir)
+        return True
+
+    def store(self, cache_key: str, out_dir: Path, cache_dir: Path) -> None:
+        """Populate L1 from a completed step's `out_dir`; write through to L2 in the background."""
+        with self._lock:
+            key_lock = self._key_locks.setdefault(cache_key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                prev = self._inflight.get(cache_key)
+            if prev is not None:
+                # Failures are reported by flush(); only the ordering matters here.
+                wait([prev])
+            _copy_tree(out_dir, cache_dir)
+            if self.l2 is None:
+                return
+            with self._lock:
+                if self._writer is None:
+                    self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-l2")
+                fut = self._writer.submit(self._publish, cache_key, cache_dir)
+                self._pending.append(fut)
+                self._inflight[cache_key] = fut
+
+    def _publish(self, cache_key: str, cache_dir: Path) -> None:
+        assert self.l2 is not None
+        files: List[Dict[str, Any]] = []
+        paths: Dict[str, Path] = {}
+        for fp in sorted(cache_dir.rglob("*")):
+            if not fp.is_file():
+                continue
+            sha = sha256_file(fp)
+            files.append({"path": fp.relative_to(cache_dir).as_posix(), "sha256": sha, "bytes": fp.stat().st_size})
+            paths.setdefault(sha, fp)
+        if not files:
+            return
+
+        def _put(item: tuple[str, Path]) -> None:
+            key = self.blob_key(item[0])
+            if not self.l2.exists(key):  # type: ignore[union-attr]
+                self.l2.put_file(key, item[1], "application/octet-stream")  # type: ignore[union-attr]
+
+        with ThreadPoolExecutor(max_workers=min(self.io_workers, len(paths))) as pool:
+            list(pool.map(_put, paths.items()))
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "cache_key": cache_key,
+            "created_at": now.isoformat().replace("+00:00", "Z"),
+            "expires_at": (now + timedelta(days=int(self.ttl_days))).isoformat().replace("+00:00", "Z") if self.ttl_days else "",
+            "files": files,
+        }
+        with tempfile.TemporaryDirectory(prefix="cache-l2-") as tmp:
+            mpath = Path(tmp) / "manifest.json"
+            mpath.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+            self.l2.put_file(self.manifest_key(cache_key), mpath, "application/json")
+
+    def flush(self) -> int:
+        """Wait for pending write-throughs; returns how many failed (each is logged)."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            self._inflight = {k: f for k, f in self._inflight.items() if not f.done()}
+        failed = 0
+        for fut in pending:
+            try:
+                fut.result()
+            except Exception as e:
+                failed += 1
+                print(f"[cache_l2][WARN] write-through failed: {e}")
+        return failed
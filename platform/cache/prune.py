@@ -3,11 +3,12 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from ..billing.state import BillingState
 from ..github.actions_cache import delete_cache, list_caches
 from ..utils.csvio import read_csv, write_csv
+from .search_responses import prune_search_responses
 
 
 @dataclass
@@ -15,6 +16,7 @@ class CachePruneResult:
     rows_before: int
     rows_after: int
     deleted_caches: int
+    deleted_search_responses: int = 0
 
 
 def _parse_iso_z(s: str) -> datetime | None:
@@ -25,13 +27,16 @@ def _parse_iso_z(s: str) -> datetime | None:
     return datetime.fromisoformat(s)
 
 
-def run_cache_prune(billing_state_dir: Path) -> CachePruneResult:
+def run_cache_prune(
+    billing_state_dir: Path, *, search_cache_dir: Optional[Path] = None, search_ttl_days: int = 0
+) -> CachePruneResult:
     """Prune expired GitHub Actions caches.
 
     Behavior (per policy):
       - Reads billing-state cache_index.csv
       - Removes expired caches from GitHub Actions cache storage
       - Removes corresponding rows from cache_index.csv
+      - With search_cache_dir, deletes search responses older than search_ttl_days
       - Writes nothing else
 
     Expected cache_index.csv headers:
@@ -140,4 +145,6 @@ def run_cache_prune(billing_state_dir: Path) -> CachePruneResult:
     headers = ["place", "type", "ref", "created_at", "expires_at"]
     write_csv(billing.path("cache_index.csv"), kept, headers)
 
-    return CachePruneResult(rows_before=rows_before, rows_after=len(kept), deleted_caches=deleted)
+    searches = prune_search_responses(search_cache_dir, search_ttl_days) if search_cache_dir is not None else 0
+
+    return CachePruneResult(rows_before=rows_before, rows_after=len(kept), deleted_caches=deleted, deleted_search_responses=searches)
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+from ..config.validate_platform_config import parse_ttl_days_by_place_type
+
+
+# On-disk cache of search API responses, shared by every tenant and module on a runner.
+#
+# An entry is keyed by the endpoint plus the request parameters with the query normalized
+# (case-folded, whitespace collapsed). The API key is never part of the key or the stored entry,
+# so rotating credentials keeps the cache warm. Entries live at <root>/<key[:2]>/<key>.json and
+# are served while younger than the cache:search_response TTL from platform_config; the age is
+# checked on read, so shortening the TTL takes effect immediately.
+#
+# Only successful responses are stored: errors, quota failures and retries always go to the API.
+# Nothing is cached unless cache_ttl_policy.enabled is on. Expired entries that are never read
+# again are removed by prune_search_responses (`platform cache-prune --runtime-dir`).
+TTL_PLACE_TYPE = "cache:search_response"
+ENTRY_VERSION = 1
+_EXCLUDED_PARAMS = frozenset({"key"})
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize_query(q: Any) -> str:
+    return _WS_RE.sub(" ", str(q or "")).strip().casefold()
+
+
+class SearchResponseCache:
+    def __init__(self, root: Path, ttl_days: int) -> None:
+        self.root = Path(root)
+        self.ttl_seconds = int(ttl_days) * 86400
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def key(self, endpoint: str, params: Mapping[str, Any]) -> Dict[str, Any]:
+        """Canonical request identity: {"endpoint", "params", "sha256"}."""
+        request = {
+            str(k): (normalize_query(v) if k == "q" else str(v))
+            for k, v in params.items()
+            if k not in _EXCLUDED_PARAMS and v is not None
+        }
+        request = dict(sorted(request.items()))
+        blob = json.dumps({"v": ENTRY_VERSION, "endpoint": endpoint, "params": request}, sort_keys=True, separators=(",", ":"))
+        return {"endpoint": endpoint, "params": request, "sha256": hashlib.sha256(blob.encode("utf-8")).hexdigest()}
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.json"
+
+    def get(self, endpoint: str, params: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        path = self._path(self.key(endpoint, params)["sha256"])
+        response: Optional[Dict[str, Any]] = None
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            if time.time() - float(entry.get("stored_at") or 0) < self.ttl_seconds and isinstance(entry.get("response"), dict):
+                response = entry["response"]
+            else:
+                path.unlink(missing_ok=True)
+        except (OSError, ValueError):
+            response = None
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def put(self, endpoint: str, params: Mapping[str, Any], response: Dict[str, Any]) -> None:
+        """Store a successful response. Best effort: a cache write failure never fails the caller."""
+        if not isinstance(response, dict) or response.get("error"):
+            return
+        ident = self.key(endpoint, params)
+        path = self._path(ident["sha256"])
+        entry = {
+            "version": ENTRY_VERSION,
+            "stored_at": time.time(),
+            "endpoint": ident["endpoint"],
+            "params": ident["params"],
+            "response": response,
+        }
+        tmp_name = ""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=path.parent, suffix=".tmp", delete=False) as tmp:
+                tmp_name = tmp.name
+                json.dump(entry, tmp, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_name, path)
+        except OSError:
+            if tmp_name:
+                Path(tmp_name).unlink(missing_ok=True)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def search_ttl_days(platform_cfg: Mapping[str, Any]) -> int:
+    """TTL in days for search responses per platform_config, or 0 when cache_ttl_policy is off.
+
+    Rules are read with the orchestrator's parser, so malformed rules raise ValueError here too.
+    """
+    if not bool((platform_cfg.get("cache_ttl_policy") or {}).get("enabled", False)):
+        return 0
+    place, _, typ = TTL_PLACE_TYPE.partition(":")
+    return parse_ttl_days_by_place_type(platform_cfg).get((place, typ), 0)
+
+
+def prune_search_responses(root: Path, ttl_days: int, *, now: Optional[float] = None) -> int:
+    """Delete entries (and abandoned temp files) older than the TTL; returns how many were removed."""
+    root = Path(root)
+    if not root.is_dir() or int(ttl_days) <= 0:
+        return 0
+    cutoff = (time.time() if now is None else now) - int(ttl_days) * 86400
+    removed = 0
+    for path in sorted(root.glob("*/*")):
+        if path.suffix not in (".json", ".tmp"):
+            continue
+        try:
+            # Entries are written once (atomic replace), so mtime is their stored_at.
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def search_response_cache(params: Mapping[str, Any]) -> Optional[SearchResponseCache]:
+    """Cache configured by the orchestrator for a module run, or None when disabled.
+
+    Reads `_platform.search_cache_dir`, `_platform.cache_ttl_enabled` (cache_ttl_policy.enabled)
+    and the cache:search_response entry of `_platform.cache_ttl_days`; all must be set.
+    """
+    plat = params.get("_platform") or {}
+    if not plat.get("cache_ttl_enabled"):
+        return None
+    root = str(plat.get("search_cache_dir") or "").strip()
+    try:
+        ttl_days = int((plat.get("cache_ttl_days") or {}).get(TTL_PLACE_TYPE) or 0)
+    except (TypeError, ValueError):
+        ttl_days = 0
+    if not root or ttl_days <= 0:
+        return None
+    return SearchResponseCache(Path(root), ttl_days)
@@ -10,6 +10,7 @@ from .infra.factory import build_infra
 
 from .maintenance.builder import run_maintenance
 from .orchestration.orchestrator import run_orchestrator
+from .orchestration.sharding import parse_shard
 from .cache.prune import run_cache_prune
 from .orchestration.module_exec import execute_module_runner
 
@@ -63,6 +64,7 @@ def cmd_orchestrate(args: argparse.Namespace) -> int:
         runtime_dir=runtime_dir,
         enable_github_releases=enable_releases,
         infra=infra,
+        shard=parse_shard(str(getattr(args, "shard", "") or "")),
     )
     return 0
 
@@ -206,13 +208,22 @@ def cmd_admin_topup(args: argparse.Namespace) -> int:
 
 
 def cmd_cache_prune(args: argparse.Namespace) -> int:
-    res = run_cache_prune(Path(args.billing_state_dir).resolve())
+    search_cache_dir = None
+    search_ttl = 0
+    if args.runtime_dir:
+        from .cache.search_responses import search_ttl_days
+        from .config.load_platform_config import load_platform_config
+
+        search_cache_dir = Path(args.runtime_dir).resolve() / "search_cache"
+        search_ttl = search_ttl_days(load_platform_config(_repo_root()))
+    res = run_cache_prune(Path(args.billing_state_dir).resolve(), search_cache_dir=search_cache_dir, search_ttl_days=search_ttl)
     print(
         json.dumps(
             {
                 'rows_before': res.rows_before,
                 'rows_after': res.rows_after,
                 'deleted_caches': res.deleted_caches,
+                'deleted_search_responses': res.deleted_search_responses,
             }
         )
     )
@@ -238,6 +249,74 @@ def cmd_runtime_print(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_export_csv(args: argparse.Namespace) -> int:
+    repo_root = _repo_root()
+    profile = load_runtime_profile(repo_root, cli_path=str(getattr(args, 'runtime_profile', '') or ''))
+    billing_state_dir = Path(args.billing_state_dir).resolve()
+    runtime_dir = Path(args.runtime_dir).resolve()
+    infra = build_infra(repo_root=repo_root, profile=profile, billing_state_dir=billing_state_dir, runtime_dir=runtime_dir)
+
+    # Only database-backed adapters expose export_csv; CSV adapters already write the canonical files.
+    out = {}
+    if hasattr(infra.ledger_writer, "export_csv"):
+        out["ledger_writer"] = infra.ledger_writer.export_csv(billing_state_dir)
+    if hasattr(infra.run_state_store, "export_csv"):
+        out["run_state_store"] = infra.run_state_store.export_csv(runtime_dir / "runstate")
+    print(json.dumps(out, sort_keys=True))
+    return 0
+
+
+def cmd_runstate_compact(args: argparse.Namespace) -> int:
+    from .infra.adapters.runstate_compact import compact_runstate_logs
+
+    state_dir = Path(args.runtime_dir).resolve() / "runstate"
+    print(json.dumps(compact_runstate_logs(state_dir, archive=bool(args.archive)), sort_keys=True))
+    return 0
+
+
+def cmd_runstate_status_rebuild(args: argparse.Namespace) -> int:
+    repo_root = _repo_root()
+    profile = load_runtime_profile(repo_root, cli_path=str(getattr(args, 'runtime_profile', '') or ''))
+    infra = build_infra(
+        repo_root=repo_root,
+        profile=profile,
+        billing_state_dir=Path(args.billing_state_dir).resolve(),
+        runtime_dir=Path(args.runtime_dir).resolve(),
+    )
+    rows = infra.run_state_store.rebuild_status_table()
+    print(json.dumps({"workorders": rows}))
+    return 0
+
+
+def cmd_billing_partition(args: argparse.Namespace) -> int:
+    from .billing import partitions
+    from .infra.adapters.ledger_csv import TRANSACTION_ITEMS_HEADERS, TRANSACTIONS_HEADERS
+
+    root = Path(args.billing_state_dir).resolve()
+    headers = {"transactions.csv": TRANSACTIONS_HEADERS, "transaction_items.csv": TRANSACTION_ITEMS_HEADERS}
+    manifest = partitions.load_manifest(root)
+    out = {"partitioned": {}}
+    for table in partitions.PARTITIONABLE_TABLES:
+        if partitions.table_entry(manifest, table) is None:
+            out["partitioned"][table] = partitions.partition_table(root, table, headers[table])
+    if args.close_before:
+        out["closed"] = partitions.close_partitions(root, str(args.close_before))
+    bad = partitions.verify_closed_partitions(root)
+    out["closed_partitions_modified"] = bad
+    print(json.dumps(out, sort_keys=True))
+    return 2 if bad else 0
+
+
+def cmd_billing_merge_shards(args: argparse.Namespace) -> int:
+    from .billing.shard_merge import merge_shard_states
+
+    base_dir = Path(args.billing_state_dir).resolve()
+    out_dir = Path(args.out_dir).resolve() if args.out_dir else base_dir
+    report = merge_shard_states(base_dir, [Path(d).resolve() for d in args.shard_dir], out_dir)
+    print(json.dumps(report, sort_keys=True))
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="platform")
     p.add_argument('--runtime-profile', default='', help='Path to runtime profile YAML (overrides PLATFORM_RUNTIME_PROFILE and config/runtime_profile.yml)')
@@ -252,6 +331,7 @@ def build_parser() -> argparse.ArgumentParser:
     sp.add_argument("--billing-state-dir", default=".billing-state")
     sp.add_argument("--queue-source", default="", help="Optional override CSV path for workorders_index (used by verification flows)")
     sp.add_argument("--enable-github-releases", action="store_true")
+    sp.add_argument("--shard", default="", help="Process only tenants in shard i of n (i/n, 0-based); merge with billing-merge-shards")
     sp.set_defaults(func=cmd_orchestrate)
 
     sp = sub.add_parser("orchestrator", help="Alias for orchestrate")
@@ -260,6 +340,7 @@ def build_parser() -> argparse.ArgumentParser:
     sp.add_argument("--billing-state-dir", default=".billing-state")
     sp.add_argument("--queue-source", default="", help="Optional override CSV path for workorders_index (used by verification flows)")
     sp.add_argument("--enable-github-releases", action="store_true")
+    sp.add_argument("--shard", default="", help="Process only tenants in shard i of n (i/n, 0-based); merge with billing-merge-shards")
     sp.set_defaults(func=cmd_orchestrate)
 
 
@@ -277,6 +358,7 @@ def build_parser() -> argparse.ArgumentParser:
 
     sp = sub.add_parser("cache-prune", help="Prune Actions caches and update cache_index")
     sp.add_argument("--billing-state-dir", default=".billing-state")
+    sp.add_argument("--runtime-dir", default="", help="Also delete expired search responses under <runtime-dir>/search_cache")
     sp.set_defaults(func=cmd_cache_prune)
 
     sp = sub.add_parser("admin-topup", help="Admin: apply a ledger top-up to billing-state")
@@ -300,6 +382,32 @@ def build_parser() -> argparse.ArgumentParser:
     sp.add_argument("--runtime-dir", default="runtime")
     sp.set_defaults(func=cmd_runtime_print)
 
+    sp = sub.add_parser("export-csv", help="Export database-backed ledger/run-state adapters to canonical CSVs")
+    sp.add_argument("--billing-state-dir", default=".billing-state")
+    sp.add_argument("--runtime-dir", default="runtime")
+    sp.set_defaults(func=cmd_export_csv)
+
+    sp = sub.add_parser("billing-merge-shards", help="Merge billing-state outputs of sharded orchestrator runs")
+    sp.add_argument("--billing-state-dir", default=".billing-state", help="Base billing-state every shard started from")
+    sp.add_argument("--shard-dir", action="append", required=True, help="Billing-state dir written by one shard (repeatable)")
+    sp.add_argument("--out-dir", default="", help="Defaults to --billing-state-dir")
+    sp.set_defaults(func=cmd_billing_merge_shards)
+
+    sp = sub.add_parser("billing-partition", help="Partition transactions/transaction_items by month and close old months")
+    sp.add_argument("--billing-state-dir", default=".billing-state")
+    sp.add_argument("--close-before", default="", help="Close (freeze) partitions older than this month, YYYY-MM")
+    sp.set_defaults(func=cmd_billing_partition)
+
+    sp = sub.add_parser("runstate-compact", help="Rewrite CSV run-state logs keeping only the latest row per key")
+    sp.add_argument("--runtime-dir", default="runtime")
+    sp.add_argument("--archive", action="store_true", help="Append superseded rows to dated <log>.history-YYYYMMDD.csv sidecars")
+    sp.set_defaults(func=cmd_runstate_compact)
+
+    sp = sub.add_parser("runstate-status-rebuild", help="Recreate the materialized workorder status table from run-state logs")
+    sp.add_argument("--billing-state-dir", default=".billing-state")
+    sp.add_argument("--runtime-dir", default="runtime")
+    sp.set_defaults(func=cmd_runstate_status_rebuild)
+
 
     return p
 
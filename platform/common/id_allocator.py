@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ..utils.fs import atomic_write_text
+from .id_policy import BASE62_ALPHABET, BASE62_LETTERS, id_length
+
+try:  # POSIX advisory locks; other platforms fall back to in-process locking only.
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+
+# Block-reserved ID allocation.
+#
+# Each fixed-length id_type has a persisted block high-water mark in <state_dir>/id_blocks.json.
+# An allocator reserves one block of sequence numbers at a time under a file lock and mints
+# IDs from it locally. A sequence number maps to an ID through a fixed bijection over the
+# id_type's whole space (affine permutation, then Base62 with a trailing letter), so distinct
+# sequence numbers never collide and IDs do not look sequential.
+#
+# Sharded writers working on copies of the same state use namespace (i, n): shard i only takes
+# global blocks congruent to i mod n above the high-water mark it started from, so shards never
+# overlap and merging is max(next_block) per id_type.
+ID_BLOCKS_NAME = "id_blocks.json"
+DEFAULT_BLOCK_SIZE = 1024
+_PERMUTE_MULTIPLIER = 1_000_000_007  # prime, hence coprime to every 62**k * 52
+_PERMUTE_OFFSET = 0x5DEECE66D
+
+
+def id_space(id_type: str) -> int:
+    return 62 ** (id_length(id_type) - 1) * 52
+
+
+def encode_sequence(id_type: str, seq: int) -> str:
+    """The ID for sequence number `seq` (bijective over [0, id_space(id_type)))."""
+    n = id_length(id_type)
+    x = (_PERMUTE_MULTIPLIER * int(seq) + _PERMUTE_OFFSET) % id_space(id_type)
+    last = BASE62_LETTERS[x % 52]
+    x //= 52
+    prefix: List[str] = []
+    for _ in range(n - 1):
+        prefix.append(BASE62_ALPHABET[x % 62])
+        x //= 62
+    return "".join(reversed(prefix)) + last
+
+
+class IdAllocator:
+    def __init__(
+        self,
+        state_dir: Path,
+        *,
+        namespace: Optional[Tuple[int, int]] = None,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ) -> None:
+        self.path = state_dir / ID_BLOCKS_NAME
+        self.lock_path = state_dir / (ID_BLOCKS_NAME + ".lock")
+        self.namespace = namespace or (0, 1)
+        self.block_size = int(block_size)
+        self._lock = threading.Lock()
+        self._base: Dict[str, int] = {}
+        self._blocks: Dict[str, Tuple[int, int]] = {}  # id_type -> (next seq, end seq)
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a+") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _read(self) -> Dict[str, Dict[str, int]]:
+        if not self.path.exists():
+            return {}
+        data = json.loads(self.path.read_text(encoding="utf-8"))
+        return data if isinstance(data, dict) else {}
+
+    def _reserve_block(self, id_type: str) -> Tuple[int, int]:
+        i, n = self.namespace
+        with self._file_lock():
+            data = self._read()
+            high = int((data.get(id_type) or {}).get("next_block", 0))
+            base = self._base.setdefault(id_type, high)
+            b = max(0, -(-(high - base - i) // n))
+            block = base + b * n + i
+            if (block + 1) * self.block_size > id_space(id_type):
+                raise ValueError(f"ID space exhausted for {id_type}")
+            data[id_type] = {"next_block": max(high, block + 1)}
+            atomic_write_text(self.path, json.dumps(data, indent=2, sort_keys=True) + "\n")
+        return (block * self.block_size, (block + 1) * self.block_size)
+
+    def new_id(self, id_type: str, used: Optional[Set[str]] = None) -> str:
+        """Mint the next ID for `id_type`; `used` (optional) is skipped over and updated."""
+        with self._lock:
+            while True:
+                nxt, end = self._blocks.get(id_type, (0, 0))
+                if nxt >= end:
+                    nxt, end = self._reserve_block(id_type)
+                self._blocks[id_type] = (nxt + 1, end)
+                out = encode_sequence(id_type, nxt)
+                if used is None or out not in used:
+                    if used is not None:
+                        used.add(out)
+                    return out
+
+
+def merge_id_blocks(paths: List[Path]) -> Dict[str, Dict[str, int]]:
+    """Combine id_blocks.json files from sharded runs: max(next_block) per id_type."""
+    out: Dict[str, Dict[str, int]] = {}
+    for p in paths:
+        if not p.exists():
+            continue
+        for id_type, entry in (json.loads(p.read_text(encoding="utf-8")) or {}).items():
+            nb = int((entry or {}).get("next_block", 0))
+            if nb > int(out.get(id_type, {}).get("next_block", 0)):
+                out[id_type] = {"next_block": nb}
+    return {k: out[k] for k in sorted(out.keys())}
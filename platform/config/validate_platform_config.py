@@ -65,6 +65,24 @@ def _parse_ttl_entry(entry: str) -> Tuple[str, str, int]:
     return place, typ, days
 
 
+def parse_ttl_days_by_place_type(cfg: Mapping[str, Any]) -> Dict[Tuple[str, str], int]:
+    """Parse platform_config.cache_ttl_policy.ttl_days_by_place_type into a mapping.
+
+    Returns: {(place, type): days}
+    Raises: ValueError on invalid or missing structures.
+    """
+    root = cfg.get("cache_ttl_policy") or {}
+    entries = _require_list(root.get("ttl_days_by_place_type"), "platform_config.cache_ttl_policy.ttl_days_by_place_type")
+    out: Dict[Tuple[str, str], int] = {}
+    for i, raw in enumerate(entries):
+        entry = _require_str(raw, f"platform_config.cache_ttl_policy.ttl_days_by_place_type[{i}]").strip()
+        place, typ, days = _parse_ttl_entry(entry)
+        if (place, typ) in out:
+            raise ValueError(f"Duplicate cache_ttl_policy.ttl_days_by_place_type rules for place={place!r} type={typ!r}")
+        out[(place, typ)] = days
+    return out
+
+
 def validate_platform_config(cfg: Dict[str, Any]) -> None:
     """Validate platform_config.yml.
 
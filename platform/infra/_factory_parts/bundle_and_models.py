@@ -47,6 +47,8 @@ class InfraBundle:
     artifact_publisher: ArtifactPublisher
 
     tenant_credentials_store: TenantCredentialsStore | None = None
+    # Optional second-level module output cache (see platform/cache/module_store.py).
+    module_cache_store: ArtifactStore | None = None
 
     # ---------------------------------------------------------------------
     # Backward-compatible attribute aliases
@@ -87,6 +89,7 @@ class InfraBundle:
                 "execution_backend": _d(self.execution_backend),
                 "artifact_publisher": _d(self.artifact_publisher),
                 "tenant_credentials_store": _d(self.tenant_credentials_store) if self.tenant_credentials_store is not None else {"class": "NotConfigured"},
+                "module_cache_store": _d(self.module_cache_store) if self.module_cache_store is not None else {"class": "NotConfigured"},
             },
         }
 
@@ -159,37 +162,6 @@ class PostgresModuleRegistry:
         return {"class": self.__class__.__name__, "dsn": self.dsn}
 
 
-class PostgresRunStateStore:
-    def __init__(self, dsn: str) -> None:
-        self.dsn = dsn
-
-    def append_step_run(self, record: StepRunRecord) -> None:
-        raise NotImplementedError
-
-    def list_step_runs(self, tenant_id: str, work_order_id: str):
-        raise NotImplementedError
-
-    def append_output(self, record: OutputRecord) -> None:
-        raise NotImplementedError
-
-    def list_outputs(self, tenant_id: str, work_order_id: str, step_id: str):
-        raise NotImplementedError
-
-    def describe(self) -> Dict[str, Any]:
-        return {"class": self.__class__.__name__, "dsn": self.dsn}
-
-
-class PostgresLedgerWriter:
-    def __init__(self, dsn: str) -> None:
-        self.dsn = dsn
-
-    def append_transaction_item(self, item: TransactionItemRecord) -> None:
-        raise NotImplementedError
-
-    def describe(self) -> Dict[str, Any]:
-        return {"class": self.__class__.__name__, "dsn": self.dsn}
-
-
 class S3ArtifactStorePlaceholder:
     """Placeholder for the future platform-native S3 integration.
 
@@ -23,9 +23,11 @@ class BillingStateCsvLedgerWriter:
         self.billing = BillingState(billing_state_dir)
 
     def append_transaction_item(self, item: TransactionItemRecord) -> None:
-        p = self.billing.path("transaction_items.csv")
-        rows = read_csv(p)
-        rows.append(
+        self.append_transaction_items([item])
+
+    def append_transaction_items(self, items: List[TransactionItemRecord]) -> int:
+        """Stream items onto transaction_items.csv (or its open monthly partitions) as one group commit."""
+        rows = [
             {
                 "transaction_item_id": item.transaction_item_id,
                 "transaction_id": item.transaction_id,
@@ -41,8 +43,14 @@ class BillingStateCsvLedgerWriter:
                 "note": item.note,
                 "metadata_json": item.metadata_json,
             }
-        )
-        write_csv(p, rows, self.TRANSACTION_ITEMS_HEADERS)
+            for item in items
+        ]
+        if not rows:
+            return 0
+        try:
+            return self.billing.append_rows("transaction_items.csv", rows, self.TRANSACTION_ITEMS_HEADERS)
+        except ValueError as e:
+            raise ValidationError(str(e)) from e
 
     def describe(self) -> Dict[str, Any]:
         return {
@@ -180,6 +188,14 @@ class NoopArtifactPublisher:
         return {"class": self.__class__.__name__}
 
 
+def _sqlite_db_path(repo_root: Path, settings: Dict[str, Any], default: Path) -> Path:
+    raw = str(settings.get("db_path", "") or "").strip()
+    if not raw:
+        return default
+    p = Path(raw).expanduser()
+    return (p if p.is_absolute() else repo_root / p).resolve()
+
+
 def build_infra(
     *,
     repo_root: Path,
@@ -227,9 +243,20 @@ def build_infra(
         from .adapters.runstate_csv import CsvRunStateStore
 
         run_state_store = CsvRunStateStore(runtime_dir / 'runstate')
+    elif rs_kind == "sqlite":
+        from .adapters.runstate_sqlite import SqliteRunStateStore
+
+        rs_db = _sqlite_db_path(repo_root, profile.adapters["run_state_store"].settings, runtime_dir / "runstate" / "runstate.sqlite")
+        run_state_store = SqliteRunStateStore(rs_db)
     elif rs_kind == "db_postgres":
-        dsn = str(profile.adapters["run_state_store"].settings.get("dsn", "") or "").strip()
-        run_state_store = PostgresRunStateStore(dsn)
+        from .adapters.runstate_postgres import PostgresRunStateStore
+
+        rs_settings = profile.adapters["run_state_store"].settings
+        run_state_store = PostgresRunStateStore(
+            str(rs_settings.get("dsn", "") or "").strip(),
+            min_pool_size=int(rs_settings.get("min_pool_size", 1) or 1),
+            max_pool_size=int(rs_settings.get("max_pool_size", 10) or 10),
+        )
     else:
         raise ValidationError(f"unknown run_state_store adapter kind: {rs_kind!r}")
 
@@ -239,9 +266,21 @@ def build_infra(
         from .adapters.ledger_csv import CsvLedgerWriter
 
         ledger_writer = CsvLedgerWriter(billing_state_dir, repo_root=repo_root)
+    elif lw_kind == "sqlite":
+        from .adapters.ledger_sqlite import SqliteLedgerWriter
+
+        lw_db = _sqlite_db_path(repo_root, profile.adapters["ledger_writer"].settings, billing_state_dir / "ledger.sqlite")
+        ledger_writer = SqliteLedgerWriter(lw_db, repo_root=repo_root)
     elif lw_kind == "db_postgres":
-        dsn = str(profile.adapters["ledger_writer"].settings.get("dsn", "") or "").strip()
-        ledger_writer = PostgresLedgerWriter(dsn)
+        from .adapters.ledger_postgres import PostgresLedgerWriter
+
+        lw_settings = profile.adapters["ledger_writer"].settings
+        ledger_writer = PostgresLedgerWriter(
+            str(lw_settings.get("dsn", "") or "").strip(),
+            repo_root=repo_root,
+            min_pool_size=int(lw_settings.get("min_pool_size", 1) or 1),
+            max_pool_size=int(lw_settings.get("max_pool_size", 10) or 10),
+        )
     else:
         raise ValidationError(f"unknown ledger_writer adapter kind: {lw_kind!r}")
 
@@ -336,6 +375,12 @@ def build_infra(
             tcs = TenantCredentialsStorePlaceholder(kind=tcs_kind)
         else:
             raise ValidationError(f"unknown tenant_credentials_store adapter kind: {tcs_kind!r}")
+
+    # 8) Optional module output cache store (L2 behind runtime/cache_outputs)
+    module_cache_store = None
+    if "module_cache_store" in profile.adapters:
+        mcs = profile.adapters["module_cache_store"]
+        module_cache_store = _build_artifact_store(mcs.kind, mcs.settings)
     return InfraBundle(
         profile=profile,
         registry=registry,
@@ -345,6 +390,7 @@ def build_infra(
         execution_backend=execution_backend,
         artifact_publisher=artifact_publisher,
         tenant_credentials_store=tcs,
+        module_cache_store=module_cache_store,
     )
 
 '''
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from .runstate_csv import CsvRunStateStore
 from .ledger_csv import CsvLedgerWriter
+from .runstate_sqlite import SqliteRunStateStore
+from .ledger_sqlite import SqliteLedgerWriter
+from .runstate_postgres import PostgresRunStateStore
+from .ledger_postgres import PostgresLedgerWriter
 from .registry_repo import RepoModuleRegistry
 from .artifacts_github_release import GitHubReleaseArtifactStore
 from .artifacts_s3 import S3ArtifactStore, S3ArtifactStoreSettings
@@ -13,6 +17,10 @@ from .tenant_credentials_csv import TenantCredentialsStoreCsv
 __all__ = [
     "CsvRunStateStore",
     "CsvLedgerWriter",
+    "SqliteRunStateStore",
+    "SqliteLedgerWriter",
+    "PostgresRunStateStore",
+    "PostgresLedgerWriter",
     "RepoModuleRegistry",
     "GitHubReleaseArtifactStore",
     "S3ArtifactStore",
@@ -129,11 +129,23 @@ CHUNK = r'''\
             "output_ref": record.output_ref,
             "metadata_json": json.dumps(meta, ensure_ascii=False, separators=(",", ":")),
         }
-        _append_row(self.module_runs_log, MODULE_RUNS_LOG_HEADERS, row)
+        self._append_module_run(row)
 
     def append_output(self, record: OutputRecord) -> None:
         self.record_output(record)
 
+    def _append_module_run(self, row: Dict[str, Any]) -> None:
+        _append_row(self.module_runs_log, MODULE_RUNS_LOG_HEADERS, row)
+        self.status_table.on_module_run_row(row)
+
+    def get_run_status(self, tenant_id: str, work_order_id: str) -> Optional[Dict[str, str]]:
+        """Latest materialized status row for a workorder (None if unknown)."""
+        return self.status_table.get(tenant_id, work_order_id)
+
+    def rebuild_status_table(self) -> int:
+        """Recreate workorders_status.csv from workorders_log and module_runs_log."""
+        return self.status_table.rebuild(_read_rows(self.workorders_log), _read_rows(self.module_runs_log))
+
     def _latest_step_run_row(self, module_run_id: str) -> Dict[str, str]:
         rows = _read_rows(self.module_runs_log)
         best: Optional[Dict[str, str]] = None
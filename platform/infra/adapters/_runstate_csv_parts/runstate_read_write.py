@@ -14,6 +14,7 @@ from ..models import OutputRecord, StepRunRecord
 from ...common.id_policy import generate_id
 from ...utils.hashing import sha256_file
 from ...utils.time import utcnow_iso
+from .runstate_status import CsvStatusTable
 
 
 WORKORDERS_LOG_HEADERS = [
@@ -180,6 +181,8 @@ class CsvRunStateStore(RunStateStore):
         _ensure_csv(self.outputs_log, OUTPUTS_LOG_HEADERS)
         _ensure_csv(self.deliverable_artifacts_log, DELIVERABLE_ARTIFACTS_LOG_HEADERS)
         _ensure_csv(self.published_artifacts_log, PUBLISHED_ARTIFACTS_LOG_HEADERS)
+        # Materialized latest status per workorder; see runstate_status.
+        self.status_table = CsvStatusTable(state_dir / "workorders_status.csv")
 
     def create_run(self, tenant_id: str, work_order_id: str, metadata: Optional[Dict[str, Any]] = None) -> str:
         meta = dict(metadata or {})
@@ -198,6 +201,7 @@ class CsvRunStateStore(RunStateStore):
                 "metadata_json": json.dumps(meta, ensure_ascii=False, separators=(",", ":")),
             },
         )
+        self.status_table.on_run_status(tenant_id, work_order_id, "CREATED", now)
         return work_order_id
 
     def set_run_status(self, tenant_id: str, work_order_id: str, status: str, metadata: Optional[Dict[str, Any]] = None) -> None:
@@ -205,13 +209,14 @@ class CsvRunStateStore(RunStateStore):
         if str(status or "").strip().upper() == "PARTIAL" and "any_delivery_missing" not in meta:
             meta["any_delivery_missing"] = True
         now = utcnow_iso()
+        status_u = str(status or "").strip().upper() or "CREATED"
         _append_row(
             self.workorders_log,
             WORKORDERS_LOG_HEADERS,
             {
                 "work_order_id": work_order_id,
                 "tenant_id": tenant_id,
-                "status": str(status or "").strip().upper() or "CREATED",
+                "status": status_u,
                 "created_at": now,
                 "started_at": str(meta.get("started_at", "") or ""),
                 "ended_at": str(meta.get("ended_at", "") or ""),
@@ -219,6 +224,7 @@ class CsvRunStateStore(RunStateStore):
                 "metadata_json": json.dumps(meta, ensure_ascii=False, separators=(",", ":")),
             },
         )
+        self.status_table.on_run_status(tenant_id, work_order_id, status_u, now)
 
     def create_step_run(
         self,
@@ -268,7 +274,7 @@ class CsvRunStateStore(RunStateStore):
             "output_ref": str(outputs_dir) if outputs_dir is not None else "",
             "metadata_json": json.dumps(meta, ensure_ascii=False, separators=(",", ":")),
         }
-        _append_row(self.module_runs_log, MODULE_RUNS_LOG_HEADERS, row)
+        self._append_module_run(row)
         return _normalize_step_run_row({k: str(v) for k, v in row.items()})
 
     def mark_step_run_running(self, module_run_id: str, metadata: Optional[Dict[str, Any]] = None) -> StepRunRecord:
@@ -282,7 +288,7 @@ class CsvRunStateStore(RunStateStore):
         row["started_at"] = now if not row.get("started_at") else row.get("started_at")
         row["metadata_json"] = json.dumps(meta, ensure_ascii=False, separators=(",", ":"))
         row["created_at"] = now
-        _append_row(self.module_runs_log, MODULE_RUNS_LOG_HEADERS, row)
+        self._append_module_run(row)
         return _normalize_step_run_row(row)
 
     def mark_step_run_succeeded(
@@ -303,7 +309,7 @@ class CsvRunStateStore(RunStateStore):
         row["ended_at"] = now
         row["metadata_json"] = json.dumps(meta, ensure_ascii=False, separators=(",", ":"))
         row["created_at"] = now
-        _append_row(self.module_runs_log, MODULE_RUNS_LOG_HEADERS, row)
+        self._append_module_run(row)
         return _normalize_step_run_row(row)
 
     def mark_step_run_failed(self, module_run_id: str, error: Dict[str, Any]) -> StepRunRecord:
@@ -318,7 +324,7 @@ class CsvRunStateStore(RunStateStore):
         row["reason_code"] = reason_code
         row["metadata_json"] = json.dumps(meta, ensure_ascii=False, separators=(",", ":"))
         row["created_at"] = now
-        _append_row(self.module_runs_log, MODULE_RUNS_LOG_HEADERS, row)
+        self._append_module_run(row)
         return _normalize_step_run_row(row)
 
     def record_output(self, record: OutputRecord) -> None:
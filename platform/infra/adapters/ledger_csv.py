@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-import csv
+import threading
 from datetime import date, datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..contracts import LedgerWriter
 from ..errors import ValidationError
 from ..models import TransactionItemRecord, TransactionRecord
-from ...utils.csvio import read_csv
+from ...billing import partitions as _partitions
+from ...billing.price_index import load_price_index
+from ...billing.state import BillingState
 
 
 TRANSACTIONS_HEADERS = [
@@ -40,20 +42,58 @@ TRANSACTION_ITEMS_HEADERS = [
 ]
 
 
-def _ensure_csv(path: Path, headers: List[str]) -> None:
-    if path.exists():
-        return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=headers, lineterminator="\n")
-        w.writeheader()
+def _file_stamp(path: Path) -> Tuple[int, int]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return (-1, -1)
+    return (int(st.st_mtime_ns), int(st.st_size))
 
 
-def _append_row(path: Path, headers: List[str], row: Dict[str, Any]) -> None:
-    _ensure_csv(path, headers)
-    with path.open("a", encoding="utf-8", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=headers, extrasaction="ignore", lineterminator="\n")
-        w.writerow({h: ("" if row.get(h) is None else row.get(h)) for h in headers})
+def _item_from_row(r: Dict[str, Any]) -> TransactionItemRecord:
+    try:
+        amt = int(str(r.get("amount_credits", "0") or "0").strip() or "0")
+    except Exception:
+        amt = 0
+    return TransactionItemRecord(
+        transaction_item_id=str(r.get("transaction_item_id", "")),
+        transaction_id=str(r.get("transaction_id", "")),
+        tenant_id=str(r.get("tenant_id", "")),
+        module_id=str(r.get("module_id", "")),
+        work_order_id=str(r.get("work_order_id", "")),
+        step_id=str(r.get("step_id", "")),
+        deliverable_id=str(r.get("deliverable_id", "")),
+        feature=str(r.get("feature", "")),
+        type=str(r.get("type", "")),
+        amount_credits=amt,
+        created_at=str(r.get("created_at", "")),
+        note=str(r.get("note", "")),
+        metadata_json=str(r.get("metadata_json", "")),
+    )
+
+
+class _TransactionItemsIndex:
+    """Parsed transaction_items.csv with secondary indexes on (tenant_id, work_order_id) and transaction_id.
+
+    Positions in each index list are ascending, so filtered queries keep ledger (file) order.
+    """
+
+    def __init__(self, stamp: Tuple[Tuple[int, int], ...]) -> None:
+        self.stamp = stamp
+        self.items: List[TransactionItemRecord] = []
+        self.by_work_order: Dict[Tuple[str, str], List[int]] = {}
+        self.by_transaction: Dict[str, List[int]] = {}
+
+    def add(self, item: TransactionItemRecord) -> None:
+        pos = len(self.items)
+        self.items.append(item)
+        self.by_work_order.setdefault((item.tenant_id, item.work_order_id), []).append(pos)
+        self.by_transaction.setdefault(item.transaction_id, []).append(pos)
+
+
+# Shared per resolved path so every writer instance in the process benefits from one parse.
+_INDEX_LOCK = threading.Lock()
+_INDEXES: Dict[str, _TransactionItemsIndex] = {}
 
 
 def _parse_date(s: str) -> Optional[date]:
@@ -67,11 +107,16 @@ def _parse_date(s: str) -> Optional[date]:
 
 
 class CsvLedgerWriter(LedgerWriter):
-    """LedgerWriter backed by append-only .billing-state CSVs."""
+    """LedgerWriter backed by append-only .billing-state CSVs.
+
+    Appends and reads go through BillingState, so a partitioned ledger is written to its open
+    monthly partitions and read across all of them, closed ones included.
+    """
 
     def __init__(self, state_dir: Path, repo_root: Path):
         self.state_dir = state_dir
         self.repo_root = repo_root
+        self.billing = BillingState(state_dir)
         self.transactions_path = state_dir / "transactions.csv"
         self.transaction_items_path = state_dir / "transaction_items.csv"
         self.prices_path = repo_root / "platform" / "billing" / "module_prices.csv"
@@ -88,7 +133,7 @@ class CsvLedgerWriter(LedgerWriter):
             "note": tx.note,
             "metadata_json": tx.metadata_json,
         }
-        _append_row(self.transactions_path, TRANSACTIONS_HEADERS, row)
+        self._append("transactions.csv", TRANSACTIONS_HEADERS, row)
 
     def post_transaction_item(self, item: TransactionItemRecord) -> None:
         row = {
@@ -106,7 +151,23 @@ class CsvLedgerWriter(LedgerWriter):
             "note": item.note,
             "metadata_json": item.metadata_json,
         }
-        _append_row(self.transaction_items_path, TRANSACTION_ITEMS_HEADERS, row)
+        with _INDEX_LOCK:
+            before = self._items_stamp()
+            self._append("transaction_items.csv", TRANSACTION_ITEMS_HEADERS, row)
+            # Keep the cached index current for our own appends; anything else invalidates it.
+            key = self._index_key()
+            idx = _INDEXES.get(key)
+            if idx is not None and idx.stamp == before:
+                idx.add(_item_from_row(row))
+                idx.stamp = self._items_stamp()
+            else:
+                _INDEXES.pop(key, None)
+
+    def _append(self, table: str, headers: List[str], row: Dict[str, Any]) -> None:
+        try:
+            self.billing.append_rows(table, [row], headers)
+        except ValueError as e:
+            raise ValidationError(str(e)) from e
 
     def append_transaction_item(self, item: TransactionItemRecord) -> None:
         self.post_transaction_item(item)
@@ -116,36 +177,44 @@ class CsvLedgerWriter(LedgerWriter):
         if as_of_date is None:
             raise ValidationError(f"Invalid as_of date: {as_of!r} (expected YYYY-MM-DD)")
 
-        rows = read_csv(self.prices_path)
-        candidates: List[Dict[str, str]] = []
-        for r in rows:
-            if str(r.get("module_id", "")).strip() != module_id:
-                continue
-            if str(r.get("deliverable_id", "")).strip() != deliverable_id:
-                continue
-            active = str(r.get("active", "")).strip().lower() == "true"
-            if not active:
-                continue
-            ef = _parse_date(r.get("effective_from", ""))
-            et = _parse_date(r.get("effective_to", ""))
-            if ef is not None and as_of_date < ef:
-                continue
-            if et is not None and as_of_date >= et:
-                continue
-            candidates.append(r)
-
-        if not candidates:
+        best = load_price_index(self.prices_path).resolve_row(module_id, deliverable_id, as_of_date)
+        if best is None:
             raise ValidationError(f"No active price found for {module_id}:{deliverable_id} as_of={as_of}")
 
-        def _key(r: Dict[str, str]) -> str:
-            return str(r.get("effective_from", ""))
-
-        best = sorted(candidates, key=_key, reverse=True)[0]
         try:
             return int(str(best.get("price_credits", "0") or "0").strip() or "0")
         except Exception:
             raise ValidationError(f"Invalid price_credits for {module_id}:{deliverable_id}")
 
+    def _index_key(self) -> str:
+        return str(self.transaction_items_path.resolve())
+
+    def _items_stamp(self) -> Tuple[Tuple[int, int], ...]:
+        """Change stamp of transaction_items: the flat file, or the manifest plus every partition."""
+        entry = _partitions.table_entry(_partitions.load_manifest(self.state_dir), "transaction_items.csv")
+        if entry is None:
+            return (_file_stamp(self.transaction_items_path),)
+        return (
+            _file_stamp(self.state_dir / _partitions.PARTITIONS_MANIFEST_NAME),
+            *(
+                _file_stamp(_partitions.partition_path(self.state_dir, "transaction_items.csv", period))
+                for period in sorted(entry.get("partitions", {}))
+            ),
+        )
+
+    def _items_index(self) -> _TransactionItemsIndex:
+        key = self._index_key()
+        with _INDEX_LOCK:
+            stamp = self._items_stamp()
+            idx = _INDEXES.get(key)
+            if idx is not None and idx.stamp == stamp:
+                return idx
+            idx = _TransactionItemsIndex(stamp)
+            for r in self.billing.load_table("transaction_items.csv"):
+                idx.add(_item_from_row(r))
+            _INDEXES[key] = idx
+            return idx
+
     def list_transaction_items(
         self,
         *,
@@ -154,39 +223,33 @@ class CsvLedgerWriter(LedgerWriter):
         step_id: Optional[str] = None,
         deliverable_id: Optional[str] = None,
         since: Optional[str] = None,
+        transaction_id: Optional[str] = None,
     ) -> List[TransactionItemRecord]:
-        rows = read_csv(self.transaction_items_path)
+        idx = self._items_index()
+        with _INDEX_LOCK:
+            # Narrow via the smallest applicable secondary index, then apply the remaining filters.
+            candidates: Optional[List[int]] = None
+            if tenant_id and work_order_id:
+                candidates = idx.by_work_order.get((tenant_id, work_order_id), [])
+            if transaction_id:
+                by_tx = idx.by_transaction.get(transaction_id, [])
+                if candidates is None or len(by_tx) < len(candidates):
+                    candidates = by_tx
+            items = list(idx.items) if candidates is None else [idx.items[i] for i in candidates]
+
         out: List[TransactionItemRecord] = []
-        for r in rows:
-            if tenant_id and str(r.get("tenant_id", "")) != tenant_id:
+        for it in items:
+            if tenant_id and it.tenant_id != tenant_id:
+                continue
+            if work_order_id and it.work_order_id != work_order_id:
                 continue
-            if work_order_id and str(r.get("work_order_id", "")) != work_order_id:
+            if transaction_id and it.transaction_id != transaction_id:
                 continue
-            if step_id and str(r.get("step_id", "")) != step_id:
+            if step_id and it.step_id != step_id:
                 continue
-            if deliverable_id and str(r.get("deliverable_id", "")) != deliverable_id:
+            if deliverable_id and it.deliverable_id != deliverable_id:
                 continue
-            if since and str(r.get("created_at", "")) < since:
+            if since and it.created_at < since:
                 continue
-            try:
-                amt = int(str(r.get("amount_credits", "0") or "0").strip() or "0")
-            except Exception:
-                amt = 0
-            out.append(
-                TransactionItemRecord(
-                    transaction_item_id=str(r.get("transaction_item_id", "")),
-                    transaction_id=str(r.get("transaction_id", "")),
-                    tenant_id=str(r.get("tenant_id", "")),
-                    module_id=str(r.get("module_id", "")),
-                    work_order_id=str(r.get("work_order_id", "")),
-                    step_id=str(r.get("step_id", "")),
-                    deliverable_id=str(r.get("deliverable_id", "")),
-                    feature=str(r.get("feature", "")),
-                    type=str(r.get("type", "")),
-                    amount_credits=amt,
-                    created_at=str(r.get("created_at", "")),
-                    note=str(r.get("note", "")),
-                    metadata_json=str(r.get("metadata_json", "")),
-                )
-            )
+            out.append(it)
         return out
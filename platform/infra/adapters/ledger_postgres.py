@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from .ledger_sql import SqlLedgerWriter
+from .postgres_db import PostgresDatabase
+
+
+class PostgresLedgerWriter(SqlLedgerWriter):
+    """LedgerWriter backed by a shared PostgreSQL database.
+
+    Many orchestrator workers can post concurrently: ids are enforced unique by the
+    database, batches of items are ingested with COPY, `set_credits` is a single
+    INSERT ... ON CONFLICT DO UPDATE, and `reserve_credits` locks the tenant balance row
+    with SELECT ... FOR UPDATE.
+    """
+
+    def __init__(self, dsn: str, repo_root: Path, *, min_pool_size: int = 1, max_pool_size: int = 10):
+        self.dsn = dsn
+        super().__init__(PostgresDatabase(dsn, min_size=min_pool_size, max_size=max_pool_size), repo_root)
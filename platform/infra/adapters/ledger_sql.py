@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ..contracts import LedgerWriter
+from ..errors import ConflictError, NotFoundError, ValidationError
+from ..models import TransactionItemRecord, TransactionRecord
+from ...billing.price_index import load_price_index
+from ...billing.recompute_credits import TENANTS_CREDITS_HEADERS
+from ...utils.time import utcnow_iso
+from .ledger_csv import TRANSACTION_ITEMS_HEADERS, TRANSACTIONS_HEADERS, _item_from_row, _parse_date
+from .sqlite_db import where_clause
+
+
+def _tx_row(tx: TransactionRecord) -> Dict[str, Any]:
+    return {
+        "transaction_id": tx.transaction_id,
+        "tenant_id": tx.tenant_id,
+        "work_order_id": tx.work_order_id,
+        "type": tx.type,
+        "amount_credits": str(tx.amount_credits),
+        "created_at": tx.created_at,
+        "reason_code": tx.reason_code,
+        "note": tx.note,
+        "metadata_json": tx.metadata_json,
+    }
+
+
+def _item_row(item: TransactionItemRecord) -> Dict[str, Any]:
+    return {
+        "transaction_item_id": item.transaction_item_id,
+        "transaction_id": item.transaction_id,
+        "tenant_id": item.tenant_id,
+        "module_id": item.module_id,
+        "work_order_id": item.work_order_id,
+        "step_id": item.step_id,
+        "deliverable_id": item.deliverable_id,
+        "feature": item.feature,
+        "type": item.type,
+        "amount_credits": str(item.amount_credits),
+        "created_at": item.created_at,
+        "note": item.note,
+        "metadata_json": item.metadata_json,
+    }
+
+
+class SqlLedgerWriter(LedgerWriter):
+    """LedgerWriter over a SQL database handle (see sqlite_db.SqliteDatabase).
+
+    Tables use the canonical transactions.csv / transaction_items.csv / tenants_credits.csv
+    columns. IDs are unique (duplicates raise ConflictError) and item queries are served
+    from indexes on (tenant_id, work_order_id) and transaction_id. `export_csv` writes the
+    canonical CSVs for publishing.
+    """
+
+    def __init__(self, db: Any, repo_root: Path):
+        self.db = db
+        self.repo_root = repo_root
+        self.prices_path = repo_root / "platform" / "billing" / "module_prices.csv"
+        self.db.ensure_table(
+            "transactions",
+            TRANSACTIONS_HEADERS,
+            unique=("transaction_id",),
+            indexes=(("tenant_id", "work_order_id"),),
+        )
+        self.db.ensure_table(
+            "transaction_items",
+            TRANSACTION_ITEMS_HEADERS,
+            unique=("transaction_item_id",),
+            indexes=(("tenant_id", "work_order_id"), ("transaction_id",)),
+        )
+        self.db.ensure_table("tenants_credits", TENANTS_CREDITS_HEADERS, unique=("tenant_id",))
+
+    def post_transaction(self, tx: TransactionRecord) -> None:
+        self.post_transactions([tx])
+
+    def post_transactions(self, txs: Iterable[TransactionRecord]) -> int:
+        return self.db.insert("transactions", TRANSACTIONS_HEADERS, [_tx_row(tx) for tx in txs])
+
+    def post_transaction_item(self, item: TransactionItemRecord) -> None:
+        self.post_transaction_items([item])
+
+    def post_transaction_items(self, items: Iterable[TransactionItemRecord]) -> int:
+        """Insert items in a single transaction; all or none are written."""
+        return self.db.insert("transaction_items", TRANSACTION_ITEMS_HEADERS, [_item_row(i) for i in items])
+
+    def append_transaction_item(self, item: TransactionItemRecord) -> None:
+        self.post_transaction_item(item)
+
+    def resolve_price(self, module_id: str, deliverable_id: str, as_of: str) -> int:
+        as_of_date = _parse_date(as_of)
+        if as_of_date is None:
+            raise ValidationError(f"Invalid as_of date: {as_of!r} (expected YYYY-MM-DD)")
+        best = load_price_index(self.prices_path).resolve_row(module_id, deliverable_id, as_of_date)
+        if best is None:
+            raise ValidationError(f"No active price found for {module_id}:{deliverable_id} as_of={as_of}")
+        try:
+            return int(str(best.get("price_credits", "0") or "0").strip() or "0")
+        except Exception:
+            raise ValidationError(f"Invalid price_credits for {module_id}:{deliverable_id}")
+
+    def list_transaction_items(
+        self,
+        *,
+        tenant_id: Optional[str] = None,
+        work_order_id: Optional[str] = None,
+        step_id: Optional[str] = None,
+        deliverable_id: Optional[str] = None,
+        since: Optional[str] = None,
+        transaction_id: Optional[str] = None,
+    ) -> List[TransactionItemRecord]:
+        where, params = where_clause([
+            ("tenant_id", "=", tenant_id),
+            ("work_order_id", "=", work_order_id),
+            ("transaction_id", "=", transaction_id),
+            ("step_id", "=", step_id),
+            ("deliverable_id", "=", deliverable_id),
+            ("created_at", ">=", since),
+        ])
+        rows = self.db.query(f"SELECT * FROM transaction_items{where} ORDER BY seq", params)
+        return [_item_from_row(r) for r in rows]
+
+    def set_credits(self, tenant_id: str, credits_available: int, *, status: str = "active") -> None:
+        """Seed or overwrite a tenant balance (e.g. from a recomputed tenants_credits.csv)."""
+        self.db.upsert("tenants_credits", TENANTS_CREDITS_HEADERS, {
+            "tenant_id": tenant_id,
+            "credits_available": str(int(credits_available)),
+            "updated_at": utcnow_iso(),
+            "status": status,
+        }, ("tenant_id",))
+
+    def reserve_credits(self, tenant_id: str, amount: int) -> int:
+        """Atomically debit `amount` from a tenant balance and return the remaining credits.
+
+        The balance row is locked (SELECT ... FOR UPDATE on PostgreSQL) for the duration of
+        the check-and-debit, so concurrent workers sharing the database cannot overspend.
+        Raises NotFoundError for tenants without a balance row and ConflictError when the
+        balance is insufficient.
+        """
+        amt = int(amount)
+        with self.db.transaction():
+            available = self._locked_balance(tenant_id)
+            if available < amt:
+                raise ConflictError(f"insufficient credits for {tenant_id}: available={available} requested={amt}")
+            return self._update_balance(tenant_id, available - amt)
+
+    def release_credits(self, tenant_id: str, amount: int) -> int:
+        """Return `amount` to a tenant balance (an unused reservation or a refund)."""
+        with self.db.transaction():
+            return self._update_balance(tenant_id, self._locked_balance(tenant_id) + int(amount))
+
+    def _locked_balance(self, tenant_id: str) -> int:
+        rows = self.db.query(
+            "SELECT credits_available FROM tenants_credits WHERE tenant_id = ?" + self.db.for_update,
+            (tenant_id,),
+        )
+        if not rows:
+            raise NotFoundError(f"tenant_id not found in tenants_credits: {tenant_id}")
+        return int(str(rows[0].get("credits_available") or "0").strip() or "0")
+
+    def _update_balance(self, tenant_id: str, value: int) -> int:
+        self.db.execute(
+            "UPDATE tenants_credits SET credits_available = ?, updated_at = ? WHERE tenant_id = ?",
+            (str(value), utcnow_iso(), tenant_id),
+        )
+        return value
+
+    def export_csv(self, state_dir: Path) -> Dict[str, int]:
+        """Write transactions.csv, transaction_items.csv and tenants_credits.csv into `state_dir`."""
+        return {
+            "transactions.csv": self.db.export_csv("transactions", TRANSACTIONS_HEADERS, state_dir / "transactions.csv"),
+            "transaction_items.csv": self.db.export_csv(
+                "transaction_items", TRANSACTION_ITEMS_HEADERS, state_dir / "transaction_items.csv"
+            ),
+            "tenants_credits.csv": self.db.export_csv(
+                "tenants_credits", TENANTS_CREDITS_HEADERS, state_dir / "tenants_credits.csv"
+            ),
+        }
+
+    def describe(self) -> Dict[str, Any]:
+        return {"class": self.__class__.__name__, **self.db.describe()}
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from pathlib import Path
+from .ledger_sql import SqlLedgerWriter
+from .sqlite_db import SqliteDatabase
+
+
+class SqliteLedgerWriter(SqlLedgerWriter):
+    """LedgerWriter backed by a local single-file SQLite database (WAL)."""
+
+    def __init__(self, db_path: Path, repo_root: Path):
+        self.db_path = db_path
+        super().__init__(SqliteDatabase(db_path), repo_root)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ..errors import ConflictError, NotConfiguredError
+from ...utils.csvio import write_csv
+from .sqlite_db import upsert_sql
+
+
+def _pg_sql(sql: str) -> str:
+    # Adapters share SQL written with sqlite-style `?` placeholders.
+    return sql.replace("?", "%s")
+
+
+class PostgresDatabase:
+    """Pooled PostgreSQL handle with the same surface as sqlite_db.SqliteDatabase.
+
+    Requires psycopg 3 with psycopg_pool (`pip install "psycopg[binary,pool]"`); the import is
+    deferred so CSV/sqlite deployments never need it. Each thread borrows one pooled
+    connection for the lifetime of its outermost `transaction()`; statements are sent as
+    server-side prepared statements, and multi-row inserts use COPY.
+    """
+
+    for_update = " FOR UPDATE"
+
+    def __init__(self, dsn: str, *, min_size: int = 1, max_size: int = 10) -> None:
+        self.dsn = str(dsn or "").strip()
+        self.min_size = int(min_size)
+        self.max_size = int(max_size)
+        self._pool: Any = None
+        self._pending_ddl: List[Tuple[str, List[str]]] = []
+        self._init_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _get_pool(self) -> Any:
+        # Connect lazily so building infra (e.g. `runtime-print`) never needs a live server.
+        with self._init_lock:
+            if self._pool is not None:
+                return self._pool
+            if not self.dsn:
+                raise NotConfiguredError("db_postgres adapter requires settings.dsn")
+            try:
+                from psycopg_pool import ConnectionPool
+            except ImportError as e:
+                raise NotConfiguredError("db_postgres adapters require psycopg[pool] (psycopg 3)") from e
+
+            pool = ConnectionPool(self.dsn, min_size=self.min_size, max_size=self.max_size, open=True)
+            with pool.connection() as conn:
+                with conn.transaction():
+                    for table, statements in self._pending_ddl:
+                        # Serialize DDL across workers starting at the same time.
+                        conn.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"platform_ddl:{table}",))
+                        for stmt in statements:
+                            conn.execute(stmt)
+            self._pending_ddl = []
+            self._pool = pool
+            return pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # Nested: join the thread's open transaction.
+            yield conn
+            return
+        with self._get_pool().connection() as conn:
+            with conn.transaction():
+                self._local.conn = conn
+                try:
+                    yield conn
+                finally:
+                    self._local.conn = None
+
+    def ensure_table(
+        self,
+        table: str,
+        headers: Sequence[str],
+        *,
+        extra_columns: Sequence[str] = (),
+        unique: Sequence[Union[str, Tuple[str, ...]]] = (),
+        indexes: Sequence[Tuple[str, ...]] = (),
+    ) -> None:
+        """Queue idempotent DDL for `table`; it runs when the pool is first opened."""
+        cols = ["seq BIGSERIAL PRIMARY KEY"]
+        cols += [f"{c} TEXT NOT NULL DEFAULT ''" for c in list(headers) + list(extra_columns)]
+        statements = [f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(cols)})"]
+        for key in unique:
+            key_cols = (key,) if isinstance(key, str) else tuple(key)
+            statements.append(f"CREATE UNIQUE INDEX IF NOT EXISTS {table}__{'_'.join(key_cols)}__uq ON {table} ({', '.join(key_cols)})")
+        for idx_cols in indexes:
+            name = f"{table}__{'_'.join(idx_cols)}__idx"
+            statements.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(idx_cols)})")
+        with self._init_lock:
+            if self._pool is None:
+                self._pending_ddl.append((table, statements))
+                return
+        with self.transaction() as conn:
+            for stmt in statements:
+                conn.execute(stmt)
+
+    def insert(self, table: str, columns: Sequence[str], rows: Iterable[Dict[str, Any]]) -> int:
+        self._get_pool()
+        import psycopg
+
+        cols = list(columns)
+        values = [tuple("" if r.get(c) is None else str(r.get(c)) for c in cols) for r in rows]
+        if not values:
+            return 0
+        try:
+            with self.transaction() as conn:
+                if len(values) == 1:
+                    sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('%s' for _ in cols)})"
+                    conn.execute(sql, values[0], prepare=True)
+                else:
+                    with conn.cursor() as cur:
+                        with cur.copy(f"COPY {table} ({', '.join(cols)}) FROM STDIN") as cp:
+                            for v in values:
+                                cp.write_row(v)
+        except psycopg.errors.UniqueViolation as e:
+            raise ConflictError(f"{table}: {e}") from e
+        return len(values)
+
+    def upsert(self, table: str, columns: Sequence[str], row: Dict[str, Any], key: Sequence[str]) -> None:
+        """Insert `row`, or overwrite the row with the same `key` (which needs a unique index)."""
+        self.execute(upsert_sql(table, columns, key), [("" if row.get(c) is None else str(row.get(c))) for c in columns])
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        with self.transaction() as conn:
+            conn.execute(_pg_sql(sql), tuple(params), prepare=True)
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, str]]:
+        from psycopg.rows import dict_row
+
+        with self.transaction() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(_pg_sql(sql), tuple(params), prepare=True)
+                return [dict(r) for r in cur.fetchall()]
+
+    def export_csv(self, table: str, headers: Sequence[str], path: Path) -> int:
+        """Write `table` to `path` in the canonical CSV schema, in append order."""
+        rows = self.query(f"SELECT {', '.join(headers)} FROM {table} ORDER BY seq")
+        write_csv(path, rows, list(headers))
+        return len(rows)
+
+    def describe(self) -> Dict[str, Any]:
+        # Never echo credentials from the DSN.
+        return {"dsn_host": _dsn_host(self.dsn), "pool_max_size": self.max_size}
+
+
+def _dsn_host(dsn: str) -> Optional[str]:
+    s = str(dsn or "")
+    if "@" in s:
+        s = s.rsplit("@", 1)[1]
+    elif "://" in s:
+        s = s.split("://", 1)[1]
+    return s.split("/", 1)[0] or None
@@ -8,7 +8,7 @@ import yaml
 
 from ..contracts import ModuleRegistry
 from ..errors import NotFoundError, ValidationError
-from ..models import MODULE_KIND_VALUES, is_valid_module_kind
+from ..models import MODULE_KIND_VALUES, is_valid_module_kind, module_cache_bypass_inputs, module_cache_scope
 
 
 class RepoModuleRegistry(ModuleRegistry):
@@ -50,6 +50,11 @@ class RepoModuleRegistry(ModuleRegistry):
             raise ValidationError(
                 f"module.yml has invalid kind={kind!r} for {module_id} (allowed: {list(MODULE_KIND_VALUES)})"
             )
+        try:
+            module_cache_scope(data)
+            module_cache_bypass_inputs(data)
+        except ValueError as e:
+            raise ValidationError(f"{e} for {module_id}") from e
         return data
 
     def get_contract(self, module_id: str) -> Dict[str, Any]:
@@ -150,6 +155,8 @@ class RepoModuleRegistry(ModuleRegistry):
             "kind": str(cfg.get("kind") or "").strip(),
             "name": str(cfg.get("name") or ""),
             "version": str(cfg.get("version") or ""),
+            "cache_scope": module_cache_scope(cfg),
+            "cache_bypass_inputs": module_cache_bypass_inputs(cfg),
             "inputs": inputs,
             "outputs": outputs,
             "deliverables": deliverables_map,
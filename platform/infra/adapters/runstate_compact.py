@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ...utils.csvio import append_csv_rows, read_csv, write_csv
+from .runstate_csv import (
+    DELIVERABLE_ARTIFACTS_LOG_HEADERS,
+    MODULE_RUNS_LOG_HEADERS,
+    OUTPUTS_LOG_HEADERS,
+    PUBLISHED_ARTIFACTS_LOG_HEADERS,
+    WORKORDERS_LOG_HEADERS,
+)
+
+
+# Compaction keeps exactly the row CsvRunStateStore readers would resolve as "latest" for
+# each key: the greatest created_at, with ties going to the later row in the file.
+
+def _k_workorder(r: Dict[str, str]) -> Tuple[str, ...]:
+    return (str(r.get("tenant_id", "")), str(r.get("work_order_id", "")))
+
+
+def _k_module_run(r: Dict[str, str]) -> Tuple[str, ...]:
+    return (str(r.get("module_run_id", "")),)
+
+
+def _k_output(r: Dict[str, str]) -> Tuple[str, ...]:
+    return tuple(str(r.get(k, "")) for k in ("tenant_id", "work_order_id", "step_id", "output_id"))
+
+
+def _k_artifact(r: Dict[str, str]) -> Tuple[str, ...]:
+    scope = (str(r.get("tenant_id", "")).strip(), str(r.get("work_order_id", "")).strip())
+    ik = str(r.get("idempotency_key", "") or "").strip()
+    if ik:
+        return scope + ("idem", ik)
+    return scope + ("composite",) + tuple(
+        str(r.get(k, "")) for k in ("step_id", "module_id", "deliverable_id", "artifact_key")
+    )
+
+
+RUNSTATE_LOGS: Dict[str, Tuple[List[str], Callable[[Dict[str, str]], Tuple[str, ...]]]] = {
+    "workorders_log.csv": (WORKORDERS_LOG_HEADERS, _k_workorder),
+    "module_runs_log.csv": (MODULE_RUNS_LOG_HEADERS, _k_module_run),
+    "outputs_log.csv": (OUTPUTS_LOG_HEADERS, _k_output),
+    "deliverable_artifacts_log.csv": (DELIVERABLE_ARTIFACTS_LOG_HEADERS, _k_artifact),
+    "published_artifacts_log.csv": (PUBLISHED_ARTIFACTS_LOG_HEADERS, _k_artifact),
+}
+
+
+def latest_rows(
+    rows: List[Dict[str, str]], key: Callable[[Dict[str, str]], Tuple[str, ...]]
+) -> Tuple[List[Dict[str, str]], List[Dict[str, str]]]:
+    """Split rows into (live, superseded), both in original file order."""
+    winner: Dict[Tuple[str, ...], int] = {}
+    for i, r in enumerate(rows):
+        k = key(r)
+        prev = winner.get(k)
+        if prev is None or str(r.get("created_at", "")) >= str(rows[prev].get("created_at", "")):
+            winner[k] = i
+    keep = set(winner.values())
+    live = [r for i, r in enumerate(rows) if i in keep]
+    superseded = [r for i, r in enumerate(rows) if i not in keep]
+    return live, superseded
+
+
+def compact_runstate_logs(
+    state_dir: Path,
+    *,
+    archive: bool = False,
+    min_superseded_ratio: float = 0.0,
+    min_bytes: int = 0,
+    now: Optional[datetime] = None,
+) -> Dict[str, Dict[str, int]]:
+    """Rewrite each run-state log with only its latest row per key.
+
+    Each log is replaced atomically. With `archive=True` the superseded rows are appended to
+    `<log>.history-YYYYMMDD.csv` first, so nothing is lost if the rewrite is interrupted.
+    Logs smaller than `min_bytes`, or whose superseded share is below `min_superseded_ratio`,
+    are left untouched. Run it only while nothing else is appending (e.g. at run end).
+    Returns per-log counts (rows_before, rows_after, compacted).
+    """
+    stamp = (now or datetime.now(timezone.utc)).strftime("%Y%m%d")
+    report: Dict[str, Dict[str, int]] = {}
+    for name, (headers, key) in RUNSTATE_LOGS.items():
+        path = state_dir / name
+        if not path.exists() or path.stat().st_size < int(min_bytes):
+            continue
+        rows = read_csv(path)
+        live, superseded = latest_rows(rows, key)
+        ratio = (len(superseded) / len(rows)) if rows else 0.0
+        compacted = bool(superseded) and ratio >= float(min_superseded_ratio)
+        if compacted:
+            if archive:
+                history = path.with_name(f"{path.stem}.history-{stamp}.csv")
+                append_csv_rows(history, superseded, headers)
+            write_csv(path, live, headers)
+        report[name] = {"rows_before": len(rows), "rows_after": len(live) if compacted else len(rows), "compacted": int(compacted)}
+    return report
+
+
+# Run-end defaults: only logs past 1 MiB where at least half the rows are superseded.
+AUTO_COMPACT_MIN_BYTES = 1024 * 1024
+AUTO_COMPACT_MIN_SUPERSEDED_RATIO = 0.5
+
+
+def auto_compact_runstate_logs(state_dir: Path) -> Dict[str, Dict[str, int]]:
+    return compact_runstate_logs(
+        state_dir,
+        archive=True,
+        min_superseded_ratio=AUTO_COMPACT_MIN_SUPERSEDED_RATIO,
+        min_bytes=AUTO_COMPACT_MIN_BYTES,
+    )
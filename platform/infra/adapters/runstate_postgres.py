@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from .runstate_sql import SqlRunStateStore
+from .postgres_db import PostgresDatabase
+
+
+class PostgresRunStateStore(SqlRunStateStore):
+    """RunStateStore backed by a shared PostgreSQL database (pooled connections)."""
+
+    def __init__(self, dsn: str, *, min_pool_size: int = 1, max_pool_size: int = 10):
+        self.dsn = dsn
+        super().__init__(PostgresDatabase(dsn, min_size=min_pool_size, max_size=max_pool_size))
@@ -0,0 +1,445 @@
+from __future__ import annotations
+
+import json
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..contracts import RunStateStore
+from ..errors import NotFoundError, ValidationError
+from ..models import DeliverableArtifactRecord, OutputRecord, StepRunRecord
+from ...common.id_policy import generate_id
+from ...utils.time import utcnow_iso
+from .runstate_status import (
+    WORKORDERS_STATUS_HEADERS,
+    apply_run_event,
+    apply_step_event,
+    fold_status_rows,
+    step_event_from_module_run_row,
+)
+from .runstate_csv import (
+    DELIVERABLE_ARTIFACTS_LOG_HEADERS,
+    MODULE_RUNS_LOG_HEADERS,
+    OUTPUTS_LOG_HEADERS,
+    PUBLISHED_ARTIFACTS_LOG_HEADERS,
+    WORKORDERS_LOG_HEADERS,
+    _normalize_step_run_row,
+    _safe_json_load,
+)
+
+
+# module_runs_log carries step_id/idempotency_key inside metadata_json; they are
+# denormalized into real columns so idempotent create_step_run is an index lookup.
+_MODULE_RUN_KEY_COLUMNS = ["step_id", "idempotency_key"]
+
+_STATUS_KEY = ("tenant_id", "work_order_id")
+
+# Table name -> (canonical CSV file name, headers).
+_LOGS: Dict[str, Tuple[str, List[str]]] = {
+    "workorders_log": ("workorders_log.csv", WORKORDERS_LOG_HEADERS),
+    "module_runs_log": ("module_runs_log.csv", MODULE_RUNS_LOG_HEADERS),
+    "outputs_log": ("outputs_log.csv", OUTPUTS_LOG_HEADERS),
+    "deliverable_artifacts_log": ("deliverable_artifacts_log.csv", DELIVERABLE_ARTIFACTS_LOG_HEADERS),
+    "published_artifacts_log": ("published_artifacts_log.csv", PUBLISHED_ARTIFACTS_LOG_HEADERS),
+}
+
+
+def _dumps(meta: Dict[str, Any]) -> str:
+    return json.dumps(meta, ensure_ascii=False, separators=(",", ":"))
+
+
+def _as_int(v: object) -> int:
+    try:
+        return int(str(v or "0").strip() or "0")
+    except Exception:
+        return 0
+
+
+class SqlRunStateStore(RunStateStore):
+    """RunStateStore over a SQL database handle (see sqlite_db.SqliteDatabase).
+
+    Each table mirrors the corresponding CsvRunStateStore log and keeps the same
+    append-only, latest-row-wins semantics; lookups are served from indexes instead of
+    file scans. Use `batch()` to group several writes into one transaction and
+    `export_csv` to materialize the canonical *_log.csv files.
+    """
+
+    def __init__(self, db: Any):
+        self.db = db
+        self.db.ensure_table("workorders_log", WORKORDERS_LOG_HEADERS, indexes=(("tenant_id", "work_order_id"),))
+        self.db.ensure_table("workorders_status", WORKORDERS_STATUS_HEADERS, unique=(_STATUS_KEY,))
+        self.db.ensure_table(
+            "module_runs_log",
+            MODULE_RUNS_LOG_HEADERS,
+            extra_columns=_MODULE_RUN_KEY_COLUMNS,
+            indexes=(
+                ("module_run_id",),
+                ("tenant_id", "work_order_id"),
+                ("tenant_id", "work_order_id", "module_id", "step_id", "idempotency_key"),
+            ),
+        )
+        self.db.ensure_table("outputs_log", OUTPUTS_LOG_HEADERS, indexes=(("tenant_id", "work_order_id", "step_id"),))
+        self.db.ensure_table("deliverable_artifacts_log", DELIVERABLE_ARTIFACTS_LOG_HEADERS, indexes=(("tenant_id", "work_order_id"),))
+        self.db.ensure_table("published_artifacts_log", PUBLISHED_ARTIFACTS_LOG_HEADERS, indexes=(("tenant_id", "work_order_id"),))
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group every write inside the block into a single transaction."""
+        with self.db.transaction():
+            yield
+
+    def _append_module_run(self, row: Dict[str, Any]) -> None:
+        meta = _safe_json_load(row.get("metadata_json", ""))
+        meta = meta if isinstance(meta, dict) else {}
+        full = dict(row)
+        full["step_id"] = str(meta.get("step_id") or meta.get("step") or "").strip()
+        full["idempotency_key"] = str(meta.get("idempotency_key") or "").strip()
+        with self.db.transaction():
+            self.db.insert("module_runs_log", MODULE_RUNS_LOG_HEADERS + _MODULE_RUN_KEY_COLUMNS, [full])
+            tid, wid, sid, st = step_event_from_module_run_row(full)
+            if sid:
+                self._put_status(apply_step_event(
+                    self._locked_status(tid, wid), tenant_id=tid, work_order_id=wid, step_id=sid, status=st,
+                    at=str(full.get("created_at", "")),
+                ))
+
+    def _append_run_event(self, row: Dict[str, Any]) -> None:
+        with self.db.transaction():
+            self.db.insert("workorders_log", WORKORDERS_LOG_HEADERS, [row])
+            tid, wid = str(row["tenant_id"]), str(row["work_order_id"])
+            self._put_status(apply_run_event(
+                self._locked_status(tid, wid), tenant_id=tid, work_order_id=wid, status=str(row["status"]),
+                at=str(row["created_at"]),
+            ))
+
+    def _locked_status(self, tenant_id: str, work_order_id: str) -> Optional[Dict[str, str]]:
+        # Read-modify-write of the status row: make sure the row exists, then lock it until the
+        # caller's transaction commits, so concurrent workers cannot lose each other's updates.
+        self.db.execute(
+            "INSERT INTO workorders_status (tenant_id, work_order_id, step_statuses_json) VALUES (?, ?, '{}') "
+            "ON CONFLICT (tenant_id, work_order_id) DO NOTHING",
+            (tenant_id, work_order_id),
+        )
+        hit = self.db.query(
+            f"SELECT {', '.join(WORKORDERS_STATUS_HEADERS)} FROM workorders_status WHERE tenant_id = ? AND work_order_id = ?"
+            + self.db.for_update,
+            (tenant_id, work_order_id),
+        )
+        return hit[0] if hit else None
+
+    def _put_status(self, row: Dict[str, str]) -> None:
+        self.db.upsert("workorders_status", WORKORDERS_STATUS_HEADERS, row, _STATUS_KEY)
+
+    def get_run_status(self, tenant_id: str, work_order_id: str) -> Optional[Dict[str, str]]:
+        """Latest materialized status row for a workorder (None if unknown)."""
+        hit = self.db.query(
+            f"SELECT {', '.join(WORKORDERS_STATUS_HEADERS)} FROM workorders_status WHERE tenant_id = ? AND work_order_id = ?",
+            (tenant_id, work_order_id),
+        )
+        return hit[0] if hit else None
+
+    def rebuild_status_table(self) -> int:
+        """Recreate workorders_status from workorders_log and module_runs_log."""
+        with self.db.transaction():
+            folded = fold_status_rows(
+                self.db.query("SELECT * FROM workorders_log ORDER BY seq"),
+                self.db.query("SELECT * FROM module_runs_log ORDER BY seq"),
+            )
+            self.db.execute("DELETE FROM workorders_status")
+            self.db.insert("workorders_status", WORKORDERS_STATUS_HEADERS, folded)
+        return len(folded)
+
+    def create_run(self, tenant_id: str, work_order_id: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+        self._append_run_event({
+            "work_order_id": work_order_id,
+            "tenant_id": tenant_id,
+            "status": "CREATED",
+            "created_at": utcnow_iso(),
+            "metadata_json": _dumps(dict(metadata or {})),
+        })
+        return work_order_id
+
+    def set_run_status(self, tenant_id: str, work_order_id: str, status: str, metadata: Optional[Dict[str, Any]] = None) -> None:
+        meta = dict(metadata or {})
+        if str(status or "").strip().upper() == "PARTIAL" and "any_delivery_missing" not in meta:
+            meta["any_delivery_missing"] = True
+        self._append_run_event({
+            "work_order_id": work_order_id,
+            "tenant_id": tenant_id,
+            "status": str(status or "").strip().upper() or "CREATED",
+            "created_at": utcnow_iso(),
+            "started_at": str(meta.get("started_at", "") or ""),
+            "ended_at": str(meta.get("ended_at", "") or ""),
+            "note": str(meta.get("note", "") or ""),
+            "metadata_json": _dumps(meta),
+        })
+
+    def create_step_run(
+        self,
+        *,
+        tenant_id: str,
+        work_order_id: str,
+        step_id: str,
+        module_id: str,
+        idempotency_key: str,
+        outputs_dir: Optional[Path] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> StepRunRecord:
+        if not idempotency_key:
+            raise ValidationError("idempotency_key is required")
+
+        with self.db.transaction():
+            hit = self.db.query(
+                "SELECT * FROM module_runs_log WHERE tenant_id = ? AND work_order_id = ? AND module_id = ? "
+                "AND step_id = ? AND idempotency_key = ? ORDER BY created_at DESC, seq DESC LIMIT 1",
+                (tenant_id, work_order_id, module_id, step_id, idempotency_key),
+            )
+            if hit:
+                return _normalize_step_run_row(hit[0])
+
+            meta: Dict[str, Any] = dict(metadata or {})
+            meta["step_id"] = step_id
+            meta["idempotency_key"] = idempotency_key
+            if outputs_dir is not None:
+                meta["outputs_dir"] = str(outputs_dir)
+            row = {h: "" for h in MODULE_RUNS_LOG_HEADERS}
+            row.update({
+                "module_run_id": generate_id("module_run_id"),
+                "tenant_id": tenant_id,
+                "work_order_id": work_order_id,
+                "module_id": module_id,
+                "status": "CREATED",
+                "created_at": utcnow_iso(),
+                "output_ref": str(outputs_dir) if outputs_dir is not None else "",
+                "metadata_json": _dumps(meta),
+            })
+            self._append_module_run(row)
+        return _normalize_step_run_row(row)
+
+    def _transition(self, module_run_id: str, update: Dict[str, Any], meta_update: Dict[str, Any]) -> StepRunRecord:
+        with self.db.transaction():
+            row = self._latest_step_run_row(module_run_id)
+            meta = _safe_json_load(row.get("metadata_json", ""))
+            meta.update(meta_update)
+            row.update(update)
+            row["metadata_json"] = _dumps(meta)
+            row["created_at"] = utcnow_iso()
+            self._append_module_run(row)
+        return _normalize_step_run_row(row)
+
+    def mark_step_run_running(self, module_run_id: str, metadata: Optional[Dict[str, Any]] = None) -> StepRunRecord:
+        prev = self._latest_step_run_row(module_run_id)
+        return self._transition(
+            module_run_id,
+            {"status": "RUNNING", "started_at": prev.get("started_at") or utcnow_iso()},
+            dict(metadata or {}),
+        )
+
+    def mark_step_run_succeeded(
+        self,
+        module_run_id: str,
+        *,
+        requested_deliverables: List[str],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> StepRunRecord:
+        meta_update: Dict[str, Any] = {"requested_deliverables": list(requested_deliverables or [])}
+        meta_update.update(metadata or {})
+        return self._transition(module_run_id, {"status": "COMPLETED", "ended_at": utcnow_iso()}, meta_update)
+
+    def mark_step_run_failed(self, module_run_id: str, error: Dict[str, Any]) -> StepRunRecord:
+        err = error if isinstance(error, dict) else {"message": str(error)}
+        reason_code = str(err.get("reason_code") or err.get("reason") or "").strip()
+        return self._transition(
+            module_run_id,
+            {"status": "FAILED", "ended_at": utcnow_iso(), "reason_code": reason_code},
+            {"error": err},
+        )
+
+    def record_output(self, record: OutputRecord) -> None:
+        self.record_outputs([record])
+
+    def record_outputs(self, records: Iterable[OutputRecord]) -> int:
+        """Append many output rows in one transaction (bulk COPY on PostgreSQL)."""
+        now = utcnow_iso()
+        return self.db.insert("outputs_log", OUTPUTS_LOG_HEADERS, [
+            {
+                "tenant_id": record.tenant_id,
+                "work_order_id": record.work_order_id,
+                "step_id": record.step_id,
+                "module_id": record.module_id,
+                "output_id": record.output_id,
+                "path": record.path,
+                "uri": record.uri,
+                "content_type": getattr(record, "content_type", "") or "",
+                "sha256": record.sha256,
+                "bytes": str(record.bytes or record.bytes_size or 0),
+                "bytes_size": str(record.bytes_size or record.bytes or 0),
+                "created_at": record.created_at or now,
+                "metadata_json": _dumps(record.metadata or {}),
+            }
+            for record in records
+        ])
+
+    def list_outputs(self, tenant_id: str, work_order_id: str, step_id: str) -> List[OutputRecord]:
+        rows = self.db.query(
+            "SELECT * FROM outputs_log WHERE tenant_id = ? AND work_order_id = ? AND step_id = ? ORDER BY seq",
+            (tenant_id, work_order_id, step_id),
+        )
+        out: List[OutputRecord] = []
+        for r in rows:
+            meta = _safe_json_load(r.get("metadata_json", ""))
+            bs = _as_int(r.get("bytes")) or _as_int(r.get("bytes_size"))
+            out.append(
+                OutputRecord(
+                    tenant_id=tenant_id,
+                    work_order_id=work_order_id,
+                    step_id=step_id,
+                    module_id=str(r.get("module_id", "")),
+                    output_id=str(r.get("output_id", "")),
+                    path=str(r.get("path", "")),
+                    uri=str(r.get("uri", "")),
+                    content_type=str(r.get("content_type", "")),
+                    sha256=str(r.get("sha256", "")),
+                    bytes=bs,
+                    bytes_size=bs,
+                    created_at=str(r.get("created_at", "")),
+                    metadata=meta if isinstance(meta, dict) else {},
+                )
+            )
+        return out
+
+    def get_output(self, tenant_id: str, work_order_id: str, step_id: str, output_id: str) -> OutputRecord:
+        latest: Optional[OutputRecord] = None
+        for rec in self.list_outputs(tenant_id, work_order_id, step_id):
+            if rec.output_id == output_id and (latest is None or rec.created_at >= latest.created_at):
+                latest = rec
+        if latest is None:
+            raise NotFoundError(f"Output not found: {tenant_id}/{work_order_id}/{step_id}/{output_id}")
+        return latest
+
+    def list_step_runs(self, tenant_id: str, work_order_id: str) -> List[StepRunRecord]:
+        rows = self.db.query(
+            "SELECT * FROM module_runs_log WHERE tenant_id = ? AND work_order_id = ? ORDER BY seq",
+            (tenant_id, work_order_id),
+        )
+        latest_by_id: Dict[str, Dict[str, str]] = {}
+        for r in rows:
+            rid = str(r.get("module_run_id", ""))
+            if not rid:
+                continue
+            prev = latest_by_id.get(rid)
+            if prev is None or str(r.get("created_at", "")) >= str(prev.get("created_at", "")):
+                latest_by_id[rid] = r
+        return [_normalize_step_run_row(r) for r in latest_by_id.values()]
+
+    def record_deliverable_artifact(self, record: DeliverableArtifactRecord) -> None:
+        if not isinstance(record, DeliverableArtifactRecord):
+            raise TypeError("record must be a DeliverableArtifactRecord")
+        row = {
+            "tenant_id": record.tenant_id,
+            "work_order_id": record.work_order_id,
+            "step_id": record.step_id,
+            "module_id": record.module_id,
+            "deliverable_id": record.deliverable_id,
+            "artifact_key": record.artifact_key,
+            "artifact_uri": record.artifact_uri,
+            "status": record.status,
+            "created_at": record.created_at,
+            "idempotency_key": record.idempotency_key,
+            "metadata_json": record.metadata_json,
+        }
+        pub_row = {
+            **row,
+            "content_type": str((record.metadata or {}).get("content_type") or ""),
+            "sha256": record.sha256,
+            "bytes": str(record.bytes or record.bytes_size or 0),
+            "bytes_size": str(record.bytes_size or record.bytes or 0),
+        }
+        with self.db.transaction():
+            self.db.insert("deliverable_artifacts_log", DELIVERABLE_ARTIFACTS_LOG_HEADERS, [row])
+            self.db.insert("published_artifacts_log", PUBLISHED_ARTIFACTS_LOG_HEADERS, [pub_row])
+
+    def list_deliverable_artifacts(self, *, tenant_id: str, work_order_id: str) -> List[DeliverableArtifactRecord]:
+        rows: List[Dict[str, str]] = []
+        for table in ("deliverable_artifacts_log", "published_artifacts_log"):
+            rows += self.db.query(
+                f"SELECT * FROM {table} WHERE tenant_id = ? AND work_order_id = ? ORDER BY seq",
+                (tenant_id, work_order_id),
+            )
+
+        latest: Dict[Tuple[str, ...], Dict[str, str]] = {}
+        for r in rows:
+            ik = str(r.get("idempotency_key", "") or "").strip()
+            key: Tuple[str, ...] = ("idem", ik) if ik else (
+                "composite",
+                str(r.get("step_id", "")),
+                str(r.get("module_id", "")),
+                str(r.get("deliverable_id", "")),
+                str(r.get("artifact_key", "")),
+            )
+            prev = latest.get(key)
+            if prev is None or str(r.get("created_at", "")) >= str(prev.get("created_at", "")):
+                latest[key] = r
+
+        out = [
+            DeliverableArtifactRecord(
+                tenant_id=str(r.get("tenant_id", "")),
+                work_order_id=str(r.get("work_order_id", "")),
+                step_id=str(r.get("step_id", "")),
+                module_id=str(r.get("module_id", "")),
+                deliverable_id=str(r.get("deliverable_id", "")),
+                artifact_key=str(r.get("artifact_key", "")),
+                artifact_uri=str(r.get("artifact_uri", "")),
+                status=str(r.get("status", "")),
+                created_at=str(r.get("created_at", "")),
+                idempotency_key=str(r.get("idempotency_key", "")),
+                metadata_json=str(r.get("metadata_json", "")),
+            )
+            for r in latest.values()
+        ]
+        out.sort(key=lambda x: (x.step_id, x.module_id, x.deliverable_id, x.created_at))
+        return out
+
+    def list_published_artifacts(self, *, tenant_id: str, work_order_id: str) -> List[DeliverableArtifactRecord]:
+        return self.list_deliverable_artifacts(tenant_id=tenant_id, work_order_id=work_order_id)
+
+    def append_step_run(self, record: StepRunRecord) -> None:
+        meta = record.metadata or {}
+        meta.setdefault("step_id", record.step_id)
+        self._append_module_run({
+            "module_run_id": record.module_run_id,
+            "tenant_id": record.tenant_id,
+            "work_order_id": record.work_order_id,
+            "module_id": record.module_id,
+            "status": record.status,
+            "created_at": record.created_at,
+            "started_at": record.started_at,
+            "ended_at": record.ended_at,
+            "reason_code": record.reason_code,
+            "report_path": record.report_path,
+            "output_ref": record.output_ref,
+            "metadata_json": _dumps(meta),
+        })
+
+    def append_output(self, record: OutputRecord) -> None:
+        self.record_output(record)
+
+    def _latest_step_run_row(self, module_run_id: str) -> Dict[str, str]:
+        hit = self.db.query(
+            "SELECT * FROM module_runs_log WHERE module_run_id = ? ORDER BY created_at DESC, seq DESC LIMIT 1",
+            (module_run_id,),
+        )
+        if not hit:
+            raise NotFoundError(f"module_run_id not found: {module_run_id}")
+        row = hit[0]
+        row.pop("seq", None)
+        return row
+
+    def export_csv(self, out_dir: Path) -> Dict[str, int]:
+        """Write every log in the CsvRunStateStore schema into `out_dir`."""
+        out = {name: self.db.export_csv(table, headers, out_dir / name) for table, (name, headers) in _LOGS.items()}
+        out["workorders_status.csv"] = self.db.export_csv("workorders_status", WORKORDERS_STATUS_HEADERS, out_dir / "workorders_status.csv")
+        return out
+
+    def describe(self) -> Dict[str, Any]:
+        return {"class": self.__class__.__name__, **self.db.describe()}
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from .runstate_sql import SqlRunStateStore
+from .sqlite_db import SqliteDatabase
+
+
+class SqliteRunStateStore(SqlRunStateStore):
+    """RunStateStore backed by a local single-file SQLite database (WAL)."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        super().__init__(SqliteDatabase(db_path))
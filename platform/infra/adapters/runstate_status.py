@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ...orchestration.status_reducer import StatusInputs, reduce_workorder_status
+from ...utils.csvio import append_csv_rows, read_csv, write_csv
+
+
+# Materialized latest status per (tenant_id, work_order_id), folded from run-state events:
+#   - run events (create_run / set_run_status) keep the latest explicit run_status
+#   - step events (create_step_run / mark_*) keep the latest status per step_id
+# `status` is a pure function of both, so live updates and a rebuild from the logs agree
+# regardless of how the two logs interleave: the explicit run status wins when it is at
+# least as recent as the last step event (CREATED never overrides step progress on a tie),
+# otherwise the step statuses are reduced via reduce_workorder_status.
+WORKORDERS_STATUS_HEADERS = [
+    "tenant_id",
+    "work_order_id",
+    "status",
+    "run_status",
+    "run_status_at",
+    "step_statuses_json",
+    "steps_updated_at",
+    "updated_at",
+]
+
+# workorders_status.csv is append-only between compactions: each update appends the full new
+# row for its workorder and the last row per key wins on load. The file is rewritten with one
+# row per workorder once it holds more than COMPACT_RATIO rows per workorder (and at least
+# COMPACT_MIN_ROWS rows).
+COMPACT_MIN_ROWS = 1000
+COMPACT_RATIO = 4
+
+
+def _steps(row: Dict[str, str]) -> Dict[str, str]:
+    try:
+        d = json.loads(str(row.get("step_statuses_json") or "{}"))
+    except Exception:
+        d = {}
+    return {str(k): str(v) for k, v in d.items()} if isinstance(d, dict) else {}
+
+
+def _new_row(tenant_id: str, work_order_id: str) -> Dict[str, str]:
+    row = {h: "" for h in WORKORDERS_STATUS_HEADERS}
+    row.update({"tenant_id": tenant_id, "work_order_id": work_order_id, "step_statuses_json": "{}"})
+    return row
+
+
+def _derive(row: Dict[str, str]) -> Dict[str, str]:
+    run_status, run_at = str(row.get("run_status") or ""), str(row.get("run_status_at") or "")
+    steps, steps_at = _steps(row), str(row.get("steps_updated_at") or "")
+    if run_status and (not steps or run_at > steps_at or (run_at == steps_at and run_status != "CREATED")):
+        row["status"] = run_status
+    elif steps:
+        row["status"] = reduce_workorder_status(StatusInputs(
+            step_statuses=steps,
+            refunds_exist=False,
+            publish_required=False,
+            publish_completed=False,
+        ))
+    else:
+        row["status"] = "CREATED"
+    row["updated_at"] = max(run_at, steps_at)
+    return row
+
+
+def apply_run_event(row: Optional[Dict[str, str]], *, tenant_id: str, work_order_id: str, status: str, at: str) -> Dict[str, str]:
+    out = dict(row or _new_row(tenant_id, work_order_id))
+    if at >= str(out.get("run_status_at") or ""):
+        out["run_status"] = str(status or "").strip().upper() or "CREATED"
+        out["run_status_at"] = at
+    return _derive(out)
+
+
+def apply_step_event(
+    row: Optional[Dict[str, str]], *, tenant_id: str, work_order_id: str, step_id: str, status: str, at: str
+) -> Dict[str, str]:
+    out = dict(row or _new_row(tenant_id, work_order_id))
+    steps = _steps(out)
+    steps[str(step_id)] = str(status or "").strip().upper()
+    out["step_statuses_json"] = json.dumps(steps, sort_keys=True, separators=(",", ":"))
+    out["steps_updated_at"] = max(at, str(out.get("steps_updated_at") or ""))
+    return _derive(out)
+
+
+def step_event_from_module_run_row(row: Dict[str, Any]) -> Tuple[str, str, str, str]:
+    """(tenant_id, work_order_id, step_id, status) for a module_runs_log row."""
+    try:
+        meta = json.loads(str(row.get("metadata_json") or "{}"))
+    except Exception:
+        meta = {}
+    meta = meta if isinstance(meta, dict) else {}
+    step_id = str(meta.get("step_id") or meta.get("step") or row.get("step_id") or "").strip()
+    return str(row.get("tenant_id", "")), str(row.get("work_order_id", "")), step_id, str(row.get("status", ""))
+
+
+def fold_status_rows(
+    workorder_rows: Iterable[Dict[str, str]], module_run_rows: Iterable[Dict[str, str]]
+) -> List[Dict[str, str]]:
+    """Rebuild the status table from full workorders_log and module_runs_log contents."""
+    table: Dict[Tuple[str, str], Dict[str, str]] = {}
+    for r in workorder_rows:
+        key = (str(r.get("tenant_id", "")), str(r.get("work_order_id", "")))
+        table[key] = apply_run_event(
+            table.get(key), tenant_id=key[0], work_order_id=key[1], status=str(r.get("status", "")), at=str(r.get("created_at", ""))
+        )
+    for r in module_run_rows:
+        tid, wid, sid, st = step_event_from_module_run_row(r)
+        if not sid:
+            continue
+        # File order is append order, so this replays exactly what the live updates saw.
+        table[(tid, wid)] = apply_step_event(
+            table.get((tid, wid)), tenant_id=tid, work_order_id=wid, step_id=sid, status=st, at=str(r.get("created_at", ""))
+        )
+    return [table[k] for k in sorted(table.keys())]
+
+
+class CsvStatusTable:
+    """workorders_status.csv kept in memory; updates are appended and compacted periodically.
+
+    An update costs one appended row instead of a rewrite of every workorder; the file is
+    compacted when superseded rows dominate. It is reloaded if another process changes it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._rows: Optional[Dict[Tuple[str, str], Dict[str, str]]] = None
+        self._stamp: Tuple[int, int] = (-1, -1)
+        self._file_rows = 0
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return (-1, -1)
+        return (int(st.st_mtime_ns), int(st.st_size))
+
+    def _load(self) -> Dict[Tuple[str, str], Dict[str, str]]:
+        stamp = self._file_stamp()
+        if self._rows is None or stamp != self._stamp:
+            raw = read_csv(self.path)
+            # Later rows supersede earlier ones for the same workorder.
+            self._rows = {(r.get("tenant_id", ""), r.get("work_order_id", "")): r for r in raw}
+            self._file_rows = len(raw)
+            self._stamp = stamp
+        return self._rows
+
+    def _save(self, rows: Dict[Tuple[str, str], Dict[str, str]]) -> None:
+        write_csv(self.path, [rows[k] for k in sorted(rows.keys())], WORKORDERS_STATUS_HEADERS)
+        self._rows = rows
+        self._file_rows = len(rows)
+        self._stamp = self._file_stamp()
+
+    def _put(self, rows: Dict[Tuple[str, str], Dict[str, str]], key: Tuple[str, str], row: Dict[str, str]) -> None:
+        rows[key] = row
+        if self._file_rows + 1 > max(COMPACT_MIN_ROWS, COMPACT_RATIO * len(rows)):
+            self._save(rows)
+            return
+        append_csv_rows(self.path, [row], WORKORDERS_STATUS_HEADERS, fsync=False)
+        self._file_rows += 1
+        self._stamp = self._file_stamp()
+
+    def compact(self) -> int:
+        """Rewrite the file with one row per workorder; returns the number of rows kept."""
+        with self._lock:
+            rows = self._load()
+            self._save(rows)
+            return len(rows)
+
+    def get(self, tenant_id: str, work_order_id: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            row = self._load().get((tenant_id, work_order_id))
+            return dict(row) if row is not None else None
+
+    def on_run_status(self, tenant_id: str, work_order_id: str, status: str, at: str) -> None:
+        with self._lock:
+            rows = self._load()
+            key = (tenant_id, work_order_id)
+            self._put(rows, key, apply_run_event(rows.get(key), tenant_id=tenant_id, work_order_id=work_order_id, status=status, at=at))
+
+    def on_module_run_row(self, row: Dict[str, Any]) -> None:
+        tid, wid, sid, st = step_event_from_module_run_row(row)
+        if not sid:
+            return
+        with self._lock:
+            rows = self._load()
+            self._put(rows, (tid, wid), apply_step_event(
+                rows.get((tid, wid)), tenant_id=tid, work_order_id=wid, step_id=sid, status=st, at=str(row.get("created_at", ""))
+            ))
+
+    def rebuild(self, workorder_rows: List[Dict[str, str]], module_run_rows: List[Dict[str, str]]) -> int:
+        folded = fold_status_rows(workorder_rows, module_run_rows)
+        with self._lock:
+            self._save({(r["tenant_id"], r["work_order_id"]): r for r in folded})
+        return len(folded)
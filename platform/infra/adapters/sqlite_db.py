@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple, Union
+
+from ..errors import ConflictError
+from ...utils.csvio import write_csv
+
+
+class SqliteDatabase:
+    """Single-file SQLite handle shared by the sqlite adapters.
+
+    Tables mirror the canonical CSV schemas column-for-column (all TEXT) plus an
+    autoincrement `seq`, so append order is preserved and CSV export is lossless.
+    The database runs in WAL mode; writes go through `transaction()`, which nests so
+    callers can group many writes into one commit.
+    """
+
+    # SQLite has no row locks; BEGIN IMMEDIATE already serializes writers.
+    for_update = ""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._depth = 0
+        self.conn = sqlite3.connect(str(path), timeout=30.0, isolation_level=None, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+
+    def close(self) -> None:
+        with self._lock:
+            self.conn.close()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            outer = self._depth == 0
+            if outer:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self._depth += 1
+            try:
+                yield self.conn
+            except BaseException:
+                self._depth -= 1
+                if outer:
+                    self.conn.execute("ROLLBACK")
+                raise
+            self._depth -= 1
+            if outer:
+                self.conn.execute("COMMIT")
+
+    def ensure_table(
+        self,
+        table: str,
+        headers: Sequence[str],
+        *,
+        extra_columns: Sequence[str] = (),
+        unique: Sequence[Union[str, Tuple[str, ...]]] = (),
+        indexes: Sequence[Tuple[str, ...]] = (),
+    ) -> None:
+        cols = ["seq INTEGER PRIMARY KEY AUTOINCREMENT"]
+        cols += [f"{c} TEXT NOT NULL DEFAULT ''" for c in list(headers) + list(extra_columns)]
+        with self.transaction() as conn:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(cols)})")
+            for key in unique:
+                key_cols = (key,) if isinstance(key, str) else tuple(key)
+                conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table}__{'_'.join(key_cols)}__uq ON {table} ({', '.join(key_cols)})")
+            for idx_cols in indexes:
+                name = f"{table}__{'_'.join(idx_cols)}__idx"
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(idx_cols)})")
+
+    def insert(self, table: str, columns: Sequence[str], rows: Iterable[Dict[str, Any]]) -> int:
+        cols = list(columns)
+        sql = f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' for _ in cols)})"
+        values = [tuple("" if r.get(c) is None else str(r.get(c)) for c in cols) for r in rows]
+        if not values:
+            return 0
+        try:
+            with self.transaction() as conn:
+                conn.executemany(sql, values)
+        except sqlite3.IntegrityError as e:
+            raise ConflictError(f"{table}: {e}") from e
+        return len(values)
+
+    def upsert(self, table: str, columns: Sequence[str], row: Dict[str, Any], key: Sequence[str]) -> None:
+        """Insert `row`, or overwrite the row with the same `key` (which needs a unique index)."""
+        self.execute(upsert_sql(table, columns, key), [("" if row.get(c) is None else str(row.get(c))) for c in columns])
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        with self.transaction() as conn:
+            conn.execute(sql, tuple(params))
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, str]]:
+        with self._lock:
+            return [dict(r) for r in self.conn.execute(sql, tuple(params)).fetchall()]
+
+    def export_csv(self, table: str, headers: Sequence[str], path: Path) -> int:
+        """Write `table` to `path` in the canonical CSV schema, in append order."""
+        rows = self.query(f"SELECT {', '.join(headers)} FROM {table} ORDER BY seq")
+        write_csv(path, rows, list(headers))
+        return len(rows)
+
+    def describe(self) -> Dict[str, Any]:
+        return {"db_path": str(self.path)}
+
+
+def upsert_sql(table: str, columns: Sequence[str], key: Sequence[str]) -> str:
+    """INSERT ... ON CONFLICT (key) DO UPDATE, valid for both SQLite (>= 3.24) and PostgreSQL."""
+    cols = list(columns)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in cols if c not in key)
+    return (
+        f"INSERT INTO {table} ({', '.join(cols)}) VALUES ({', '.join('?' for _ in cols)}) "
+        f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {updates}"
+    )
+
+
+def where_clause(filters: Sequence[Tuple[str, str, Any]]) -> Tuple[str, List[Any]]:
+    """Build a WHERE clause from (column, operator, value) triples, skipping empty values."""
+    parts: List[str] = []
+    params: List[Any] = []
+    for col, op, val in filters:
+        if val is None or val == "":
+            continue
+        parts.append(f"{col} {op} ?")
+        params.append(val)
+    return ((" WHERE " + " AND ".join(parts)) if parts else ""), params
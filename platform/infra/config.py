@@ -14,12 +14,13 @@ from .errors import ValidationError
 # Adapter kind enums are intentionally strict. Any unknown kind is rejected.
 ALLOWED_ADAPTER_KINDS: Dict[str, Tuple[str, ...]] = {
     "registry": ("repo_csv", "db_postgres"),
-    "run_state_store": ("billing_state_csv", "db_postgres"),
-    "ledger_writer": ("billing_state_csv", "db_postgres"),
+    "run_state_store": ("billing_state_csv", "sqlite", "db_postgres"),
+    "ledger_writer": ("billing_state_csv", "sqlite", "db_postgres"),
     "artifact_store": ("local_fs", "s3", "github_release", "multi"),
     "execution_backend": ("local_python", "external_engine"),
     "artifact_publisher": ("github_releases", "cloud_storage", "noop"),
     "tenant_credentials_store": ("csv_dev", "db_postgres"),
+    "module_cache_store": ("local_fs", "s3", "multi"),
 }
 
 
@@ -36,6 +37,7 @@ REQUIRED_ADAPTER_KEYS = (
 
 OPTIONAL_ADAPTER_KEYS = (
     "tenant_credentials_store",
+    "module_cache_store",
 )
 
 
@@ -84,6 +84,10 @@ class RunStateStore(Protocol):
     def set_run_status(self, tenant_id: str, work_order_id: str, status: str, metadata: Optional[Dict[str, Any]] = None) -> None:
         raise NotImplementedError
 
+    def get_run_status(self, tenant_id: str, work_order_id: str) -> Optional[Dict[str, str]]:
+        """Materialized latest status (status, step_statuses_json, updated_at) or None."""
+        raise NotImplementedError
+
 
     def record_deliverable_artifact(self, record: DeliverableArtifactRecord) -> None:
         raise NotImplementedError
@@ -117,7 +121,13 @@ class LedgerWriter(Protocol):
         step_id: Optional[str] = None,
         deliverable_id: Optional[str] = None,
         since: Optional[str] = None,
+        transaction_id: Optional[str] = None,
     ) -> List[TransactionItemRecord]:
+        """Filtered item query in ledger order.
+
+        Implementations keep secondary indexes on (tenant_id, work_order_id) and transaction_id,
+        so queries pinned to a workorder or transaction cost time proportional to its items.
+        """
         raise NotImplementedError
 
     # Legacy alias method
@@ -13,6 +13,44 @@ def is_valid_module_kind(value: Any) -> bool:
     return str(value or "").strip() in MODULE_KIND_VALUES
 
 
+# Module output cache scope (module.yml `cache.scope`, default "tenant").
+# "global" declares a deterministic module whose outputs depend only on its inputs: cached
+# outputs are keyed without the tenant and stored once for all tenants. Billing and run-state
+# records remain per tenant either way.
+ModuleCacheScope = Literal["tenant", "global"]
+MODULE_CACHE_SCOPE_VALUES: Tuple[str, ...] = ("tenant", "global")
+DEFAULT_MODULE_CACHE_SCOPE: ModuleCacheScope = "tenant"
+
+
+def is_valid_module_cache_scope(value: Any) -> bool:
+    return str(value or "").strip() in MODULE_CACHE_SCOPE_VALUES
+
+
+def module_cache_scope(module_yml: Dict[str, Any]) -> str:
+    """Declared cache scope of a module.yml mapping; raises ValueError when invalid."""
+    cache = module_yml.get("cache") or {}
+    if not isinstance(cache, dict):
+        raise ValueError("module.yml cache must be a mapping")
+    scope = str(cache.get("scope") or DEFAULT_MODULE_CACHE_SCOPE).strip()
+    if not is_valid_module_cache_scope(scope):
+        raise ValueError(f"invalid cache.scope={scope!r} (allowed: {list(MODULE_CACHE_SCOPE_VALUES)})")
+    return scope
+
+
+def module_cache_bypass_inputs(module_yml: Dict[str, Any]) -> List[str]:
+    """Inputs (module.yml `cache.bypass_inputs`) that, when truthy, disable output reuse for a step.
+
+    Declared by modules whose outputs then also depend on state outside their inputs.
+    """
+    cache = module_yml.get("cache") or {}
+    raw = cache.get("bypass_inputs") if isinstance(cache, dict) else None
+    if raw is None:
+        return []
+    if not isinstance(raw, list) or not all(isinstance(x, str) and x.strip() for x in raw):
+        raise ValueError("module.yml cache.bypass_inputs must be a list of input ids")
+    return [x.strip() for x in raw]
+
+
 @dataclass(frozen=True)
 class StepSpec:
     """Declarative step definition from a workorder spec."""
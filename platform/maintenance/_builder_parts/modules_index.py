@@ -12,6 +12,7 @@ import yaml
 
 from ..common.id_policy import generate_unique_id, validate_id
 from ..common.id_codec import canon_module_id, canon_tenant_id
+from ..infra.models import module_cache_bypass_inputs, module_cache_scope
 from ..utils.csvio import read_csv, write_csv
 from ..utils.time import utcnow_iso
 
@@ -229,6 +230,11 @@ def _compile_module_contract_rules(ctx: MaintenanceContext, module_id: str) -> L
     out_limited = p_outputs.get("limited_port") or []
     if not all(isinstance(x, list) for x in (in_port, in_limited, out_port, out_limited)):
         raise ValueError(f"ports.*.port and ports.*.limited_port must be lists for module {mid}")
+    try:
+        module_cache_scope(myml)
+        module_cache_bypass_inputs(myml)
+    except ValueError as e:
+        raise ValueError(f"{e} for module {mid}") from e
 
     # Output schema: optional; used only to enrich content_schema_json.
     output_schema = _read_json(mdir / "output_schema.json") if (mdir / "output_schema.json").exists() else {}
@@ -54,7 +54,12 @@ PART = r'''\
                 "module_run_id": mr_id,
                 "inputs": resolved_inputs,
                 "reuse_output_type": str(cfg.get("reuse_output_type","")).strip(),
-                "_platform": {"plan_type": plan_type, "step_id": sid, "step_name": sname, "module_id": mid, "run_id": spend_tx},
+                "_platform": {
+                    "plan_type": plan_type, "step_id": sid, "step_name": sname, "module_id": mid, "run_id": spend_tx,
+                    "runtime_dir": str(runtime_dir), "cache_dir": str(runtime_dir / "module_cache" / tenant_id / mid),
+                    "search_cache_dir": str(runtime_dir / "search_cache"), "cache_ttl_enabled": ttl_on,
+                    "cache_ttl_days": {f"{place}:{typ}": days for (place, typ), days in cache_ttl_days_by_place_type.items()},
+                },
             }
             # Backward compatibility: also expose resolved inputs at top-level (without overriding reserved keys).
             if isinstance(resolved_inputs, dict):
@@ -71,7 +76,20 @@ PART = r'''\
             # ------------------------------------------------------------------
             reuse_type = str(cfg.get("reuse_output_type", "")).strip().lower()
             key_inputs = resolved_inputs if isinstance(resolved_inputs, dict) else {}
-            cache_key = derive_cache_key(module_id=mid, tenant_id=tenant_id, key_inputs=key_inputs)
+            # Resolve module contract + kind once per step so downstream logic
+            # (including delivery evidence) can always reference module_kind,
+            # even when the step fails.
+            try:
+                contract = registry.get_contract(mid)
+            except Exception:
+                contract = {}
+            module_kind = str(contract.get('kind') or 'transform').strip() or 'transform'
+            # module.yml cache.bypass_inputs: the step's output also depends on module state, so
+            # it is neither served from nor stored in the output cache, nor single-flighted.
+            cache_bypass = any(key_inputs.get(k) for k in (contract.get("cache_bypass_inputs") or []))
+            if cache_bypass:
+                reuse_type = ""
+            cache_key = derive_cache_key(module_id=mid, tenant_id=tenant_id, key_inputs=key_inputs, scope=cache_scopes.get(mid, "tenant"))
             cache_dir = cache_root / _cache_dirname(cache_key)
             cache_row = None
             for r in cache_index:
@@ -111,7 +129,7 @@ PART = r'''\
                     'report_path': 'binding_error.json',
                     'output_ref': '',
                 }
-            elif reuse_type == "cache" and _dir_has_files(cache_dir) and (cache_row is None or cache_valid):
+            elif reuse_type == "cache" and (cache_row is None or cache_valid) and module_cache.fetch(cache_key, cache_dir):
                 _copy_tree(cache_dir, out_dir)
                 result = {
                     "status": "COMPLETED",
@@ -122,15 +140,8 @@ PART = r'''\
                 }
             else:
                 module_env = env_for_module(store, mid)
-                result = execute_module_runner(module_path=module_path, params=params, outputs_dir=out_dir, env=module_env)
-            # Resolve module contract + kind once per step so downstream logic
-            # (including delivery evidence) can always reference module_kind,
-            # even when the step fails.
-            try:
-                contract = registry.get_contract(mid)
-            except Exception:
-                contract = {}
-            module_kind = str(contract.get('kind') or 'transform').strip() or 'transform'
+                run = lambda: execute_module_runner(module_path=module_path, params=params, outputs_dir=out_dir, env=module_env)  # noqa: E731
+                result = step_flights.run(cache_key, out_dir, run) if reuse_type == "cache" else run()
             # Record outputs into RunStateStore using module ports output paths (latest wins).
             # IMPORTANT: module.yml defines outputs under ports.outputs.port (and ports.outputs.limited_port),
             # not as a direct contract['outputs'] dict. Binding resolution depends on these records.
@@ -141,58 +152,12 @@ PART = r'''\
                     ports = ports_cache.get(mid) or {}
                 except Exception:
                     ports = {}
-                outputs_port = {}
-                try:
-                    op = []
-                    if isinstance(ports, dict):
-                        if isinstance(ports.get('outputs'), dict):
-                            op = (ports.get('outputs') or {}).get('port') or []
-                        elif isinstance(ports.get('outputs_port'), list):
-                            op = ports.get('outputs_port') or []
-                    if isinstance(op, list):
-                        for o in op:
-                            if not isinstance(o, dict):
-                                continue
-                            oid = str(o.get('id') or '').strip()
-                            if not oid:
-                                continue
-                            outputs_port[oid] = o
-                except Exception:
-                    outputs_port = {}
-                for output_id, odef in outputs_port.items():
-                    rel_path = str(odef.get('path') or '').lstrip('/').strip()
-                    if not rel_path:
-                        continue
-                    abs_path = out_dir / rel_path
-                    if not abs_path.exists():
-                        continue
-                    try:
-                        from platform.utils.hashing import sha256_file
-                        sha = sha256_file(abs_path)
-                        bs = int(abs_path.stat().st_size)
-                    except Exception:
-                        sha = ''
-                        bs = 0
-                    try:
-                        from platform.infra.models import OutputRecord
-                        rec = OutputRecord(
-                            tenant_id=tenant_id,
-                            work_order_id=work_order_id,
-                            step_id=sid,
-                            module_id=mid,
-                            kind=module_kind,
-                            output_id=str(output_id),
-                            path=rel_path,
-                            uri=abs_path.resolve().as_uri(),
-                            content_type=str(odef.get('format') or ''),
-                            sha256=sha,
-                            bytes=bs,
-                            bytes_size=bs,
-                            created_at=utcnow_iso(),
-                        )
-                        run_state.record_output(rec)
-                    except Exception:
-                        pass
+                from platform.utils.hashing import digest_cache
+                _record_step_outputs(
+                    run_state, ports, out_dir,
+                    tenant_id=tenant_id, work_order_id=work_order_id, step_id=sid, module_id=mid,
+                    module_kind=module_kind, digests=digest_cache(runtime_dir),
+                )
                 step_run = run_state.mark_step_run_succeeded(
                     mr_id,
                     requested_deliverables=list(requested_deliverables or []),
@@ -269,8 +234,7 @@ PART = r'''\
                                         release_id_local = str(rr.get("release_id") or "").strip()
                                         break
                                 if not exists:
-                                    used_rel = {id_key(r.get("release_id")) for r in rel_map if id_key(r.get("release_id"))}
-                                    release_id_local = _new_id("release_id", used_rel)
+                                    release_id_local = _new_id("release_id")
                                     rel_map.append({
                                         "release_id": release_id_local,
                                         "github_release_id": gh_rel_id,
@@ -281,7 +245,6 @@ PART = r'''\
                                     })
                                 assets_list = receipt.get("assets")
                                 if isinstance(assets_list, list) and release_id_local:
-                                    used_asset = {id_key(r.get("asset_id")) for r in asset_map if id_key(r.get("asset_id"))}
                                     for aa in assets_list:
                                         if not isinstance(aa, dict):
                                             continue
@@ -300,7 +263,7 @@ PART = r'''\
                                         if dup:
                                             continue
                                         asset_map.append({
-                                            "asset_id": _new_id("asset_id", used_asset),
+                                            "asset_id": _new_id("asset_id"),
                                             "github_asset_id": gh_aid,
                                             "release_id": release_id_local,
                                             "asset_name": aname,
@@ -337,7 +300,7 @@ PART = r'''\
                             break
                     if not already:
                         ev_row = {
-                            "transaction_item_id": _new_id("transaction_item_id", used_ti),
+                            "transaction_item_id": _new_id("transaction_item_id"),
                             "transaction_id": spend_tx,
                             "tenant_id": tenant_id,
                             "module_id": mid,
@@ -397,19 +360,20 @@ PART = r'''\
             # Persist successful outputs into the local module cache.
             # Cache is only reused when reuse_output_type == "cache".
             if status == "COMPLETED":
-                if not cache_hit:
-                    _copy_tree(out_dir, cache_dir)
+                if not cache_hit and not cache_bypass:
+                    module_cache.store(cache_key, out_dir, cache_dir)
                 now_dt = datetime.now(timezone.utc).replace(microsecond=0)
                 # Index module run cache key (GitHub Actions cache) and local filesystem outputs.
-                cache_index_upsert(
-                    cache_index,
-                    platform_cfg=platform_cfg,
-                    ttl_days_by_place_type=cache_ttl_days_by_place_type,
-                    place="cache",
-                    typ="module_run",
-                    ref=cache_key,
-                    now_dt=now_dt,
-                )
+                if not cache_bypass:
+                    cache_index_upsert(
+                        cache_index,
+                        platform_cfg=platform_cfg,
+                        ttl_days_by_place_type=cache_ttl_days_by_place_type,
+                        place="cache",
+                        typ="module_run",
+                        ref=cache_key,
+                        now_dt=now_dt,
+                    )
                 try:
                     out_rel = str(out_dir.relative_to(repo_root)).replace("\\", "/")
                     cache_index_upsert(
@@ -436,6 +400,20 @@ PART = r'''\
                     )
                 except Exception:
                     pass
+                # Entries a module keeps in its own cache_dir (e.g. package_std's packages/<key>).
+                for cache_ref in result.get("cache_refs") or []:
+                    try:
+                        cache_index_upsert(
+                            cache_index,
+                            platform_cfg=platform_cfg,
+                            ttl_days_by_place_type=cache_ttl_days_by_place_type,
+                            place="fs",
+                            typ="module_cache_entry",
+                            ref=str(Path(cache_ref).relative_to(repo_root)).replace("\\", "/"),
+                            now_dt=now_dt,
+                        )
+                    except Exception:
+                        pass
                 # Persist cache_index.csv after any mutation so cache entries are durable even if later steps fail.
                 try:
                     billing.save_table("cache_index.csv", cache_index, headers=CACHE_INDEX_HEADERS)
@@ -481,7 +459,7 @@ PART = r'''\
                             break
                     now = utcnow_iso()
                     if not refund_tx:
-                        refund_tx = _new_id("transaction_id", used_tx)
+                        refund_tx = _new_id("transaction_id")
                         tx_meta = {
                             "step_id": sid,
                             "step_name": sname,
@@ -3,7 +3,6 @@
 PART = r'''\
 
 import json
-import re
 import os
 import hashlib
 import shutil
@@ -37,6 +36,7 @@ from .idempotency import (
 from .status_reducer import StatusInputs, reduce_workorder_status
 
 from ..secretstore.loader import load_secretstore, env_for_module
+from ..config.validate_platform_config import parse_ttl_days_by_place_type as _parse_ttl_days_by_place_type
 
 from ..workorders.preflight import validate_workorder_preflight
 
@@ -48,38 +48,6 @@ def _parse_iso_z(s: str) -> datetime:
         s = s.replace("Z", "+00:00")
     return datetime.fromisoformat(s)
 
-def _parse_ttl_days_by_place_type(cfg: dict) -> dict[tuple[str, str], int]:
-    """Parse platform_config.cache_ttl_policy.ttl_days_by_place_type into a mapping.
-
-    Returns: {(place, type): days}
-    Raises: ValueError on invalid or missing structures.
-    """
-    root = cfg.get('cache_ttl_policy') or {}
-    entries = root.get('ttl_days_by_place_type')
-    if not isinstance(entries, list):
-        raise ValueError('Invalid platform_config.cache_ttl_policy.ttl_days_by_place_type: expected list')
-    out: dict[tuple[str, str], int] = {}
-    rx = re.compile(r'^(?P<place>[a-z0-9_]+):(?P<type>[a-z0-9_]+)=(?P<days>[0-9]+)$')
-    for raw in entries:
-        if not isinstance(raw, str):
-            raise ValueError('Invalid platform_config.cache_ttl_policy.ttl_days_by_place_type entry: expected string')
-        s = raw.strip()
-        m = rx.match(s)
-        if not m:
-            raise ValueError(f"Invalid cache_ttl_policy.ttl_days_by_place_type entry {s!r} (expected 'place:type=days')")
-        place = m.group('place')
-        typ = m.group('type')
-        days = int(m.group('days'))
-        if days <= 0:
-            raise ValueError(f"Invalid cache_ttl_policy.ttl_days_by_place_type entry {s!r} (days must be positive)")
-        k = (place, typ)
-        if k in out:
-            raise ValueError(f"Duplicate cache_ttl_policy.ttl_days_by_place_type rules for place={place!r} type={typ!r}")
-        out[k] = days
-    return out
-
-    
-
 def _cache_expires_at_iso_z(*, platform_cfg: dict, ttl_days_by_place_type: dict[tuple[str,str], int], place: str, typ: str, now_dt: datetime) -> str:
     """Compute expires_at for a cache_index entry.
 
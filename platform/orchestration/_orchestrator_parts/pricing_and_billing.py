@@ -278,10 +278,6 @@ def _load_module_artifacts_policy(repo_root: Path) -> Dict[str, bool]:
     return out
 
 
-def _new_id(id_type: str, used: Set[str]) -> str:
-    return generate_unique_id(id_type, used)
-
-
 @dataclass(frozen=True)
 class OrchestratorContext:
     tenant_id: str
@@ -290,7 +286,9 @@ class OrchestratorContext:
     runtime_profile_name: str
 
 
-def run_orchestrator(repo_root: Path, billing_state_dir: Path, runtime_dir: Path, enable_github_releases: bool = False, infra: InfraBundle | None = None) -> None:
+def run_orchestrator(repo_root: Path, billing_state_dir: Path, runtime_dir: Path, enable_github_releases: bool = False, infra: InfraBundle | None = None, shard: Tuple[int, int] | None = None) -> None:
+    """Run one orchestrator tick. With shard=(i, n), only tenants hashed into shard i are processed
+    (see sharding.py); shard outputs are combined with `platform billing-merge-shards`."""
     if infra is None:
         from ..infra.config import load_runtime_profile
         from ..infra.factory import build_infra
@@ -324,6 +322,7 @@ def run_orchestrator(repo_root: Path, billing_state_dir: Path, runtime_dir: Path
     prices = _load_module_prices(repo_root)
     artifacts_policy = _load_module_artifacts_policy(repo_root)
     module_names = _load_module_display_names(registry)
+    cache_scopes = _load_module_cache_scopes(registry)
 
     billing = BillingState(billing_state_dir)
     billing_state_dir.mkdir(parents=True, exist_ok=True)
@@ -341,19 +340,36 @@ def run_orchestrator(repo_root: Path, billing_state_dir: Path, runtime_dir: Path
         ]
     )
 
+    queue_source, workorders = _load_workorders_queue(repo_root)
+    if shard is not None:
+        from .sharding import in_shard
+
+        workorders = [it for it in workorders if in_shard(str(it["tenant_id"]), shard)]
+
+    # Partitioned ledgers: load open partitions plus closed ones touching queued work orders
+    # (idempotency lookups); unpartitioned tables are read in full as before.
+    queued_keys = [(canon_tenant_id(it["tenant_id"]), canon_work_order_id(it["work_order_id"])) for it in workorders]
     tenants_credits = dedupe_tenants_credits(billing.load_table("tenants_credits.csv"))
-    transactions = billing.load_table("transactions.csv")
-    transaction_items = billing.load_table("transaction_items.csv")
+    # O(1) balance lookups; workorders hold credits on admission and settle on completion.
+    # SQL ledgers also take each hold from their shared balance under a row lock.
+    from ..billing.credit_book import CreditBook
+
+    credit_book = CreditBook(tenants_credits, ledger=ledger)
+    transactions = billing.load_table("transactions.csv", open_only=True, work_orders=queued_keys)
+    transaction_items = billing.load_table("transaction_items.csv", open_only=True, work_orders=queued_keys)
     cache_index = billing.load_table("cache_index.csv")
     promo_redemptions = billing.load_table("promotion_redemptions.csv")
     rel_map = billing.load_table("github_releases_map.csv")
     asset_map = billing.load_table("github_assets_map.csv")
 
-    used_tx: Set[str] = {id_key(r.get("transaction_id")) for r in transactions if id_key(r.get("transaction_id"))}
-    used_ti: Set[str] = {id_key(r.get("transaction_item_id")) for r in transaction_items if id_key(r.get("transaction_item_id"))}
-    used_mr: Set[str] = set()
-    used_rel: Set[str] = {id_key(r.get("release_id")) for r in rel_map if id_key(r.get("release_id"))}
-    used_asset: Set[str] = {id_key(r.get("asset_id")) for r in asset_map if id_key(r.get("asset_id"))}
+    # IDs come from blocks reserved in billing-state (id_blocks.json), namespaced per shard;
+    # reserved blocks never overlap, so minting needs no scan of existing IDs.
+    from ..common.id_allocator import IdAllocator
+
+    id_allocator = IdAllocator(billing_state_dir, namespace=shard)
+
+    def _new_id(id_type: str) -> str:
+        return id_allocator.new_id(id_type)
 
     runtime_dir.mkdir(parents=True, exist_ok=True)
     ensure_dir(runtime_dir)
@@ -361,8 +377,14 @@ def run_orchestrator(repo_root: Path, billing_state_dir: Path, runtime_dir: Path
     # Local module output cache (persisted across workflow runs via actions/cache).
     cache_root = runtime_dir / "cache_outputs"
     ensure_dir(cache_root)
-
-    queue_source, workorders = _load_workorders_queue(repo_root)
+    # Identical cacheable steps in this run execute once (see single_flight.StepFlights).
+    # The optional L2 tier (runtime profile `module_cache_store`) survives runner churn.
+    from .single_flight import StepFlights
+    from ..cache.module_store import ModuleOutputCache
+
+    step_flights = StepFlights()
+    ttl_on = bool((platform_cfg.get("cache_ttl_policy") or {}).get("enabled", False))
+    module_cache = ModuleOutputCache(getattr(infra, "module_cache_store", None), ttl_days=cache_ttl_days if ttl_on else None)
 
     # Module deliverables contracts cached per run
     deliverables_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
@@ -93,16 +93,6 @@ def _reason_code(idx: ReasonIndex, scope: str, module_id: str, reason_slug: str)
     return code or ""
 
 
-def _parse_ymd(s: str) -> date:
-    s = str(s or "").strip()
-    if not s:
-        return date(1970, 1, 1)
-    try:
-        return datetime.strptime(s, "%Y-%m-%d").date()
-    except Exception:
-        return date(1970, 1, 1)
-
-
 def _load_module_prices(repo_root: Path) -> Dict[str, Dict[str, Dict[str, str]]]:
     """Load per-deliverable pricing.
 
@@ -111,35 +101,21 @@ def _load_module_prices(repo_root: Path) -> Dict[str, Dict[str, Dict[str, str]]]
 
     deliverable_id="__run__" is reserved for the per-step execution charge.
     """
-    rows = read_csv(repo_root / "platform" / "billing" / "module_prices.csv")
+    from ..billing.price_index import load_price_index
+
+    index = load_price_index(repo_root / "platform" / "billing" / "module_prices.csv", effective_to_inclusive=True)
     out: Dict[str, Dict[str, Dict[str, str]]] = {}
 
     today = datetime.now(timezone.utc).date()
 
-    for r in rows:
-        mid = canon_module_id(r.get("module_id", ""))
-        did = str(r.get("deliverable_id", "") or "").strip()
-        if not mid or not did:
+    # Each (module, deliverable) is resolved by bisecting its compiled effective-date
+    # segments; the most recent effective_from covering today wins.
+    for raw_mid, did in index.keys():
+        mid = canon_module_id(raw_mid)
+        row = index.resolve_row(raw_mid, did, today)
+        if not mid or row is None:
             continue
-
-        active = str(r.get("active", "") or "").strip().lower() == "true"
-        if not active:
-            continue
-
-        eff_from = _parse_ymd(r.get("effective_from", ""))
-        eff_to_raw = str(r.get("effective_to", "") or "").strip()
-        eff_to = _parse_ymd(eff_to_raw) if eff_to_raw else date(2100, 1, 1)
-        if not (eff_from <= today <= eff_to):
-            continue
-
-        # If multiple rows match, choose the most recent effective_from.
-        by_del = out.setdefault(mid, {})
-        prev = by_del.get(did)
-        if prev is not None:
-            prev_from = _parse_ymd(prev.get("effective_from", ""))
-            if prev_from >= eff_from:
-                continue
-        by_del[did] = r
+        out.setdefault(mid, {})[did] = row
 
     return out
 
@@ -196,6 +172,27 @@ def _load_module_display_names(registry: Any) -> Dict[str, str]:
     return out
 
 
+def _load_module_cache_scopes(registry: Any) -> Dict[str, str]:
+    """Load declared cache scopes (module.yml cache.scope) using registry.get_contract (key: module_id).
+
+    Modules that are missing or fail to load stay tenant-scoped.
+    """
+    out: Dict[str, str] = {}
+    try:
+        mids = list(registry.list_modules())
+    except Exception:
+        mids = []
+    for mid in mids:
+        try:
+            c = registry.get_contract(mid)
+        except Exception:
+            continue
+        cmid = canon_module_id(c.get("module_id") or mid)
+        if cmid and str(c.get("cache_scope") or "").strip() == "global":
+            out[cmid] = "global"
+    return out
+
+
 def _load_module_ports(registry: Any, module_id: str) -> Dict[str, Any]:
     """Load module port definitions using registry.get_contract(module_id).
 
@@ -370,6 +367,78 @@ def _union_limited_inputs(contract: Dict[str, Dict[str, Any]], requested: List[s
     return out
 
 
+def _record_step_outputs(
+    run_state: Any,
+    ports: Dict[str, Any],
+    out_dir: Path,
+    *,
+    tenant_id: str,
+    work_order_id: str,
+    step_id: str,
+    module_id: str,
+    module_kind: str,
+    digests: Any = None,
+) -> None:
+    """Record a completed step's port outputs into run-state (latest wins).
+
+    The output files are hashed together on a bounded thread pool.
+    """
+    outputs_port = {}
+    try:
+        op = []
+        if isinstance(ports, dict):
+            if isinstance(ports.get('outputs'), dict):
+                op = (ports.get('outputs') or {}).get('port') or []
+            elif isinstance(ports.get('outputs_port'), list):
+                op = ports.get('outputs_port') or []
+        if isinstance(op, list):
+            for o in op:
+                if not isinstance(o, dict):
+                    continue
+                oid = str(o.get('id') or '').strip()
+                if not oid:
+                    continue
+                outputs_port[oid] = o
+    except Exception:
+        outputs_port = {}
+    found: List[Tuple[str, Dict[str, Any], str, Path]] = []
+    for output_id, odef in outputs_port.items():
+        rel_path = str(odef.get('path') or '').lstrip('/').strip()
+        if not rel_path:
+            continue
+        abs_path = out_dir / rel_path
+        if abs_path.exists():
+            found.append((str(output_id), odef, rel_path, abs_path))
+
+    from platform.infra.models import OutputRecord
+    from platform.utils.hashing import sha256_files
+    shas = sha256_files([f[3] for f in found], cache=digests, default='')
+    for (output_id, odef, rel_path, abs_path), sha in zip(found, shas):
+        try:
+            bs = int(abs_path.stat().st_size) if sha else 0
+        except Exception:
+            sha, bs = '', 0
+        try:
+            rec = OutputRecord(
+                tenant_id=tenant_id,
+                work_order_id=work_order_id,
+                step_id=step_id,
+                module_id=module_id,
+                kind=module_kind,
+                output_id=output_id,
+                path=rel_path,
+                uri=abs_path.resolve().as_uri(),
+                content_type=str(odef.get('format') or ''),
+                sha256=sha,
+                bytes=bs,
+                bytes_size=bs,
+                created_at=utcnow_iso(),
+            )
+            run_state.record_output(rec)
+        except Exception:
+            pass
+
+
 def _deliverable_output_paths(contract: Dict[str, Dict[str, Any]], requested: List[str]) -> List[str]:
     paths: List[str] = []
     seen: Set[str] = set()
@@ -62,7 +62,7 @@ PART = r'''\
                             "idempotency_key": item_idem,
                         }
                         item_row = {
-                            "transaction_item_id": _new_id("transaction_item_id", used_ti),
+                            "transaction_item_id": _new_id("transaction_item_id"),
                             "transaction_id": refund_tx,
                             "tenant_id": tenant_id,
                             "module_id": mid,
@@ -77,6 +77,7 @@ PART = r'''\
                             "metadata_json": json.dumps(item_meta, separators=(",", ":")),
                         }
                         transaction_items.append(item_row)
+                        refund_items_appended = True
                         try:
                             ledger.post_transaction_item(TransactionItemRecord(
                                 transaction_item_id=str(item_row.get("transaction_item_id")),
@@ -98,8 +99,7 @@ PART = r'''\
 
                     # balance update
 
-                    trow["credits_available"] = str(int(trow["credits_available"]) + refund_amt)
-                    trow["updated_at"] = utcnow_iso()
+                    credit_book.credit(tenant_id, refund_amt)
 
             # Deliverables publication is handled as a reconciliation step by scripts/publish_artifacts_release.py
             # Orchestrator only records requested deliverables and runs modules; it does not publish artifacts.
@@ -107,6 +107,8 @@ PART = r'''\
                 break
 
         ended_at = utcnow_iso()
+        # Settle the admission hold; refunds above were credited separately.
+        credit_book.commit(spend_hold)
 
         # Canonical status semantics.
         # Step statuses are tracked in memory during execution. Billing-state is the system of
@@ -118,10 +120,20 @@ PART = r'''\
             for sid in per_step_requested_deliverables.keys()
             if (per_step_requested_deliverables.get(sid) or [])
         }
-        refunds_exist = any(
-            str(r.get("tenant_id")) == tenant_id and str(r.get("work_order_id")) == work_order_id and str(r.get("type")) == "REFUND"
-            for r in transaction_items
-        )
+        # Refunds are looked up through the ledger's (tenant_id, work_order_id) index; items
+        # appended above count even when their best-effort ledger post failed.
+        refunds_exist = refund_items_appended
+        if not refunds_exist:
+            try:
+                refunds_exist = any(
+                    str(it.type) == "REFUND"
+                    for it in ledger.list_transaction_items(tenant_id=tenant_id, work_order_id=work_order_id)
+                )
+            except Exception:
+                refunds_exist = any(
+                    str(r.get("tenant_id")) == tenant_id and str(r.get("work_order_id")) == work_order_id and str(r.get("type")) == "REFUND"
+                    for r in transaction_items
+                )
 
         publish_required = bool(purchased_deliverables_by_step)
         publish_completed = False
@@ -259,6 +271,22 @@ PART = r'''\
     except Exception as e:
         print(f"[billing-state][WARN] failed to persist billing-state tables: {e}")
 
+    # Module output cache write-throughs run in the background; finish them before exiting.
+    module_cache.flush()
+    # Persist this run's output digests so unchanged files are not re-hashed by later runs.
+    from platform.utils.hashing import digest_cache
+    digest_cache(runtime_dir).save()
+
+    # Keep CSV run-state logs proportional to live entities rather than status transitions.
+    rs_dir = getattr(run_state, "state_dir", None)
+    if rs_dir is not None:
+        try:
+            from ..infra.adapters.runstate_compact import auto_compact_runstate_logs
+
+            auto_compact_runstate_logs(Path(rs_dir))
+        except Exception as e:
+            print(f"[runstate][WARN] run-state compaction failed: {e}")
+
     # Adapter mode: orchestrator no longer persists billing-state tables directly.
     # LedgerWriter and RunStateStore are the only write paths.
 '''
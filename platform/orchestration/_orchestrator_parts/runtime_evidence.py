@@ -16,6 +16,8 @@ PART = r'''\
 import zipfile
 import hashlib
 
+from ..utils.hashing import digest_cache, sha256_files
+
 
 def _safe_ts_for_path(iso_ts: str) -> str:
     s = str(iso_ts or '').strip()
@@ -82,6 +84,7 @@ def persist_runtime_evidence_into_billing_state(
     root_prefix = Path('runtime_evidence') / 'runs' / tenant_id / work_order_id
 
     manifest_files: List[Dict[str, str]] = []
+    digests = sha256_files(files, cache=digest_cache(runtime_dir), default='')
 
     with zipfile.ZipFile(zip_path, mode='w', compression=zipfile.ZIP_DEFLATED) as zf:
         if src_missing:
@@ -89,14 +92,10 @@ def persist_runtime_evidence_into_billing_state(
             arc0 = str(Path('runtime_evidence') / 'NO_RUNTIME_DIR.txt')
             zf.writestr(arc0, msg)
             manifest_files.append({'path': arc0, 'sha256': hashlib.sha256(msg.encode('utf-8')).hexdigest()})
-        for p in files:
+        for p, h in zip(files, digests):
             rel = p.relative_to(src)
             arc = str(root_prefix / rel)
             zf.write(p, arcname=arc)
-            try:
-                h = sha256_file(p)
-            except Exception:
-                h = ''
             manifest_files.append({'path': arc, 'sha256': h})
 
     manifest = {
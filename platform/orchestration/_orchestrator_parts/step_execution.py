@@ -5,11 +5,19 @@ PART = r'''\
             run_id=work_order_id,
             runtime_profile_name=runtime_profile_name,
         )
+        try:
+            # Keyed lookup in the materialized status table (no log scan).
+            prior_status = str((run_state.get_run_status(ctx.tenant_id, ctx.work_order_id) or {}).get("status") or "")
+        except Exception:
+            prior_status = ""
+        if prior_status == "RUNNING":
+            print(f"[orchestrator][WARN] work_order_id={work_order_id} previous run did not finish (status=RUNNING)")
         try:
             run_state.create_run(
                 tenant_id=ctx.tenant_id,
                 work_order_id=ctx.work_order_id,
                 metadata={
+                    "previous_status": prior_status,
                     "workorder_path": str(item.get("path") or ""),
                     "runtime_profile_name": ctx.runtime_profile_name,
                     "artifacts_requested": artifacts_requested,
@@ -64,8 +72,8 @@ PART = r'''\
                 "reason_code": rc,
                 "missing_secrets": e.missing,
             }
-            tx_id = _new_id("transaction_id", used_tx)
-            ti_id = _new_id("transaction_item_id", used_ti)
+            tx_id = _new_id("transaction_id")
+            ti_id = _new_id("transaction_item_id")
             transactions.append({
                 "transaction_id": tx_id,
                 "tenant_id": tenant_id,
@@ -168,18 +176,11 @@ PART = r'''\
             continue
 
 
-        # current balance
-        trow = None
-        for r in tenants_credits:
-            if canon_tenant_id(r.get("tenant_id","")) == tenant_id:
-                trow = r
-                break
-        if not trow:
-            trow = {"tenant_id": tenant_id, "credits_available": "0", "updated_at": utcnow_iso(), "status": "ACTIVE"}
-            tenants_credits.append(trow)
-        available = int(str(trow.get("credits_available","0")).strip() or "0")
+        # credits gate: hold est_total for this workorder (settled in refunds_and_ledger)
+        spend_hold = key_workorder_spend(tenant_id=tenant_id, work_order_id=work_order_id, workorder_path=str(item["path"]), plan_type=plan_type)
+        available = credit_book.available(tenant_id)
 
-        if available < est_total:
+        if not credit_book.reserve(tenant_id, spend_hold, est_total):
             rc = _reason_code(reason_idx, "GLOBAL", "", "not_enough_credits")
             human_note = f"Insufficient credits: available={available}, required={est_total}"
             ended = utcnow_iso()
@@ -192,8 +193,8 @@ PART = r'''\
                 "available": available,
                 "required": est_total,
             }
-            tx_id = _new_id("transaction_id", used_tx)
-            ti_id = _new_id("transaction_item_id", used_ti)
+            tx_id = _new_id("transaction_id")
+            ti_id = _new_id("transaction_item_id")
             transactions.append({
                 "transaction_id": tx_id,
                 "tenant_id": tenant_id,
@@ -223,7 +224,7 @@ PART = r'''\
             continue
 
         # spend transaction (debit) with idempotency
-        spend_idem = key_workorder_spend(tenant_id=tenant_id, work_order_id=work_order_id, workorder_path=str(item["path"]), plan_type=plan_type)
+        spend_idem = spend_hold
         spend_tx = ""
         for tx in transactions:
             if str(tx.get("tenant_id")) != tenant_id or str(tx.get("work_order_id")) != work_order_id:
@@ -238,7 +239,7 @@ PART = r'''\
                 spend_tx = str(tx.get("transaction_id"))
                 break
         if not spend_tx:
-            spend_tx = _new_id("transaction_id", used_tx)
+            spend_tx = _new_id("transaction_id")
 
         def _label(mid: str, sid: str, sname: str = "") -> str:
             base = f"{module_names.get(mid, mid)} ({mid})" if module_names.get(mid) else mid
@@ -353,7 +354,7 @@ PART = r'''\
                         "verification_status": "unverified",
                     })
                 _append_tx_item({
-                    "transaction_item_id": _new_id("transaction_item_id", used_ti),
+                    "transaction_item_id": _new_id("transaction_item_id"),
                     "transaction_id": spend_tx,
                     "tenant_id": tenant_id,
                     "module_id": mid,
@@ -379,7 +380,7 @@ PART = r'''\
                 idem = key_deliverable_charge(tenant_id=tenant_id, work_order_id=work_order_id, step_id=sid, module_id=mid, deliverable_id=ds)
                 meta = {"step_id": sid, "step_name": sname, "deliverable_id": ds, "requested_deliverables": req_deliverables, "deliverables_source": del_src, "idempotency_key": idem}
                 _append_tx_item({
-                    "transaction_item_id": _new_id("transaction_item_id", used_ti),
+                    "transaction_item_id": _new_id("transaction_item_id"),
                     "transaction_id": spend_tx,
                     "tenant_id": tenant_id,
                     "module_id": mid,
@@ -394,16 +395,13 @@ PART = r'''\
                     "metadata_json": json.dumps(meta, separators=(",", ":")),
                 })
 
-        # update balance
-        trow["credits_available"] = str(available - est_total)
-        trow["updated_at"] = utcnow_iso()
-
         mode = str(w.get("mode","")).strip().upper() or "PARTIAL_ALLOWED"
         any_failed = False
         completed_steps: List[str] = []
         completed_modules: List[str] = []
         step_statuses: Dict[str, str] = {}
         step_outputs: Dict[str, Path] = {}
+        refund_items_appended = False
 
         # Ports (tenant-visible vs platform-only) and output exposure rules.
         ports_cache: Dict[str, Dict[str, Any]] = {}
@@ -7,6 +7,7 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple
 
+from ..infra.models import MODULE_CACHE_SCOPE_VALUES
 from ..utils.hashing import sha256_file, short_hash
 from ..utils.ids import validate_module_id
 
@@ -50,15 +51,25 @@ def _import_module_runner(module_path: Path):
     return mod
 
 
-def derive_cache_key(module_id: str, tenant_id: str, key_inputs: Dict[str, Any]) -> str:
-    """Recommended cache key format v1|tenant=...|module=...|type=outputs|hash=..."""
+def derive_cache_key(module_id: str, tenant_id: str, key_inputs: Dict[str, Any], scope: str = "tenant") -> str:
+    """Recommended cache key format v1|tenant=...|module=...|type=outputs|hash=...
+
+    Modules declaring cache.scope=global are keyed v1|scope=global|module=...|... so every
+    tenant resolves to the same cache entry. Those keys carry the full sha256 of the inputs:
+    a collision would serve one tenant's outputs to another.
+    """
     validate_module_id(module_id)
+    if scope not in MODULE_CACHE_SCOPE_VALUES:
+        raise ValueError(f"invalid cache scope: {scope!r}")
     # stable JSON for hashing
     payload = json.dumps(key_inputs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
     import hashlib
 
-    h = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:6]
-    return f"v1|tenant={tenant_id}|module={module_id}|type=outputs|hash={h}"
+    h = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    if scope != "global":
+        h = short_hash(h)
+    owner = "scope=global" if scope == "global" else f"tenant={tenant_id}"
+    return f"v1|{owner}|module={module_id}|type=outputs|hash={h}"
 
 
 def build_manifest_item(
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Optional, Tuple
+
+from ..common.id_codec import canon_tenant_id
+
+
+Shard = Tuple[int, int]  # (index, count), 0 <= index < count
+
+
+def parse_shard(value: str) -> Optional[Shard]:
+    """Parse "i/n" (0-based shard index over n shards). Empty means unsharded."""
+    s = str(value or "").strip()
+    if not s:
+        return None
+    try:
+        i_s, n_s = s.split("/", 1)
+        i, n = int(i_s), int(n_s)
+    except ValueError as e:
+        raise ValueError(f"Invalid shard {value!r}; expected i/n") from e
+    if n < 1 or not (0 <= i < n):
+        raise ValueError(f"Invalid shard {value!r}; need 0 <= i < n")
+    return (i, n)
+
+
+def tenant_shard(tenant_id: str, count: int) -> int:
+    """Stable shard index for a tenant (sha256 of the canonical id, so it never depends on PYTHONHASHSEED)."""
+    digest = hashlib.sha256(canon_tenant_id(tenant_id).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % int(count)
+
+
+def in_shard(tenant_id: str, shard: Optional[Shard]) -> bool:
+    if shard is None:
+        return True
+    return tenant_shard(tenant_id, shard[1]) == shard[0]
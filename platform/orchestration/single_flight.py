@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import shutil
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Tuple, TypeVar
+
+
+T = TypeVar("T")
+
+
+class _Call(Generic[T]):
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight(Generic[T]):
+    """Run `fn` at most once per key; callers with the same key wait for it and share its value.
+
+    `do()` returns (value, shared) where shared is True for callers that reused another
+    caller's result. Successful values are kept for the lifetime of the group (one run).
+    An exception raised by `fn` is re-raised to every waiter and the key is forgotten, so
+    the next caller runs `fn` again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call[T]] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        assert call is not None
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._calls.pop(key, None)
+            raise
+        finally:
+            call.done.set()
+        return call.value, False
+
+
+class StepFlights(SingleFlight[Tuple[Dict[str, Any], Path]]):
+    """Per-run single-flight for cacheable module steps, keyed by derive_cache_key().
+
+    The first step to run a key executes the module; identical steps (concurrent or later in
+    the same run) copy its outputs and report a cache hit. A failed execution is not shared:
+    it is forgotten, and each waiter executes the module itself. Cache keys are tenant-scoped
+    unless the module declares cache.scope=global; either way each workorder keeps its own billing.
+    """
+
+    def run(self, cache_key: str, out_dir: Path, execute: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        led = []
+
+        def _leader() -> Tuple[Dict[str, Any], Path]:
+            led.append(True)
+            result = execute()
+            if str(result.get("status", "") or "").upper() != "COMPLETED":
+                raise _NotShared(result)
+            return result, out_dir
+
+        try:
+            (result, leader_dir), shared = self.do(cache_key, _leader)
+        except _NotShared as e:
+            return e.result if led else execute()
+        if not shared:
+            return result
+        shutil.copytree(leader_dir, out_dir, dirs_exist_ok=True)
+        return {
+            "status": "COMPLETED",
+            "reason_slug": "",
+            "report_path": str(result.get("report_path", "") or ""),
+            "output_ref": f"cache:{cache_key}",
+            "_cache_hit": True,
+        }
+
+
+class _NotShared(Exception):
+    def __init__(self, result: Dict[str, Any]) -> None:
+        super().__init__("step did not complete")
+        self.result = result
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import csv
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
@@ -30,6 +31,41 @@ def write_csv(path: Path, rows: Iterable[Dict[str, Any]], fieldnames: List[str])
     atomic_write_text(path, buf.getvalue())
 
 
+def append_csv_rows(path: Path, rows: Iterable[Dict[str, Any]], fieldnames: List[str], *, fsync: bool = True) -> int:
+    """Append rows without rewriting the file; returns the number of rows written.
+
+    The header is written only when the file is new or empty. An existing header must match
+    `fieldnames` exactly (ValueError otherwise) so appends can never drift from the schema.
+    A file whose last line is unterminated gets a newline first, so it is not joined to the
+    first new row. All rows share one open/flush/fsync (group commit).
+    """
+    ensure_dir(path.parent)
+    with path.open("a+", encoding="utf-8", newline="") as f:
+        f.seek(0)
+        existing = next(csv.reader(f), None)
+        if existing is not None and existing != list(fieldnames):
+            raise ValueError(f"CSV header mismatch (expected {list(fieldnames)}, found {existing}): {path}")
+        if f.seek(0, os.SEEK_END) and not _ends_with_newline(path):
+            f.write("\n")
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore", lineterminator="\n")
+        if existing is None:
+            writer.writeheader()
+        n = 0
+        for r in rows:
+            writer.writerow({k: ("" if r.get(k) is None else r.get(k)) for k in fieldnames})
+            n += 1
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    return n
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with path.open("rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
 def require_headers(path: Path, required: List[str]) -> None:
     if not path.exists():
         raise FileNotFoundError(str(path))
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Optional
+
+# Deterministic high-entropy byte streams built from SHAKE-256 segments.
+#
+# Segment i of a stream is shake_256(f"{seed}:{i}").digest(SEGMENT_SIZE); the stream is the
+# concatenation of segments, truncated to the requested length. Segments are independent, so
+# they can be generated by separate processes and written at their offsets. SEGMENT_SIZE is
+# part of the stream definition and must not change.
+SEGMENT_SIZE = 4 * 1024 * 1024
+
+
+def shake256_segment(seed: str, index: int, size: int = SEGMENT_SIZE) -> bytes:
+    return hashlib.shake_256(f"{seed}:{index}".encode("utf-8")).digest(size)
+
+
+def _segment_count(nbytes: int) -> int:
+    return (nbytes + SEGMENT_SIZE - 1) // SEGMENT_SIZE
+
+
+def _write_segments(path: str, seed: str, nbytes: int, start: int, stop: int) -> None:
+    with open(path, "r+b") as f:
+        for i in range(start, stop):
+            offset = i * SEGMENT_SIZE
+            f.seek(offset)
+            f.write(shake256_segment(seed, i, min(SEGMENT_SIZE, nbytes - offset)))
+
+
+def write_shake256_stream(path: Path, nbytes: int, seed: str, *, workers: Optional[int] = None) -> int:
+    """Write the first `nbytes` of the stream for `seed` to `path`; returns the segment count.
+
+    Contiguous runs of segments are generated in up to `workers` processes (default: one
+    per CPU), each writing its own byte range of the preallocated file. Workers are spawned,
+    not forked: callers may be multi-threaded (the orchestrator runs steps on thread pools),
+    and forking a process while another thread holds a lock can deadlock the child.
+    """
+    segments = _segment_count(nbytes)
+    with open(path, "wb") as f:
+        f.truncate(nbytes)
+    n = max(1, min(int(workers or os.cpu_count() or 1), segments))
+    if n == 1:
+        _write_segments(str(path), seed, nbytes, 0, segments)
+        return segments
+    # A few ranges per worker keeps the pool busy if one process runs slow.
+    step = max(1, segments // (n * 4))
+    with ProcessPoolExecutor(max_workers=n, mp_context=get_context("spawn")) as pool:
+        futures = [
+            pool.submit(_write_segments, str(path), seed, nbytes, start, min(start + step, segments))
+            for start in range(0, segments, step)
+        ]
+        for fut in futures:
+            fut.result()
+    return segments
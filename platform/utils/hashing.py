@@ -1,19 +1,197 @@
 from __future__ import annotations
 
 import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+
+# Read size for hashing when hashlib.file_digest is unavailable (Python < 3.11).
+HASH_BUFFER_SIZE = 1024 * 1024
+
+DIGEST_INDEX_NAME = ".sha256_digests.json"
+DIGEST_INDEX_VERSION = 1
+# Entries modified this close to a save are not persisted: a same-size rewrite within the
+# filesystem's timestamp granularity would be indistinguishable in a later run.
+RACY_WINDOW_NS = 2_000_000_000
+MAX_INDEX_ENTRIES = 200_000
+# hashlib releases the GIL while digesting, so a few threads keep the disk busy instead of
+# one core.
+DEFAULT_HASH_WORKERS = 8
+
+_StatKey = Tuple[int, int, int, int]
 
 
 def sha256_bytes(data: bytes) -> str:
     return hashlib.sha256(data).hexdigest()
 
 
-def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
+def _sha256_uncached(path: Path) -> str:
     with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(1024 * 1024), b""):
-            h.update(chunk)
-    return h.hexdigest()
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        h = hashlib.sha256()
+        buf = bytearray(HASH_BUFFER_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+        return h.hexdigest()
+
+
+def _stat_key(st: os.stat_result) -> _StatKey:
+    return (int(st.st_dev), int(st.st_ino), int(st.st_size), int(st.st_mtime_ns))
+
+
+class DigestCache:
+    """sha256 digests of files, keyed by (device, inode, size, mtime_ns).
+
+    An unchanged file is hashed at most once per process, and at most once across runs once
+    save() has persisted the index to <root>/.sha256_digests.json. Rewriting a file in place
+    with the same size within one timestamp tick is not detected, so use it for outputs and
+    other write-once files.
+    """
+
+    def __init__(self, root: Path, *, index_name: str = DIGEST_INDEX_NAME) -> None:
+        self.root = Path(root)
+        self.index_path = self.root / index_name
+        self._lock = threading.Lock()
+        self._digests: Dict[_StatKey, str] = {}
+        self._used: Set[_StatKey] = set()
+        self._loaded = False
+        self._dirty = False
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != DIGEST_INDEX_VERSION:
+            return
+        for row in data.get("entries") or []:
+            try:
+                dev, ino, size, mtime_ns, sha = row
+                self._digests[(int(dev), int(ino), int(size), int(mtime_ns))] = str(sha)
+            except (TypeError, ValueError):
+                continue
+
+    def sha256(self, path: Path) -> str:
+        path = Path(path)
+        key = _stat_key(path.stat())
+        if key[1] == 0:  # no stable inode on this filesystem
+            return _sha256_uncached(path)
+        with self._lock:
+            self._load()
+            hit = self._digests.get(key)
+            if hit is not None:
+                self._used.add(key)
+                return hit
+        digest = _sha256_uncached(path)
+        # Only remember the digest if the file did not change while it was being read.
+        if _stat_key(path.stat()) == key:
+            with self._lock:
+                self._digests[key] = digest
+                self._used.add(key)
+                self._dirty = True
+        return digest
+
+    def lookup(self, path: Path) -> Optional[str]:
+        """The digest of `path` if it is already known for its current stat; never reads the file."""
+        key = _stat_key(Path(path).stat())
+        if key[1] == 0:
+            return None
+        with self._lock:
+            self._load()
+            hit = self._digests.get(key)
+            if hit is not None:
+                self._used.add(key)
+            return hit
+
+    def remember(self, path: Path, digest: str, st: os.stat_result) -> None:
+        """Record a digest computed elsewhere from `path` as it was at `st` (ignored if it changed since)."""
+        key = _stat_key(st)
+        if key[1] == 0 or _stat_key(Path(path).stat()) != key:
+            return
+        with self._lock:
+            self._load()
+            self._digests[key] = str(digest)
+            self._used.add(key)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist the index (atomically); a no-op when nothing new was hashed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            cutoff = time.time_ns() - RACY_WINDOW_NS
+            keys = list(self._digests) if len(self._digests) <= MAX_INDEX_ENTRIES else list(self._used)
+            entries = sorted([*k, self._digests[k]] for k in keys if k[3] < cutoff)
+            self._dirty = False
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"version": DIGEST_INDEX_VERSION, "entries": entries}, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+
+_CACHES: Dict[str, DigestCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def digest_cache(root: Union[Path, str, None]) -> Optional[DigestCache]:
+    """The process-wide DigestCache for `root`, or None when root is empty.
+
+    Callers opt in by passing the result to sha256_file(); whoever owns the root calls save().
+    """
+    if not root or not str(root).strip():
+        return None
+    key = os.path.abspath(str(root))
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = _CACHES[key] = DigestCache(Path(key))
+        return cache
+
+
+def sha256_file(path: Path, cache: Optional[DigestCache] = None) -> str:
+    if cache is not None:
+        return cache.sha256(path)
+    return _sha256_uncached(Path(path))
+
+
+def sha256_files(
+    paths: Sequence[Path],
+    *,
+    cache: Optional[DigestCache] = None,
+    workers: Optional[int] = None,
+    default: Optional[str] = None,
+) -> List[str]:
+    """sha256 of every path, hashed on a bounded thread pool, in the order given.
+
+    With `default`, files that cannot be read get that value instead of raising.
+    """
+    paths = list(paths)
+
+    def _one(p: Path) -> str:
+        if default is None:
+            return sha256_file(p, cache)
+        try:
+            return sha256_file(p, cache)
+        except OSError:
+            return default
+
+    n = max(1, min(int(workers or DEFAULT_HASH_WORKERS), len(paths)))
+    if n == 1:
+        return [_one(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=n, thread_name_prefix="sha256") as pool:
+        return list(pool.map(_one, paths))
 
 
 def short_hash(hex_hash: str, length: int = 6) -> str:
@@ -23,12 +23,15 @@ This script is designed to run in CI (GitHub Actions) and locally.
 """
 
 import argparse
+import hashlib
 import json
 import os
 import shutil
 import subprocess
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from platform.billing import partitions as _partitions
 
 
 DEFAULT_REQUIRED_FILES = [
@@ -42,6 +45,16 @@ DEFAULT_REQUIRED_FILES = [
     "state_manifest.json",
 ]
 
+# Assets fetched when present:
+# - tenants_credits_checkpoint.json is derived and self-validates against the ledger
+#   (see platform.billing.recompute_credits), so a stale copy only costs a full replay.
+# - id_blocks.json holds the ID allocator's reserved-block high-water marks
+#   (platform.common.id_allocator); without it a runner would re-issue the same ID sequence.
+OPTIONAL_FILES = [
+    "tenants_credits_checkpoint.json",
+    "id_blocks.json",
+]
+
 DEFAULT_RELEASE_TAG = "billing-state-v1"
 
 # Written into billing_state_dir after hydration so publish can decide whether
@@ -168,6 +181,48 @@ def _copy_missing_from_scaffold(missing: Sequence[str], scaffold_dir: Path, targ
     return still_missing
 
 
+def _sha256(p: Path) -> str:
+    return hashlib.sha256(p.read_bytes()).hexdigest()
+
+
+def _hydrate_partitions(repo: str, tag: str, assets: Set[str], billing_state_dir: Path) -> List[str]:
+    """Download partitions_manifest.json and every partition it lists; returns the asset names.
+
+    Partition assets are published under flat names (partitions.partition_asset_name) and moved
+    to <table stem>/<YYYY-MM>.csv. Closed partitions must match the sha256 pinned in the
+    manifest. A flat asset left over from before a table was partitioned is never used.
+    """
+    if _partitions.PARTITIONS_MANIFEST_NAME not in assets:
+        return []
+    if not _download_release_asset(repo, tag, _partitions.PARTITIONS_MANIFEST_NAME, billing_state_dir):
+        raise FileNotFoundError(f"Failed to download {_partitions.PARTITIONS_MANIFEST_NAME} from release_tag={tag}")
+    manifest = _partitions.load_manifest(billing_state_dir)
+    staging = billing_state_dir / ".partitions_download"
+    names: List[str] = [_partitions.PARTITIONS_MANIFEST_NAME]
+    try:
+        for table, entry in sorted(manifest.get("tables", {}).items()):
+            for period, info in sorted((entry.get("partitions") or {}).items()):
+                name = _partitions.partition_asset_name(table, period)
+                if name not in assets or not _download_release_asset(repo, tag, name, staging):
+                    raise FileNotFoundError(f"Billing-state release is missing partition asset {name} (release_tag={tag})")
+                if info.get("closed") and _sha256(staging / name) != str(info.get("sha256", "")):
+                    raise ValueError(f"Partition asset {name} does not match the sha256 pinned in {_partitions.PARTITIONS_MANIFEST_NAME}")
+                dst = _partitions.partition_path(billing_state_dir, table, period)
+                _safe_mkdir(dst.parent)
+                os.replace(staging / name, dst)
+                names.append(name)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return names
+
+
+def _partitioned_tables(billing_state_dir: Path) -> Set[str]:
+    try:
+        return set(_partitions.load_manifest(billing_state_dir).get("tables", {}).keys())
+    except Exception:
+        return set()
+
+
 def hydrate_billing_state_dir(
     billing_state_dir: Path,
     *,
@@ -197,6 +252,10 @@ def hydrate_billing_state_dir(
     if allow_release_download and repo and _which("gh") and (os.getenv("GH_TOKEN") or os.getenv("GITHUB_TOKEN")):
         release_attempted = True
         assets = _list_release_assets(repo, release_tag)
+        # Partitioned tables are hydrated from their partitions, not from the flat asset.
+        _hydrate_partitions(repo, release_tag, assets, billing_state_dir)
+        partitioned = _partitioned_tables(billing_state_dir)
+        required_files = [n for n in required_files if n not in partitioned]
         # If we require release hydration, all required files must exist as assets.
         if require_release:
             missing_assets = [n for n in required_files if n not in assets]
@@ -213,11 +272,16 @@ def hydrate_billing_state_dir(
             if name not in assets:
                 continue
             _download_release_asset(repo, release_tag, name, billing_state_dir)
+        for name in OPTIONAL_FILES:
+            if name in assets and name not in required_files:
+                _download_release_asset(repo, release_tag, name, billing_state_dir)
 
         release_ok = all((billing_state_dir / n).exists() for n in required_files if n in assets)
 
     # Step 2: scaffold fallback per-file
     # Only allowed when we are not enforcing release hydration.
+    partitioned = _partitioned_tables(billing_state_dir)
+    required_files = [n for n in required_files if n not in partitioned]
     missing = [n for n in required_files if not (billing_state_dir / n).exists()]
     if missing and scaffold_dir and (not require_release):
         missing = _copy_missing_from_scaffold(missing, scaffold_dir, billing_state_dir)
@@ -236,18 +300,20 @@ def hydrate_billing_state_dir(
         )
 
     # Step 4: write baseline manifest so publish can detect changes.
-    baseline = {"assets": []}
+    baseline: Dict[str, Any] = {"assets": []}
     for n in required_files:
         p = billing_state_dir / n
         if not p.exists() or not p.is_file():
             continue
         try:
-            import hashlib
-
-            h = hashlib.sha256(p.read_bytes()).hexdigest()
-            baseline["assets"].append({"name": n, "sha256": h})
+            baseline["assets"].append({"name": n, "sha256": _sha256(p)})
         except Exception:
             continue
+    for table, entry in sorted(_partitions.load_manifest(billing_state_dir).get("tables", {}).items()):
+        for period in sorted((entry.get("partitions") or {}).keys()):
+            p = _partitions.partition_path(billing_state_dir, table, period)
+            if p.is_file():
+                baseline["assets"].append({"name": _partitions.partition_asset_name(table, period), "sha256": _sha256(p)})
     (billing_state_dir / BASELINE_MANIFEST_NAME).write_text(
         json.dumps(baseline, indent=2, sort_keys=False) + "\n", encoding="utf-8"
     )
@@ -314,7 +380,7 @@ def main() -> int:
                 )
             ),
         )
-    except FileNotFoundError as e:
+    except (FileNotFoundError, ValueError) as e:
         print(str(e))
         return 2
 
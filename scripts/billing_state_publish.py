@@ -11,8 +11,20 @@ import sys
 import json
 import glob
 import shlex
+import shutil
 import subprocess
+import tempfile
 from datetime import datetime
+from pathlib import Path
+
+# Ensure repo root is on sys.path so local 'platform' package wins over stdlib 'platform' module
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+if "platform" in sys.modules and not hasattr(sys.modules["platform"], "__path__"):
+    del sys.modules["platform"]
+
+from platform.billing import partitions as _partitions  # noqa: E402
 
 TAG = os.environ.get("BILLING_RELEASE_TAG", "billing-state-v1")
 BILLING_DIR = os.environ.get("BILLING_STATE_DIR", ".billing-state")
@@ -35,6 +47,41 @@ def ensure_release(tag: str) -> None:
         f'gh release create {shlex.quote(tag)} -t {shlex.quote(tag)} -n "Billing-state artifacts"'
     )
 
+def release_asset_names(tag: str) -> set[str]:
+    cp = subprocess.run(
+        f"gh release view {shlex.quote(tag)} --json assets --jq '.assets[].name'",
+        shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    if cp.returncode != 0:
+        raise SystemExit(f"[BILLING_PUBLISH][ERR] cannot list assets of tag={tag}: {cp.stdout.strip()}")
+    return {line.strip() for line in cp.stdout.splitlines() if line.strip()}
+
+def collect_partition_assets(existing: set[str], staging_dir: str) -> list[str]:
+    """Copies of ledger partitions under their flat release-asset names.
+
+    Closed partitions are immutable and skipped once the release has them.
+    """
+    root = Path(BILLING_DIR)
+    manifest = _partitions.load_manifest(root)
+    out: list[str] = []
+    for table, entry in sorted(manifest.get("tables", {}).items()):
+        for period, info in sorted((entry.get("partitions") or {}).items()):
+            name = _partitions.partition_asset_name(table, period)
+            if info.get("closed") and name in existing:
+                continue
+            src = _partitions.partition_path(root, table, period)
+            if not src.is_file():
+                continue
+            dst = os.path.join(staging_dir, name)
+            shutil.copyfile(src, dst)
+            out.append(dst)
+    return out
+
+def stale_flat_assets(existing: set[str]) -> list[str]:
+    """Flat table assets superseded by partitions (left over from before partitioning)."""
+    tables = _partitions.load_manifest(Path(BILLING_DIR)).get("tables", {})
+    return sorted(t for t in tables if t in existing)
+
 def collect_assets() -> list[str]:
     patterns = [
         os.path.join(BILLING_DIR, "*.csv"),
@@ -55,6 +102,8 @@ def collect_assets() -> list[str]:
         if f not in seen:
             out.append(f)
             seen.add(f)
+    # The partitions manifest goes last so it never names partitions the release lacks.
+    out.sort(key=lambda f: os.path.basename(f) == _partitions.PARTITIONS_MANIFEST_NAME)
     return out
 
 def upload_assets(tag: str, files: list[str]) -> list[str]:
@@ -76,12 +125,18 @@ def main() -> int:
     if not os.path.isdir(BILLING_DIR):
         raise SystemExit(f"[BILLING_PUBLISH][ERR] not a directory: {BILLING_DIR}")
     ensure_release(TAG)
-    files = collect_assets()
-    if not files:
-        print("[BILLING_PUBLISH][WARN] no files to publish from .billing-state")
-        print(f"[BILLING_PUBLISH][OK] published 0 assets to tag={TAG}")
-        return 0
-    uploaded = upload_assets(TAG, files)
+    existing = release_asset_names(TAG)
+    with tempfile.TemporaryDirectory() as staging:
+        # Partitions first, then the other assets (partitions manifest last).
+        files = collect_partition_assets(existing, staging) + collect_assets()
+        if not files:
+            print("[BILLING_PUBLISH][WARN] no files to publish from .billing-state")
+            print(f"[BILLING_PUBLISH][OK] published 0 assets to tag={TAG}")
+            return 0
+        uploaded = upload_assets(TAG, files)
+    for name in stale_flat_assets(existing):
+        _run(f"gh release delete-asset {shlex.quote(TAG)} {shlex.quote(name)} -y")
+        print(f"[BILLING_PUBLISH][OK] removed superseded asset {name}")
     summary = {"tag": TAG, "count": len(uploaded), "uploaded": uploaded, "at": datetime.utcnow().isoformat() + "Z"}
     print(json.dumps({"published": summary}, indent=2))
     print(f"[BILLING_PUBLISH][OK] published {len(uploaded)} assets to tag={TAG}")
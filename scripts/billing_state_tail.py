@@ -188,11 +188,36 @@ def print_table(path: Path, n: int, since: Optional[datetime], lookups: Lookups)
         print(_format_compact_row(path, r, lookups))
 
 
+def print_workorder_statuses(repo_root: Path, bdir: Path, runtime_dir: Path, profile_path: str, since: Optional[datetime], n: int) -> None:
+    """Latest status of the workorders in the shown transactions, via RunStateStore.get_run_status."""
+    import sys
+
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+    from platform.infra.config import load_runtime_profile
+    from platform.infra.factory import build_infra
+
+    print("\n" + "=" * 100)
+    print("workorder status (run-state)")
+    profile = load_runtime_profile(repo_root, cli_path=profile_path)
+    run_state = build_infra(repo_root=repo_root, profile=profile, billing_state_dir=bdir, runtime_dir=runtime_dir).run_state_store
+    keys: list[tuple[str, str]] = []
+    for r in _filter_rows_for_run(_read_rows(bdir / "transactions.csv"), since):
+        key = ((r.get("tenant_id") or "").strip(), (r.get("work_order_id") or "").strip())
+        if all(key) and key not in keys:
+            keys.append(key)
+    for tenant_id, work_order_id in keys[-n:]:
+        row = run_state.get_run_status(tenant_id, work_order_id) or {}
+        print(f"- tenant_id={tenant_id}, work_order_id={work_order_id}, status={row.get('status') or '<unknown>'}, updated_at={row.get('updated_at') or ''}")
+
+
 def main() -> int:
     ap = argparse.ArgumentParser()
     ap.add_argument("--billing-state-dir", required=True)
     ap.add_argument("--n", type=int, default=20)
     ap.add_argument("--since", default="", help="Only show rows with started_at/ended_at/created_at >= this ISO time (UTC).")
+    ap.add_argument("--runtime-dir", default="", help="Also show each shown workorder's latest run-state status.")
+    ap.add_argument("--runtime-profile", default="", help="Path to runtime profile YAML (used with --runtime-dir)")
     args = ap.parse_args()
 
     bdir = Path(args.billing_state_dir).resolve()
@@ -225,6 +250,9 @@ def main() -> int:
     ]:
         print_table(bdir / fname, args.n, since_dt, lookups)
 
+    if args.runtime_dir:
+        print_workorder_statuses(repo_root, bdir, Path(args.runtime_dir).resolve(), args.runtime_profile, since_dt, args.n)
+
     return 0
 
 
@@ -33,14 +33,14 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 sys.modules.pop("platform", None)
 
-from platform.common.id_policy import generate_unique_id  # type: ignore  # noqa: E402
+from platform.common.id_allocator import IdAllocator  # type: ignore  # noqa: E402
 from platform.infra.config import load_runtime_profile  # type: ignore  # noqa: E402
 from platform.infra.factory import build_infra  # type: ignore  # noqa: E402
 from platform.infra.models import DeliverableArtifactRecord, TransactionRecord, TransactionItemRecord  # type: ignore  # noqa: E402
 from platform.orchestration.idempotency import key_artifact_publish, key_refund  # type: ignore  # noqa: E402
 from platform.utils.csvio import read_csv  # type: ignore  # noqa: E402
 from platform.artifacts.checksums import sha256_file  # type: ignore  # noqa: E402
-from platform.artifacts.packaging import ZipEntry, zip_with_manifest  # type: ignore  # noqa: E402
+from platform.artifacts.packaging import ZipEntry, package_key, zip_with_manifest  # type: ignore  # noqa: E402
 from platform.utils.time import utcnow_iso  # type: ignore  # noqa: E402
 
 
@@ -124,7 +124,7 @@ def _find_purchased_deliverables(
 def _ensure_refund_for_missing(
     *,
     ledger,
-    billing_state_dir: Path,
+    ids: IdAllocator,
     reason_key: str,
     target: PublishTarget,
     note: str,
@@ -151,12 +151,10 @@ def _ensure_refund_for_missing(
         if str(m.get("idempotency_key") or "").strip() == idem:
             return
 
-    # Create a new REFUND transaction and one item mirroring the deliverable
-    used_tx = {str(r.get("transaction_id")) for r in read_csv(billing_state_dir / "transactions.csv")}
-    used_ti = {str(r.get("transaction_item_id")) for r in read_csv(billing_state_dir / "transaction_items.csv")}
-
-    tx_id = generate_unique_id("transaction_id", used_tx)
-    ti_id = generate_unique_id("transaction_item_id", used_ti)
+    # Create a new REFUND transaction and one item mirroring the deliverable; IDs come from
+    # blocks reserved in billing-state, so no scan of existing IDs is needed.
+    tx_id = ids.new_id("transaction_id")
+    ti_id = ids.new_id("transaction_item_id")
 
     tx_meta = {
         "idempotency_key": f"tx_refund_{idem}",
@@ -202,9 +200,31 @@ def _ensure_refund_for_missing(
     )
 
 
+DELIVERABLE_MANIFEST_ARCNAME = "deliverable_manifest.json"
+
+
+def _deliverable_package_key(manifest: Dict[str, Any]) -> str:
+    # Content plus the purchase identity. run_url/created_at are deliberately excluded: a
+    # re-publish of unchanged outputs reuses the existing ZIP, embedded manifest included.
+    files = [(f["path"], f["bytes"], f["sha256"]) for f in manifest.get("files") or []]
+    options = {
+        "manifest_arcname": DELIVERABLE_MANIFEST_ARCNAME,
+        "artifact_key": manifest.get("artifact_key", ""),
+        "spend_transaction_id": manifest.get("spend_transaction_id", ""),
+        "spend_transaction_item_id": manifest.get("spend_transaction_item_id", ""),
+    }
+    return package_key(files, options)
+
+
 def _write_zip_with_manifest(*, zip_path: Path, files: List[Tuple[Path, str]], manifest: Dict[str, Any]) -> None:
     entries = [ZipEntry(arcname=arcname, source_path=src) for src, arcname in files]
-    zip_with_manifest(zip_path=zip_path, entries=entries, manifest=manifest, manifest_arcname="deliverable_manifest.json")
+    zip_with_manifest(
+        zip_path=zip_path,
+        entries=entries,
+        manifest=manifest,
+        manifest_arcname=DELIVERABLE_MANIFEST_ARCNAME,
+        reuse_key=_deliverable_package_key(manifest),
+    )
 
 
 def main(argv: Optional[List[str]] = None) -> int:
@@ -228,6 +248,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     profile = load_runtime_profile(REPO_ROOT, cli_path=str(getattr(args, 'runtime_profile', '') or ''))
     infra = build_infra(repo_root=REPO_ROOT, profile=profile, billing_state_dir=billing_state_dir, runtime_dir=runtime_dir)
 
+    ids = IdAllocator(billing_state_dir)
     reason_index = _load_reason_index(REPO_ROOT)
     delivery_missing_key = reason_index.get("delivery_missing", "delivery_missing")
 
@@ -246,7 +267,7 @@ def main(argv: Optional[List[str]] = None) -> int:
         except Exception as e:
             _ensure_refund_for_missing(
                 ledger=infra.ledger,
-                billing_state_dir=billing_state_dir,
+                ids=ids,
                 reason_key=delivery_missing_key,
                 target=t,
                 note=f"Refund: deliverable not found in contract ({t.module_id}:{t.deliverable_id})",
@@ -306,7 +327,7 @@ def main(argv: Optional[List[str]] = None) -> int:
             if missing:
                 _ensure_refund_for_missing(
                     ledger=infra.ledger,
-                    billing_state_dir=billing_state_dir,
+                    ids=ids,
                     reason_key=delivery_missing_key,
                     target=t,
                     note=f"Refund: missing outputs for {t.module_id}:{t.deliverable_id}",
@@ -23,6 +23,14 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+# --- Import repo-local "platform" package (avoid stdlib name collision) ---
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+sys.modules.pop('platform', None)
+
+from platform.utils.hashing import sha256_files  # type: ignore  # noqa: E402
+
 
 def _utcnow_iso_compact() -> str:
     return datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
@@ -52,28 +60,16 @@ def _iter_files(root: Path) -> Iterable[Path]:
             yield p
 
 
-def _sha256_file(path: Path) -> str:
-    import hashlib
-
-    h = hashlib.sha256()
-    with path.open('rb') as f:
-        while True:
-            b = f.read(1024 * 1024)
-            if not b:
-                break
-            h.update(b)
-    return h.hexdigest()
-
-
 def _make_manifest(*, zip_root: Path, include_root_name: str) -> Dict[str, Any]:
     files: List[Dict[str, Any]] = []
-    for p in _iter_files(zip_root):
+    paths = list(_iter_files(zip_root))
+    for p, digest in zip(paths, sha256_files(paths)):
         rel = _safe_rel(p, zip_root)
         files.append(
             {
                 'path': f'{include_root_name}/{rel}',
                 'bytes': int(p.stat().st_size),
-                'sha256': _sha256_file(p),
+                'sha256': digest,
             }
         )
     return {
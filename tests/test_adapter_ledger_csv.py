@@ -87,6 +87,50 @@ class TestCsvLedgerWriter(unittest.TestCase):
             self.assertEqual(w.resolve_price("m1", "__run__", "2023-12-31"), 5)
             self.assertEqual(w.resolve_price("m1", "__run__", "2024-01-01"), 7)
 
+    def test_indexed_item_queries(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.infra.adapters.ledger_csv import CsvLedgerWriter
+        from platform.infra.models import TransactionItemRecord
+        from platform.utils.csvio import read_csv, write_csv
+
+        with tempfile.TemporaryDirectory() as td:
+            state_dir = Path(td)
+            w = CsvLedgerWriter(state_dir=state_dir, repo_root=state_dir)
+
+            def item(ti: str, tx: str, tenant: str, wo: str, typ: str = "SPEND") -> TransactionItemRecord:
+                return TransactionItemRecord(
+                    transaction_item_id=ti,
+                    transaction_id=tx,
+                    tenant_id=tenant,
+                    module_id="m1",
+                    work_order_id=wo,
+                    step_id="s1",
+                    deliverable_id="__run__",
+                    feature="run",
+                    type=typ,
+                    amount_credits=1,
+                    created_at="2026-01-01T00:00:00Z",
+                )
+
+            w.post_transaction_item(item("ti1", "tx1", "t1", "w1"))
+            w.post_transaction_item(item("ti2", "tx2", "t2", "w1"))
+            self.assertEqual([i.transaction_item_id for i in w.list_transaction_items(tenant_id="t1", work_order_id="w1")], ["ti1"])
+
+            # Appends after the index is built are visible without a rebuild.
+            w.post_transaction_item(item("ti3", "tx3", "t1", "w1", typ="REFUND"))
+            got = w.list_transaction_items(tenant_id="t1", work_order_id="w1")
+            self.assertEqual([i.transaction_item_id for i in got], ["ti1", "ti3"])
+            self.assertEqual([i.transaction_item_id for i in w.list_transaction_items(transaction_id="tx2")], ["ti2"])
+            self.assertEqual(len(w.list_transaction_items()), 3)
+
+            # A rewrite by another writer invalidates the cached index.
+            p = state_dir / "transaction_items.csv"
+            rows = [r for r in read_csv(p) if r["transaction_item_id"] != "ti1"]
+            write_csv(p, rows, list(rows[0].keys()))
+            got = w.list_transaction_items(tenant_id="t1", work_order_id="w1")
+            self.assertEqual([i.transaction_item_id for i in got], ["ti3"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+import uuid
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+
+# Runs against a disposable server, e.g.:
+#   docker run --rm -e POSTGRES_PASSWORD=pg -p 5432:5432 postgres:16
+#   PLATFORM_TEST_POSTGRES_DSN=postgresql://postgres:pg@localhost:5432/postgres python -m pytest tests/test_adapter_postgres.py
+DSN = str(os.environ.get("PLATFORM_TEST_POSTGRES_DSN", "") or "").strip()
+
+
+@unittest.skipUnless(DSN, "PLATFORM_TEST_POSTGRES_DSN not set")
+class TestPostgresAdapters(unittest.TestCase):
+    def test_ledger_copy_queries_and_credits(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.infra.adapters.ledger_postgres import PostgresLedgerWriter
+        from platform.infra.errors import ConflictError
+        from platform.infra.models import TransactionItemRecord
+
+        run = uuid.uuid4().hex[:8]
+
+        def item(n: int) -> TransactionItemRecord:
+            return TransactionItemRecord(
+                transaction_item_id=f"ti-{run}-{n}",
+                transaction_id=f"tx-{run}",
+                tenant_id=f"t-{run}",
+                module_id="m1",
+                work_order_id="w1",
+                step_id="s1",
+                deliverable_id="__run__",
+                feature="run",
+                type="SPEND",
+                amount_credits=1,
+                created_at="2026-01-01T00:00:00Z",
+            )
+
+        with tempfile.TemporaryDirectory() as td:
+            w = PostgresLedgerWriter(DSN, repo_root=Path(td))
+            self.assertEqual(w.post_transaction_items([item(i) for i in range(50)]), 50)
+            got = w.list_transaction_items(tenant_id=f"t-{run}", work_order_id="w1")
+            self.assertEqual(len(got), 50)
+            with self.assertRaises(ConflictError):
+                w.post_transaction_items([item(50), item(0)])
+            self.assertEqual(len(w.list_transaction_items(transaction_id=f"tx-{run}")), 50)
+
+            w.set_credits(f"t-{run}", 5)
+            w.set_credits(f"t-{run}", 3)
+            rows = w.db.query("SELECT credits_available, status FROM tenants_credits WHERE tenant_id = ?", (f"t-{run}",))
+            self.assertEqual(rows, [{"credits_available": "3", "status": "active"}])
+
+    def test_reserve_credits_locks_balance_across_workers(self) -> None:
+        ensure_repo_on_path()
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        from platform.infra.adapters.ledger_postgres import PostgresLedgerWriter
+        from platform.infra.errors import ConflictError
+
+        tenant = f"t-{uuid.uuid4().hex[:8]}"
+        with tempfile.TemporaryDirectory() as td:
+            w = PostgresLedgerWriter(DSN, repo_root=Path(td), max_pool_size=8)
+            w.set_credits(tenant, 5)
+
+            def reserve(_: int) -> bool:
+                try:
+                    w.reserve_credits(tenant, 1)
+                    return True
+                except ConflictError:
+                    return False
+
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                self.assertEqual(sum(pool.map(reserve, range(20))), 5)
+            self.assertEqual(w.release_credits(tenant, 2), 2)
+
+    def test_runstate_idempotent_step_run(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.infra.adapters.runstate_postgres import PostgresRunStateStore
+
+        run = uuid.uuid4().hex[:8]
+        store = PostgresRunStateStore(DSN)
+        kw = dict(tenant_id=f"t-{run}", work_order_id="w1", step_id="s1", module_id="m1", idempotency_key="k1")
+        r1 = store.create_step_run(**kw)
+        self.assertEqual(store.create_step_run(**kw).module_run_id, r1.module_run_id)
+        store.mark_step_run_succeeded(r1.module_run_id, requested_deliverables=[])
+        self.assertEqual([r.status for r in store.list_step_runs(f"t-{run}", "w1")], ["COMPLETED"])
+
+
+if __name__ == "__main__":
+    unittest.main()
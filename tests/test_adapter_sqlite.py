@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+
+def _item(ti: str, tx: str, wo: str):
+    from platform.infra.models import TransactionItemRecord
+
+    return TransactionItemRecord(
+        transaction_item_id=ti,
+        transaction_id=tx,
+        tenant_id="t1",
+        module_id="m1",
+        work_order_id=wo,
+        step_id="s1",
+        deliverable_id="__run__",
+        feature="run",
+        type="SPEND",
+        amount_credits=3,
+        created_at="2026-01-01T00:00:00Z",
+    )
+
+
+class TestSqliteRunStateStore(unittest.TestCase):
+    def test_idempotency_transitions_and_export(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.infra.adapters.runstate_csv import MODULE_RUNS_LOG_HEADERS
+        from platform.infra.adapters.runstate_sqlite import SqliteRunStateStore
+        from platform.infra.models import OutputRecord
+
+        with tempfile.TemporaryDirectory() as td:
+            store = SqliteRunStateStore(Path(td) / "runstate.sqlite")
+            store.create_run(tenant_id="t1", work_order_id="w1")
+
+            kw = dict(tenant_id="t1", work_order_id="w1", step_id="s1", module_id="m1", idempotency_key="k1")
+            r1 = store.create_step_run(**kw)
+            r2 = store.create_step_run(**kw)
+            self.assertEqual(r1.module_run_id, r2.module_run_id)
+
+            with store.batch():
+                store.mark_step_run_running(r1.module_run_id)
+                store.mark_step_run_succeeded(r1.module_run_id, requested_deliverables=["d1"])
+                store.record_output(OutputRecord(
+                    tenant_id="t1", work_order_id="w1", step_id="s1", module_id="m1", output_id="o1",
+                    path="o1.json", uri="", sha256="", bytes=4, bytes_size=4, created_at="",
+                ))
+
+            runs = store.list_step_runs("t1", "w1")
+            self.assertEqual([(r.status, r.step_id, r.requested_deliverables) for r in runs], [("COMPLETED", "s1", ["d1"])])
+            self.assertEqual(store.get_output("t1", "w1", "s1", "o1").bytes, 4)
+
+            out_dir = Path(td) / "export"
+            counts = store.export_csv(out_dir)
+            self.assertEqual(counts["module_runs_log.csv"], 3)
+            with (out_dir / "module_runs_log.csv").open("r", encoding="utf-8", newline="") as f:
+                reader = csv.DictReader(f)
+                rows = list(reader)
+            self.assertEqual(reader.fieldnames, MODULE_RUNS_LOG_HEADERS)
+            self.assertEqual([r["status"] for r in rows], ["CREATED", "RUNNING", "COMPLETED"])
+
+
+class TestSqliteLedgerWriter(unittest.TestCase):
+    def test_batch_queries_conflicts_and_export(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.infra.adapters.ledger_csv import TRANSACTION_ITEMS_HEADERS
+        from platform.infra.adapters.ledger_sqlite import SqliteLedgerWriter
+        from platform.infra.errors import ConflictError
+        from platform.utils.csvio import read_csv
+
+        with tempfile.TemporaryDirectory() as td:
+            w = SqliteLedgerWriter(Path(td) / "ledger.sqlite", repo_root=Path(td))
+            self.assertEqual(w.post_transaction_items([_item("ti1", "tx1", "w1"), _item("ti2", "tx2", "w2")]), 2)
+            w.post_transaction_item(_item("ti3", "tx1", "w1"))
+
+            self.assertEqual([i.transaction_item_id for i in w.list_transaction_items(tenant_id="t1", work_order_id="w1")], ["ti1", "ti3"])
+            self.assertEqual([i.transaction_item_id for i in w.list_transaction_items(transaction_id="tx2")], ["ti2"])
+
+            # A failing batch is rolled back as a whole.
+            with self.assertRaises(ConflictError):
+                w.post_transaction_items([_item("ti4", "tx3", "w3"), _item("ti1", "tx3", "w3")])
+            self.assertEqual(w.list_transaction_items(work_order_id="w3"), [])
+
+            out_dir = Path(td) / "export"
+            w.export_csv(out_dir)
+            rows = read_csv(out_dir / "transaction_items.csv")
+            self.assertEqual([r["transaction_item_id"] for r in rows], ["ti1", "ti2", "ti3"])
+            self.assertEqual(list(rows[0].keys()), TRANSACTION_ITEMS_HEADERS)
+
+    def test_set_credits_upserts(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.infra.adapters.ledger_sqlite import SqliteLedgerWriter
+        from platform.utils.csvio import read_csv
+
+        with tempfile.TemporaryDirectory() as td:
+            w = SqliteLedgerWriter(Path(td) / "ledger.sqlite", repo_root=Path(td))
+            w.set_credits("t1", 10)
+            w.set_credits("t1", 4)
+            w.set_credits("t2", 1)
+            w.export_csv(Path(td) / "export")
+            rows = read_csv(Path(td) / "export" / "tenants_credits.csv")
+            self.assertEqual([(r["tenant_id"], r["credits_available"], r["status"]) for r in rows], [("t1", "4", "active"), ("t2", "1", "active")])
+
+    def test_reserve_and_release_credits(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.infra.adapters.ledger_sqlite import SqliteLedgerWriter
+        from platform.infra.errors import ConflictError, NotFoundError
+
+        with tempfile.TemporaryDirectory() as td:
+            w = SqliteLedgerWriter(Path(td) / "ledger.sqlite", repo_root=Path(td))
+            w.set_credits("t1", 10)
+            self.assertEqual(w.reserve_credits("t1", 4), 6)
+            with self.assertRaises(ConflictError):
+                w.reserve_credits("t1", 7)
+            with self.assertRaises(NotFoundError):
+                w.reserve_credits("t2", 1)
+            self.assertEqual(w.release_credits("t1", 1), 7)
+            self.assertEqual(w.reserve_credits("t1", 7), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from modules.bigfile_gen.src.run import run as bigfile_run  # noqa: E402
+from platform.utils.det_stream import SEGMENT_SIZE, shake256_segment, write_shake256_stream  # noqa: E402
+
+
+def _run(tmp_path: Path, name: str, **inputs) -> dict:
+    return bigfile_run(params={"inputs": inputs}, outputs_dir=tmp_path / name)
+
+
+def test_sha256_v1_stream_is_unchanged(tmp_path: Path) -> None:
+    nbytes = 100_001
+    res = _run(tmp_path, "v1", bytes=nbytes, seed="s")
+    expected = b"".join(hashlib.sha256(f"s:{i}".encode("utf-8")).digest() for i in range(3126))[:nbytes]
+    assert (tmp_path / "v1" / "big.bin").read_bytes() == expected
+    report = json.loads((tmp_path / "v1" / "report.json").read_text(encoding="utf-8"))
+    assert report["blocks"] == 3126 and "generator" not in report
+    assert res["metadata"]["sha256"] == hashlib.sha256(expected).hexdigest()
+
+
+def test_shake256_v2_segments_are_position_independent(tmp_path: Path) -> None:
+    nbytes = 2 * SEGMENT_SIZE + 12_345
+    res = _run(tmp_path, "v2", bytes=nbytes, seed="s", generator="shake256-v2")
+    data = (tmp_path / "v2" / "big.bin").read_bytes()
+    assert len(data) == nbytes and res["metadata"]["blocks"] == 3
+    assert res["metadata"]["sha256"] == hashlib.sha256(data).hexdigest()
+    assert data[2 * SEGMENT_SIZE:] == shake256_segment("bigfile_gen/shake256-v2/s", 2, 12_345)
+
+    parallel = tmp_path / "parallel.bin"
+    write_shake256_stream(parallel, nbytes, "bigfile_gen/shake256-v2/s", workers=2)
+    assert parallel.read_bytes() == data
+
+    assert _run(tmp_path, "bad", bytes=10, generator="md5")["reason_slug"] == "bad_input_format"
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from platform.billing import partitions  # noqa: E402
+from platform.billing.recompute_credits import TRANSACTIONS_HEADERS, compute_tenant_balances, full_replay_balances  # noqa: E402
+from platform.billing.state import BillingState  # noqa: E402
+from platform.utils.csvio import write_csv  # noqa: E402
+
+
+def _tx(tx_id: str, tenant_id: str, work_order_id: str, ttype: str, amount: int, created_at: str) -> dict[str, str]:
+    return {
+        "transaction_id": tx_id,
+        "tenant_id": tenant_id,
+        "work_order_id": work_order_id,
+        "type": ttype,
+        "amount_credits": str(amount),
+        "created_at": created_at,
+    }
+
+
+def test_partitioned_transactions_load_save_and_balances(tmp_path: Path) -> None:
+    write_csv(
+        tmp_path / "transactions.csv",
+        [
+            _tx("aaaaaaaA", "tenA1a", "", "TOPUP", 100, "2026-08-03T00:00:00Z"),
+            _tx("aaaaaaaB", "tenA1a", "woOldA", "SPEND", 30, "2026-08-04T00:00:00Z"),
+            _tx("aaaaaaaC", "tenB1b", "", "TOPUP", 50, "2026-09-01T00:00:00Z"),
+            _tx("aaaaaaaD", "tenA1a", "woNewA", "SPEND", 5, "2026-10-02T00:00:00Z"),
+        ],
+        TRANSACTIONS_HEADERS,
+    )
+    expected = full_replay_balances(tmp_path)
+
+    assert partitions.partition_table(tmp_path, "transactions.csv", TRANSACTIONS_HEADERS) == {
+        "2026-08": 2, "2026-09": 1, "2026-10": 1,
+    }
+    assert not (tmp_path / "transactions.csv").exists()
+    assert partitions.close_partitions(tmp_path, "2026-10") == ["transactions.2026-08.csv", "transactions.2026-09.csv"]
+
+    billing = BillingState(tmp_path)
+    billing.validate_minimal(required_files=["transactions.csv"])
+    assert len(billing.load_table("transactions.csv")) == 4
+    assert [r["transaction_id"] for r in billing.load_table("transactions.csv", open_only=True)] == ["aaaaaaaD"]
+    touched = billing.load_table("transactions.csv", open_only=True, work_orders=[("tenA1a", "woOldA")])
+    assert [r["transaction_id"] for r in touched] == ["aaaaaaaA", "aaaaaaaB", "aaaaaaaD"]
+
+    # Closed months contribute pinned deltas; only the open month is read.
+    assert compute_tenant_balances(tmp_path) == expected == full_replay_balances(tmp_path)
+
+    rows = billing.load_table("transactions.csv", open_only=True)
+    rows.append(_tx("aaaaaaaE", "tenB1b", "", "TOPUP", 7, "2026-10-05T00:00:00Z"))
+    billing.save_table("transactions.csv", rows, TRANSACTIONS_HEADERS)
+    billing.append_rows("transactions.csv", [_tx("aaaaaaaF", "tenB1b", "", "TOPUP", 1, "2026-11-01T00:00:00Z")], TRANSACTIONS_HEADERS)
+    assert compute_tenant_balances(tmp_path) == {"tenA1a": 65, "tenB1b": 58}
+    assert partitions.verify_closed_partitions(tmp_path) == []
+
+    with pytest.raises(ValueError):
+        billing.save_table("transactions.csv", [_tx("aaaaaaaG", "tenB1b", "", "TOPUP", 1, "2026-09-09T00:00:00Z")], TRANSACTIONS_HEADERS)
+    with pytest.raises(ValueError):
+        billing.append_rows("transactions.csv", [_tx("aaaaaaaH", "tenB1b", "", "TOPUP", 1, "2026-08-09T00:00:00Z")], TRANSACTIONS_HEADERS)
+
+    (tmp_path / "transactions" / "2026-08.csv").write_text("tampered\n", encoding="utf-8")
+    assert partitions.verify_closed_partitions(tmp_path) == ["transactions.2026-08.csv"]
+
+
+def test_csv_ledger_writer_uses_partitions(tmp_path: Path) -> None:
+    from platform.infra.adapters.ledger_csv import TRANSACTION_ITEMS_HEADERS, CsvLedgerWriter
+    from platform.infra.models import TransactionItemRecord, TransactionRecord
+
+    def _item(ti: str, created_at: str) -> TransactionItemRecord:
+        return TransactionItemRecord(
+            transaction_item_id=ti, transaction_id="tx" + ti, tenant_id="tenA1a", module_id="m1",
+            work_order_id="woOldA", step_id="s1", deliverable_id="__run__", feature="run",
+            type="REFUND", amount_credits=1, created_at=created_at,
+        )
+
+    w = CsvLedgerWriter(state_dir=tmp_path, repo_root=tmp_path)
+    w.post_transaction_item(_item("ti1", "2026-08-04T00:00:00Z"))
+    assert [i.transaction_item_id for i in w.list_transaction_items(tenant_id="tenA1a", work_order_id="woOldA")] == ["ti1"]
+    write_csv(tmp_path / "transactions.csv", [], TRANSACTIONS_HEADERS)
+    partitions.partition_table(tmp_path, "transactions.csv", TRANSACTIONS_HEADERS)
+    partitions.partition_table(tmp_path, "transaction_items.csv", TRANSACTION_ITEMS_HEADERS)
+    partitions.close_partitions(tmp_path, "2026-10")
+
+    # History in closed partitions stays visible; new rows land in their monthly partition.
+    w.post_transaction_item(_item("ti2", "2026-10-04T00:00:00Z"))
+    w.post_transaction(TransactionRecord(
+        transaction_id="txti2", tenant_id="tenA1a", work_order_id="woOldA", type="REFUND",
+        amount_credits=0, created_at="2026-10-04T00:00:00Z",
+    ))
+    got = w.list_transaction_items(tenant_id="tenA1a", work_order_id="woOldA")
+    assert [i.transaction_item_id for i in got] == ["ti1", "ti2"]
+    assert not (tmp_path / "transaction_items.csv").exists() and not (tmp_path / "transactions.csv").exists()
+    assert (tmp_path / "transactions" / "2026-10.csv").exists()
+    assert partitions.verify_closed_partitions(tmp_path) == []
+
+
+def test_partitions_round_trip_through_release_assets(tmp_path: Path, monkeypatch) -> None:
+    import scripts.billing_state_hydrate as hydrate
+    import scripts.billing_state_publish as publish
+
+    state = tmp_path / "state"
+    state.mkdir()
+    write_csv(state / "transactions.csv", [
+        _tx("aaaaaaaA", "tenA1a", "", "TOPUP", 100, "2026-08-03T00:00:00Z"),
+        _tx("aaaaaaaB", "tenA1a", "woNewA", "SPEND", 5, "2026-10-02T00:00:00Z"),
+    ], TRANSACTIONS_HEADERS)
+    # The release still holds the flat table from before partitioning.
+    release = tmp_path / "release"
+    release.mkdir()
+    (release / "transactions.csv").write_text("stale\n", encoding="utf-8")
+    partitions.partition_table(state, "transactions.csv", TRANSACTIONS_HEADERS)
+    partitions.close_partitions(state, "2026-10")
+
+    monkeypatch.setattr(publish, "BILLING_DIR", str(state))
+    staged = publish.collect_partition_assets(set(), str(release))
+    assert sorted(Path(f).name for f in staged) == ["transactions.2026-08.csv", "transactions.2026-10.csv"]
+    assert publish.collect_partition_assets({"transactions.2026-08.csv"}, str(release)) == [str(release / "transactions.2026-10.csv")]
+    assert publish.stale_flat_assets(set(p.name for p in release.iterdir())) == ["transactions.csv"]
+    (release / partitions.PARTITIONS_MANIFEST_NAME).write_bytes((state / partitions.PARTITIONS_MANIFEST_NAME).read_bytes())
+
+    def _download(repo: str, tag: str, name: str, out_dir: Path) -> bool:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / name).write_bytes((release / name).read_bytes())
+        return True
+
+    monkeypatch.setattr(hydrate, "_download_release_asset", _download)
+    fresh = tmp_path / "fresh"
+    fresh.mkdir()
+    assets = {p.name for p in release.iterdir()}
+    assert hydrate._hydrate_partitions("o/r", "t", assets, fresh) == [
+        partitions.PARTITIONS_MANIFEST_NAME, "transactions.2026-08.csv", "transactions.2026-10.csv",
+    ]
+    assert BillingState(fresh).load_table("transactions.csv") == BillingState(state).load_table("transactions.csv")
+    assert not (fresh / "transactions.csv").exists()
+
+    (release / "transactions.2026-08.csv").write_text("tampered\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        hydrate._hydrate_partitions("o/r", "t", assets, tmp_path / "again")
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+
+def _item(ti: str):
+    from platform.infra.models import TransactionItemRecord
+
+    return TransactionItemRecord(
+        transaction_item_id=ti,
+        transaction_id="tx1",
+        tenant_id="t1",
+        module_id="m1",
+        work_order_id="w1",
+        step_id="s1",
+        deliverable_id="__run__",
+        feature="run",
+        type="SPEND",
+        amount_credits=2,
+        created_at="2026-01-01T00:00:00Z",
+    )
+
+
+class TestBillingStateCsvLedgerWriter(unittest.TestCase):
+    def test_streaming_appends_write_header_once(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.infra.factory import BillingStateCsvLedgerWriter
+        from platform.utils.csvio import read_csv
+
+        with tempfile.TemporaryDirectory() as td:
+            w = BillingStateCsvLedgerWriter(Path(td))
+            w.append_transaction_item(_item("ti1"))
+            self.assertEqual(w.append_transaction_items([_item("ti2"), _item("ti3")]), 2)
+            self.assertEqual(w.append_transaction_items([]), 0)
+
+            p = Path(td) / "transaction_items.csv"
+            lines = p.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(lines[0], ",".join(BillingStateCsvLedgerWriter.TRANSACTION_ITEMS_HEADERS))
+            self.assertEqual([r["transaction_item_id"] for r in read_csv(p)], ["ti1", "ti2", "ti3"])
+
+    def test_append_terminates_unterminated_last_row(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.utils.csvio import append_csv_rows, read_csv
+
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "t.csv"
+            p.write_text("a,b\n1,2", encoding="utf-8")
+            self.assertEqual(append_csv_rows(p, [{"a": "3", "b": "4"}], ["a", "b"]), 1)
+            self.assertEqual(read_csv(p), [{"a": "1", "b": "2"}, {"a": "3", "b": "4"}])
+
+            p.write_text("a,b", encoding="utf-8")
+            append_csv_rows(p, [{"a": "5", "b": "6"}], ["a", "b"])
+            self.assertEqual(p.read_text(encoding="utf-8"), "a,b\n5,6\n")
+
+    def test_schema_drift_is_rejected(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.infra.errors import ValidationError
+        from platform.infra.factory import BillingStateCsvLedgerWriter
+
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "transaction_items.csv"
+            p.write_text("transaction_item_id,transaction_id\n", encoding="utf-8")
+            w = BillingStateCsvLedgerWriter(Path(td))
+            with self.assertRaises(ValidationError):
+                w.append_transaction_item(_item("ti1"))
+            self.assertEqual(p.read_text(encoding="utf-8"), "transaction_item_id,transaction_id\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from platform.billing.credit_book import CreditBook  # noqa: E402
+from platform.infra.adapters.ledger_sqlite import SqliteLedgerWriter  # noqa: E402
+
+
+def test_reserve_commit_release_never_overspends() -> None:
+    rows = [
+        {"tenant_id": "tenA1a", "credits_available": "50", "updated_at": "2026-10-01T00:00:00Z", "status": "ACTIVE"},
+        {"tenant_id": "tenA1a", "credits_available": "100", "updated_at": "2026-10-02T00:00:00Z", "status": "ACTIVE"},
+    ]
+    book = CreditBook(rows)
+    assert book.available("tenA1a") == 100
+
+    assert book.reserve("tenA1a", "wo1", 60)
+    assert book.reserve("tenA1a", "wo1", 60)  # same key: no second hold
+    assert not book.reserve("tenA1a", "wo2", 60)  # would overspend while wo1 is held
+    assert book.available("tenA1a") == 40 and book.balance("tenA1a") == 100
+
+    assert book.commit("wo1") == 60
+    book.credit("tenA1a", 15)  # refund
+    assert book.reserve("tenA1a", "wo2", 30)
+    assert book.release("wo2") == 30
+    assert book.commit("wo2") == 0
+    assert book.available("tenA1a") == 55 and rows[1]["credits_available"] == "55"
+
+    # Unknown tenants get a zero-balance row appended to the caller's list.
+    assert not book.reserve("tenB1b", "wo3", 1)
+    assert rows[-1]["tenant_id"] == "tenB1b" and rows[-1]["credits_available"] == "0"
+
+
+def test_holds_are_taken_from_a_shared_sql_ledger(tmp_path: Path) -> None:
+    ledger = SqliteLedgerWriter(tmp_path / "ledger.sqlite", repo_root=tmp_path)
+    ledger.set_credits("tenA1a", 100)
+    row = {"tenant_id": "tenA1a", "credits_available": "100", "updated_at": "2026-10-01T00:00:00Z", "status": "active"}
+    # Two workers with their own books over the same ledger.
+    book1, book2 = CreditBook([dict(row)], ledger=ledger), CreditBook([dict(row)], ledger=ledger)
+
+    assert book1.reserve("tenA1a", "wo1", 70)
+    assert not book2.reserve("tenA1a", "wo2", 70)  # the ledger balance already holds wo1
+    assert book1.commit("wo1") == 70
+    book1.credit("tenA1a", 20)  # refund goes back to the shared balance
+    assert book2.reserve("tenA1a", "wo2", 50)
+    assert book2.release("wo2") == 50
+    assert ledger.reserve_credits("tenA1a", 0) == 50
+
+    # Tenants the ledger has no balance row for are held in the book only.
+    book3 = CreditBook([{"tenant_id": "tenB1b", "credits_available": "5", "updated_at": "", "status": "active"}], ledger=ledger)
+    assert book3.reserve("tenB1b", "wo3", 5)
+    assert book3.release("wo3") == 5
@@ -410,3 +410,22 @@ def test_deliver_onedrive_transient_error_but_verified_succeeds(tmp_path: Path,
     stored = stub_root / remote_path.lstrip("/")
     assert stored.exists()
     assert stored.stat().st_size == int(receipt["bytes"])
+
+
+def test_dev_stub_saves_digest_index_once_per_run(tmp_path: Path, monkeypatch) -> None:
+    sys.path.insert(0, str(_repo_root() / "modules" / "deliver_dropbox" / "src"))
+    import dropbox_client as client_mod
+    from platform.utils.hashing import DigestCache
+
+    saves = []
+    monkeypatch.setattr(DigestCache, "save", lambda self: saves.append(self.root))
+    src = tmp_path / "pkg.zip"
+    src.write_bytes(b"zip" * 100)
+
+    client = client_mod.DropboxDevStubClient(tmp_path / "stub")
+    client.upload_resumable(local_path=src, remote_path="/a/pkg.zip", chunk_bytes=64)
+    for _ in range(3):
+        assert client.get_metadata(remote_path="/a/pkg.zip") is not None
+    assert saves == []
+    client.close()
+    assert saves == [tmp_path / "stub"]
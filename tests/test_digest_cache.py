@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+import platform.utils.hashing as hashing  # noqa: E402
+from platform.utils.hashing import DigestCache, digest_cache, sha256_file, sha256_files  # noqa: E402
+
+
+def _age(p: Path, seconds: int = 60) -> None:
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+def test_unchanged_files_are_hashed_once_across_runs(tmp_path: Path, monkeypatch) -> None:
+    f = tmp_path / "runs" / "big.bin"
+    f.parent.mkdir()
+    f.write_bytes(b"a" * 3_000_000)
+    _age(f)
+    expected = hashlib.sha256(f.read_bytes()).hexdigest()
+
+    calls = []
+    real = hashing._sha256_uncached
+    monkeypatch.setattr(hashing, "_sha256_uncached", lambda p: calls.append(p) or real(p))
+
+    first = DigestCache(tmp_path)
+    assert first.sha256(f) == expected
+    assert sha256_file(f, first) == expected
+    assert len(calls) == 1
+    first.save()
+
+    # A later run loads the persisted index.
+    assert DigestCache(tmp_path).sha256(f) == expected
+    assert len(calls) == 1
+
+    # Any change to size or mtime is a miss.
+    f.write_bytes(b"b" * 3_000_000)
+    assert DigestCache(tmp_path).sha256(f) == hashlib.sha256(f.read_bytes()).hexdigest()
+    assert len(calls) == 2
+
+
+def test_recently_modified_files_are_not_persisted(tmp_path: Path) -> None:
+    fresh = tmp_path / "fresh.txt"
+    fresh.write_text("x", encoding="utf-8")
+    cache = digest_cache(tmp_path)
+    assert cache is digest_cache(str(tmp_path)) and digest_cache("") is None
+    cache.sha256(fresh)  # type: ignore[union-attr]
+    cache.save()  # type: ignore[union-attr]
+    assert '"entries":[]' in (tmp_path / hashing.DIGEST_INDEX_NAME).read_text(encoding="utf-8")
+
+
+def test_sha256_files_keeps_input_order(tmp_path: Path) -> None:
+    paths = []
+    for i in range(20):
+        p = tmp_path / f"f{i:02d}.bin"
+        p.write_bytes(bytes([i]) * (i * 70_000))
+        paths.append(p)
+    paths.reverse()
+    expected = [hashlib.sha256(p.read_bytes()).hexdigest() for p in paths]
+    assert sha256_files(paths, workers=4) == expected
+    assert sha256_files(paths, workers=1) == expected
+    assert sha256_files([tmp_path / "missing", paths[0]], default="") == ["", expected[0]]
+    assert sha256_files([]) == []
+
+
+def test_lookup_never_reads_and_remember_checks_stat(tmp_path: Path, monkeypatch) -> None:
+    f = tmp_path / "in.txt"
+    f.write_bytes(b"payload")
+    monkeypatch.setattr(hashing, "_sha256_uncached", lambda p: (_ for _ in ()).throw(AssertionError("read")))
+    cache = DigestCache(tmp_path / "idx")
+    assert cache.lookup(f) is None
+
+    st = f.stat()
+    cache.remember(f, "d1", st)
+    assert cache.lookup(f) == "d1"
+
+    f.write_bytes(b"changed!")
+    cache.remember(f, "stale", st)
+    assert cache.lookup(f) is None
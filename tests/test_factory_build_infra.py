@@ -23,6 +23,27 @@ class TestFactoryBuildInfra(unittest.TestCase):
         self.assertIn("adapters", desc)
         self.assertIn("registry", desc["adapters"])
         self.assertIn("class", desc["adapters"]["registry"])
+        self.assertEqual(desc["adapters"]["module_cache_store"], {"class": "NotConfigured"})
+
+    def test_build_infra_with_module_cache_store(self) -> None:
+        repo_root = ensure_repo_on_path()
+
+        import tempfile
+
+        import yaml
+
+        from platform.infra.config import load_runtime_profile
+        from platform.infra.factory import build_infra
+
+        data = yaml.safe_load((repo_root / "config" / "runtime_profile.dev_github.yml").read_text(encoding="utf-8"))
+        with tempfile.TemporaryDirectory() as td:
+            data["adapters"]["module_cache_store"] = {"kind": "local_fs", "settings": {"base_dir": str(Path(td) / "l2")}}
+            profile_path = Path(td) / "profile.yml"
+            profile_path.write_text(yaml.safe_dump(data), encoding="utf-8")
+            bundle = build_infra(repo_root=repo_root, profile=load_runtime_profile(repo_root, cli_path=str(profile_path)))
+
+            self.assertIsNotNone(bundle.module_cache_store)
+            self.assertEqual(bundle.module_cache_store.base_dir, Path(td) / "l2")
 
 
 if __name__ == "__main__":
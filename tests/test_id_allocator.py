@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from platform.common.id_allocator import ID_BLOCKS_NAME, IdAllocator, encode_sequence, merge_id_blocks  # noqa: E402
+from platform.common.id_policy import is_valid_id  # noqa: E402
+
+
+def test_blocks_are_persisted_and_never_overlap(tmp_path: Path) -> None:
+    a = IdAllocator(tmp_path, block_size=4)
+    b = IdAllocator(tmp_path, block_size=4)  # second writer on the same billing-state
+    ids = [a.new_id("transaction_id") for _ in range(6)] + [b.new_id("transaction_id") for _ in range(6)]
+    assert len(set(ids)) == 12 and all(is_valid_id("transaction_id", i) for i in ids)
+    assert IdAllocator(tmp_path, block_size=4).new_id("transaction_id") not in ids
+
+    used = {encode_sequence("transaction_item_id", 0)}
+    assert IdAllocator(tmp_path / "other", block_size=4).new_id("transaction_item_id", used) == encode_sequence("transaction_item_id", 1)
+
+
+def test_sharded_namespaces_are_disjoint_and_merge(tmp_path: Path) -> None:
+    IdAllocator(tmp_path / "base", block_size=2).new_id("transaction_id")
+    shards = []
+    for i in range(3):
+        d = tmp_path / f"s{i}"
+        d.mkdir()
+        (d / ID_BLOCKS_NAME).write_bytes((tmp_path / "base" / ID_BLOCKS_NAME).read_bytes())
+        alloc = IdAllocator(d, namespace=(i, 3), block_size=2)
+        shards.append({alloc.new_id("transaction_id") for _ in range(5)})
+    assert not (shards[0] & shards[1] or shards[0] & shards[2] or shards[1] & shards[2])
+
+    merged = merge_id_blocks([tmp_path / f"s{i}" / ID_BLOCKS_NAME for i in range(3)])
+    assert merged == {"transaction_id": {"next_block": 1 + 3 * 3}}
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from platform.infra.adapters.registry_repo import RepoModuleRegistry  # noqa: E402
+from platform.infra.errors import ValidationError  # noqa: E402
+from platform.infra.models import module_cache_bypass_inputs, module_cache_scope  # noqa: E402
+from platform.maintenance._builder.loader import load_namespace  # noqa: E402
+from platform.orchestration.module_exec import derive_cache_key  # noqa: E402
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_global_scope_keys_without_tenant() -> None:
+    inputs = {"bytes": 10, "seed": "s"}
+    a = derive_cache_key("bigfile_gen", "tenA1a", inputs, scope="global")
+    b = derive_cache_key("bigfile_gen", "tenB1b", inputs, scope="global")
+    assert a == b and "tenA1a" not in a and a.startswith("v1|scope=global|module=bigfile_gen|")
+    assert len(a.rsplit("hash=", 1)[1]) == 64
+    assert derive_cache_key("bigfile_gen", "tenA1a", inputs) != derive_cache_key("bigfile_gen", "tenB1b", inputs)
+    with pytest.raises(ValueError):
+        derive_cache_key("bigfile_gen", "tenA1a", inputs, scope="shared")
+
+
+def test_declared_scopes_and_validation(tmp_path: Path) -> None:
+    reg = RepoModuleRegistry(REPO_ROOT)
+    assert reg.get_contract("bigfile_gen")["cache_scope"] == "global"
+    assert reg.get_contract("deliver_email")["cache_scope"] == "tenant"
+    assert module_cache_scope({}) == "tenant"
+
+    repo = tmp_path / "repo"
+    shutil.copytree(REPO_ROOT / "modules" / "bigfile_gen", repo / "modules" / "bigfile_gen")
+    yml = repo / "modules" / "bigfile_gen" / "module.yml"
+    yml.write_text(yml.read_text(encoding="utf-8").replace("scope: global", "scope: everyone"), encoding="utf-8")
+
+    with pytest.raises(ValidationError):
+        RepoModuleRegistry(repo).get_contract("bigfile_gen")
+    ns = load_namespace()
+    with pytest.raises(ValueError, match="cache.scope"):
+        ns["_compile_module_contract_rules"](ns["MaintenanceContext"](repo_root=repo), "bigfile_gen")
+
+
+def test_declared_bypass_inputs() -> None:
+    reg = RepoModuleRegistry(REPO_ROOT)
+    assert reg.get_contract("wxz")["cache_bypass_inputs"] == ["only_new_results"]
+    assert reg.get_contract("bigfile_gen")["cache_bypass_inputs"] == []
+    with pytest.raises(ValueError, match="bypass_inputs"):
+        module_cache_bypass_inputs({"cache": {"bypass_inputs": "only_new_results"}})
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from platform.cache.module_store import ModuleOutputCache  # noqa: E402
+from platform.infra.adapters.artifacts_local import LocalArtifactStore  # noqa: E402
+
+
+KEY = "v1|scope=global|module=bigfile_gen|type=outputs|hash=abc123"
+
+
+def _outputs(root: Path) -> Path:
+    (root / "nested").mkdir(parents=True)
+    (root / "report.json").write_text('{"ok": true}\n', encoding="utf-8")
+    (root / "nested" / "a.bin").write_bytes(b"x" * 4096)
+    (root / "nested" / "b.bin").write_bytes(b"x" * 4096)
+    return root
+
+
+def test_l2_survives_fresh_runner(tmp_path: Path) -> None:
+    store = LocalArtifactStore(tmp_path / "object_store")
+    out_dir = _outputs(tmp_path / "runner_a" / "out")
+
+    first = ModuleOutputCache(store, ttl_days=7)
+    first.store(KEY, out_dir, tmp_path / "runner_a" / "cache" / "k-1")
+    assert first.flush() == 0
+    # Identical files share one blob.
+    assert len(store.list_keys("module-cache/blobs/")) == 2
+
+    fresh_dir = tmp_path / "runner_b" / "cache" / "k-1"
+    fresh = ModuleOutputCache(store)
+    assert fresh.fetch(KEY, fresh_dir)
+    assert (fresh_dir / "nested" / "b.bin").read_bytes() == b"x" * 4096
+    assert json.loads((fresh_dir / "report.json").read_text(encoding="utf-8")) == {"ok": True}
+    assert not fresh.fetch(KEY.replace("abc123", "zzz999"), tmp_path / "runner_b" / "cache" / "k-2")
+    assert not ModuleOutputCache(None).fetch(KEY, tmp_path / "runner_c" / "k-1")
+
+
+def test_l2_rejects_expired_and_corrupt_entries(tmp_path: Path) -> None:
+    store = LocalArtifactStore(tmp_path / "object_store")
+    cache = ModuleOutputCache(store)
+    cache.store(KEY, _outputs(tmp_path / "out"), tmp_path / "l1" / "k-1")
+    cache.flush()
+
+    manifest = store._resolve_key(cache.manifest_key(KEY))
+    entry = json.loads(manifest.read_text(encoding="utf-8"))
+    blob = store._resolve_key(cache.blob_key(entry["files"][0]["sha256"]))
+    blob.write_bytes(b"tampered")
+    assert not cache.fetch(KEY, tmp_path / "fresh" / "k-1")
+    assert not (tmp_path / "fresh" / "k-1").exists()
+
+    entry["expires_at"] = "2000-01-01T00:00:00Z"
+    manifest.write_text(json.dumps(entry), encoding="utf-8")
+    assert not cache.fetch(KEY, tmp_path / "fresh" / "k-1")
+
+
+class _GatedStore(LocalArtifactStore):
+    def __init__(self, root: Path) -> None:
+        super().__init__(root)
+        self.gate = threading.Event()
+
+    def put_file(self, key: str, local_path: Path, content_type: str = "") -> str:
+        self.gate.wait(5)
+        return super().put_file(key, local_path, content_type)
+
+
+def test_store_waits_for_pending_write_through_of_same_key(tmp_path: Path) -> None:
+    store = _GatedStore(tmp_path / "object_store")
+    cache = ModuleOutputCache(store)
+    l1 = tmp_path / "l1" / "k-1"
+    cache.store(KEY, _outputs(tmp_path / "out1"), l1)
+
+    second = _outputs(tmp_path / "out2")
+    (second / "report.json").write_text('{"ok": false}\n', encoding="utf-8")
+    t = threading.Thread(target=cache.store, args=(KEY, second, l1))
+    t.start()
+    t.join(0.2)
+    # The L1 tree is not replaced while the first upload is still reading it.
+    assert t.is_alive()
+    assert json.loads((l1 / "report.json").read_text(encoding="utf-8")) == {"ok": True}
+
+    store.gate.set()
+    t.join(5)
+    assert cache.flush() == 0
+    assert json.loads((l1 / "report.json").read_text(encoding="utf-8")) == {"ok": False}
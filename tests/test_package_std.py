@@ -182,3 +182,69 @@ def test_package_std_missing_bound_outputs_fails_with_package_failed(tmp_path: P
     report = json.loads((out_dir / "report.json").read_text(encoding="utf-8"))
     missing = report.get("missing_outputs")
     assert missing == [{"step_id": "s_missing", "output_id": "report"}]
+
+
+def test_package_std_streams_byte_identical_to_buffered_zip(tmp_path: Path) -> None:
+    from modules.package_std.src.run import run as package_run
+
+    src = tmp_path / "src"
+    src.mkdir()
+    big = bytes(range(256)) * 12_000  # > 2 read chunks
+    (src / "big.bin").write_bytes(big)
+    (src / "a.txt").write_text("alpha\n", encoding="utf-8")
+    bound = [
+        {"step_id": "s1", "output_id": "big", "uri": (src / "big.bin").as_uri(), "as_path": "zz/big.bin"},
+        {"step_id": "s1", "output_id": "a", "uri": (src / "a.txt").as_uri(), "as_path": "aa/a.txt"},
+        {"step_id": "s1", "output_id": "m", "uri": (src / "a.txt").as_uri(), "as_path": "manifest.d/a.txt"},
+    ]
+    out = tmp_path / "out"
+    assert package_run(params={"inputs": {"bound_outputs": bound}}, outputs_dir=out)["status"] == "COMPLETED"
+    assert sorted(p.name for p in out.iterdir()) == ["manifest.csv", "manifest.json", "package.zip"]
+
+    # Reference: every entry buffered in memory and written with writestr() in name order.
+    contents = {
+        "aa/a.txt": b"alpha\n",
+        "manifest.d/a.txt": b"alpha\n",
+        "zz/big.bin": big,
+        "manifest.json": (out / "manifest.json").read_bytes(),
+        "manifest.csv": (out / "manifest.csv").read_bytes(),
+    }
+    ref = tmp_path / "ref.zip"
+    with zipfile.ZipFile(ref, "w") as zf:
+        for name in sorted(contents):
+            zi = zipfile.ZipInfo(filename=name, date_time=(1980, 1, 1, 0, 0, 0))
+            zi.compress_type = zipfile.ZIP_DEFLATED
+            zi.create_system = 3
+            zi.external_attr = (0o644 & 0xFFFF) << 16
+            zf.writestr(zi, contents[name])
+    assert (out / "package.zip").read_bytes() == ref.read_bytes()
+
+
+def test_package_std_reuses_package_for_unchanged_inputs(tmp_path: Path) -> None:
+    from modules.package_std.src.run import run as package_run
+
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "a.txt").write_text("alpha\n", encoding="utf-8")
+    bound = [{"step_id": "s1", "output_id": "a", "uri": (src / "a.txt").as_uri(), "as_path": "aa/a.txt"}]
+    params = {"inputs": {"bound_outputs": bound}, "_platform": {"cache_dir": str(tmp_path / "cache")}}
+
+    first = package_run(params=params, outputs_dir=tmp_path / "out1")
+    assert first["status"] == "COMPLETED" and "reused" not in first["metadata"]
+    (cached,) = first["cache_refs"]
+    assert Path(cached).parent == tmp_path / "cache" / "packages"
+    # Outputs are copies: writing one in place leaves the cached package intact.
+    (tmp_path / "out1" / "manifest.csv").write_text("overwritten\n", encoding="utf-8")
+    second = package_run(params=params, outputs_dir=tmp_path / "out2")
+    assert second["metadata"]["reused"] is True
+    assert second["cache_refs"] == [cached]
+    assert (tmp_path / "out2" / "manifest.csv").read_text(encoding="utf-8") != "overwritten\n"
+    (tmp_path / "out1" / "manifest.csv").write_bytes((Path(cached) / "manifest.csv").read_bytes())
+    for name in ("package.zip", "manifest.json", "manifest.csv"):
+        assert (tmp_path / "out2" / name).read_bytes() == (tmp_path / "out1" / name).read_bytes()
+
+    (src / "a.txt").write_text("beta\n", encoding="utf-8")
+    third = package_run(params=params, outputs_dir=tmp_path / "out3")
+    assert "reused" not in third["metadata"]
+    with zipfile.ZipFile(tmp_path / "out3" / "package.zip") as zf:
+        assert zf.read("aa/a.txt") == b"beta\n"
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import random
+import zipfile
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from platform.artifacts.packaging import ZipEntry, create_zip, package_key, reusable_package, zip_with_manifest  # noqa: E402
+
+
+def test_parallel_create_zip_is_byte_identical_to_sequential(tmp_path: Path) -> None:
+    rnd = random.Random(7)
+    entries = []
+    for i in range(12):
+        p = tmp_path / "src" / f"f{i:02d}.bin"
+        p.parent.mkdir(parents=True, exist_ok=True)
+        # Mix of empty, compressible and incompressible payloads, some over one read chunk.
+        p.write_bytes(rnd.randbytes(i * 150_000) + b"ab" * (i * 40_000))
+        entries.append(ZipEntry(arcname=f"data/{p.name}", source_path=p))
+    (tmp_path / "src" / "sub").mkdir()
+    entries.append(ZipEntry(arcname="data/sub", source_path=tmp_path / "src" / "sub"))
+
+    sequential = tmp_path / "sequential.zip"
+    with zipfile.ZipFile(sequential, mode="w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for e in entries:
+            zf.write(e.source_path, arcname=e.arcname)
+
+    digests = set()
+    for workers in (1, 4):
+        out = tmp_path / f"parallel_{workers}.zip"
+        digest, size = create_zip(zip_path=out, entries=entries, workers=workers)
+        assert out.read_bytes() == sequential.read_bytes()
+        assert size == sequential.stat().st_size
+        digests.add(digest)
+    assert len(digests) == 1
+
+    with_manifest = tmp_path / "with_manifest.zip"
+    zip_with_manifest(zip_path=with_manifest, entries=entries[:3], manifest={"k": "v"}, workers=3)
+    with zipfile.ZipFile(with_manifest) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["data/f00.bin", "data/f01.bin", "data/f02.bin", "manifest.json"]
+        assert zf.read("manifest.json") == b'{"k":"v"}'
+
+
+def test_zip_with_manifest_reuses_archive_with_same_package_key(tmp_path: Path) -> None:
+    src = tmp_path / "a.txt"
+    src.write_text("alpha\n", encoding="utf-8")
+    entries = [ZipEntry(arcname="a.txt", source_path=src)]
+    out = tmp_path / "out.zip"
+    key = package_key([("a.txt", 6, "0" * 64)], {"manifest_arcname": "manifest.json"})
+    assert key != package_key([("a.txt", 6, "1" * 64)], {"manifest_arcname": "manifest.json"})
+
+    first = zip_with_manifest(zip_path=out, entries=entries, manifest={"run": 1}, reuse_key=key)
+    assert zip_with_manifest(zip_path=out, entries=entries, manifest={"run": 2}, reuse_key=key) == first
+    with zipfile.ZipFile(out) as zf:
+        assert zf.read("manifest.json") == b'{"run":1}'
+
+    # A different key, or no key, rebuilds.
+    zip_with_manifest(zip_path=out, entries=entries, manifest={"run": 3}, reuse_key=key + "x")
+    with zipfile.ZipFile(out) as zf:
+        assert zf.read("manifest.json") == b'{"run":3}'
+    create_zip(zip_path=out, entries=entries)
+    assert reusable_package(out, key + "x") is None
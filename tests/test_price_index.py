@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+
+HEADER = "module_id,deliverable_id,price_credits,effective_from,effective_to,active,notes\n"
+
+
+class TestPriceIndex(unittest.TestCase):
+    def test_overlapping_intervals_latest_effective_from_wins(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.billing.price_index import PriceIndex
+
+        rows = [
+            {"module_id": "m1", "deliverable_id": "__run__", "price_credits": "5", "effective_from": "", "effective_to": "", "active": "true"},
+            {"module_id": "m1", "deliverable_id": "__run__", "price_credits": "8", "effective_from": "2024-03-01", "effective_to": "2024-04-01", "active": "true"},
+            {"module_id": "m1", "deliverable_id": "__run__", "price_credits": "9", "effective_from": "2024-03-01", "effective_to": "", "active": "true"},
+            {"module_id": "m1", "deliverable_id": "__run__", "price_credits": "1", "effective_from": "2025-01-01", "effective_to": "", "active": "false"},
+        ]
+        idx = PriceIndex.from_rows(rows)
+
+        def price(d: date) -> str:
+            row = idx.resolve_row("m1", "__run__", d)
+            return "" if row is None else row["price_credits"]
+
+        self.assertEqual(price(date(2000, 1, 1)), "5")
+        self.assertEqual(price(date(2024, 3, 15)), "8")  # tie on effective_from keeps file order
+        self.assertEqual(price(date(2024, 4, 1)), "9")
+        self.assertEqual(price(date(2030, 1, 1)), "9")
+        self.assertIsNone(idx.resolve_row("m1", "other", date(2030, 1, 1)))
+
+    def test_inclusive_effective_to_and_gaps(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.billing.price_index import PriceIndex
+
+        rows = [{"module_id": "m1", "deliverable_id": "d", "price_credits": "3", "effective_from": "2024-01-01", "effective_to": "2024-01-31", "active": "true"}]
+        exclusive = PriceIndex.from_rows(rows)
+        inclusive = PriceIndex.from_rows(rows, effective_to_inclusive=True)
+        self.assertIsNone(exclusive.resolve_row("m1", "d", date(2024, 1, 31)))
+        self.assertIsNotNone(inclusive.resolve_row("m1", "d", date(2024, 1, 31)))
+        self.assertIsNone(inclusive.resolve_row("m1", "d", date(2024, 2, 1)))
+        self.assertIsNone(inclusive.resolve_row("m1", "d", date(2023, 12, 31)))
+
+    def test_unparsable_effective_to_excludes_row(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.billing.price_index import PriceIndex
+
+        rows = [
+            {"module_id": "m1", "deliverable_id": "d", "price_credits": "3", "effective_from": "2020-01-01", "effective_to": "", "active": "true"},
+            {"module_id": "m1", "deliverable_id": "d", "price_credits": "7", "effective_from": "2023-01-01", "effective_to": "2023-13-01", "active": "true"},
+        ]
+        for inclusive in (False, True):
+            idx = PriceIndex.from_rows(rows, effective_to_inclusive=inclusive)
+            # The retired row with a malformed end date never wins; the open-ended one does.
+            self.assertEqual(idx.resolve_row("m1", "d", date(2030, 1, 1))["price_credits"], "3")
+            self.assertEqual(idx.resolve_row("m1", "d", date(2023, 6, 1))["price_credits"], "3")
+
+    def test_cached_index_reloads_when_file_changes(self) -> None:
+        ensure_repo_on_path()
+
+        from platform.billing.price_index import load_price_index
+
+        with tempfile.TemporaryDirectory() as td:
+            p = Path(td) / "module_prices.csv"
+            p.write_text(HEADER + "m1,__run__,5,2020-01-01,,true,\n", encoding="utf-8")
+            first = load_price_index(p)
+            self.assertIs(load_price_index(p), first)
+
+            p.write_text(HEADER + "m1,__run__,6,2020-01-01,,true,\n", encoding="utf-8")
+            st = p.stat()
+            os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+            second = load_price_index(p)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.resolve_row("m1", "__run__", date(2024, 1, 1))["price_credits"], "6")
+
+
+if __name__ == "__main__":
+    unittest.main()
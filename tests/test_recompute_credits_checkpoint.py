@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from platform.billing.recompute_credits import (  # noqa: E402
+    CREDITS_CHECKPOINT_NAME,
+    TRANSACTIONS_HEADERS,
+    compute_tenant_balances,
+    full_replay_balances,
+    recompute_tenants_credits,
+)
+
+
+def _append_tx(path: Path, rows: list[dict[str, str]]) -> None:
+    new = not path.exists()
+    with path.open("a", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=TRANSACTIONS_HEADERS, extrasaction="ignore", lineterminator="\n")
+        if new:
+            w.writeheader()
+        for r in rows:
+            w.writerow({h: r.get(h, "") for h in TRANSACTIONS_HEADERS})
+
+
+def _tx(tx_id: str, tenant_id: str, ttype: str, amount: int) -> dict[str, str]:
+    return {
+        "transaction_id": tx_id,
+        "tenant_id": tenant_id,
+        "type": ttype,
+        "amount_credits": str(amount),
+        "created_at": "2026-01-01T00:00:00Z",
+        "note": "multi\nline",
+    }
+
+
+def _credits(state: Path) -> dict[str, str]:
+    with (state / "tenants_credits.csv").open("r", encoding="utf-8", newline="") as f:
+        return {r["tenant_id"]: r["credits_available"] for r in csv.DictReader(f)}
+
+
+def test_incremental_recompute_matches_full_replay(tmp_path: Path) -> None:
+    tx_path = tmp_path / "transactions.csv"
+    _append_tx(tx_path, [_tx("aaaaaaaA", "tenA1a", "TOPUP", 100), _tx("aaaaaaaB", "tenA1a", "SPEND", 30)])
+
+    recompute_tenants_credits(tmp_path, verify=True)
+    assert _credits(tmp_path) == {"tenA1a": "70"}
+    cp = json.loads((tmp_path / CREDITS_CHECKPOINT_NAME).read_text(encoding="utf-8"))
+    assert cp["rows_covered"] == 2
+    assert cp["byte_offset"] == tx_path.stat().st_size
+
+    _append_tx(tx_path, [_tx("aaaaaaaC", "tenB2b", "TOPUP", 5), _tx("aaaaaaaD", "tenA1a", "REFUND", 7)])
+    recompute_tenants_credits(tmp_path, verify=True)
+    assert _credits(tmp_path) == {"tenA1a": "77", "tenB2b": "5"}
+    cp = json.loads((tmp_path / CREDITS_CHECKPOINT_NAME).read_text(encoding="utf-8"))
+    assert cp["rows_covered"] == 4
+
+
+def test_rewritten_history_forces_full_replay(tmp_path: Path) -> None:
+    tx_path = tmp_path / "transactions.csv"
+    _append_tx(tx_path, [_tx("aaaaaaaA", "tenA1a", "TOPUP", 100)])
+    assert compute_tenant_balances(tmp_path) == {"tenA1a": 100}
+
+    tx_path.unlink()
+    _append_tx(tx_path, [_tx("aaaaaaaA", "tenA1a", "TOPUP", 40), _tx("aaaaaaaB", "tenA1a", "TOPUP", 1)])
+    assert compute_tenant_balances(tmp_path) == {"tenA1a": 41}
+    assert full_replay_balances(tmp_path) == {"tenA1a": 41}
+
+
+def test_corrupt_checkpoint_is_ignored(tmp_path: Path) -> None:
+    _append_tx(tmp_path / "transactions.csv", [_tx("aaaaaaaA", "tenA1a", "TOPUP", 9)])
+    (tmp_path / CREDITS_CHECKPOINT_NAME).write_text("{not json", encoding="utf-8")
+    recompute_tenants_credits(tmp_path, verify=True)
+    assert _credits(tmp_path) == {"tenA1a": "9"}
+
+
+def test_unterminated_last_row_counts_but_is_not_checkpointed(tmp_path: Path) -> None:
+    tx_path = tmp_path / "transactions.csv"
+    header = ",".join(TRANSACTIONS_HEADERS)
+    tx_path.write_text(f"{header}\naaaaaaaA,tenA1a,,TOPUP,10\naaaaaaaB,tenA1a,,TOPUP,5", encoding="utf-8")
+
+    recompute_tenants_credits(tmp_path, verify=True)
+    assert _credits(tmp_path) == {"tenA1a": "15"}
+    cp = json.loads((tmp_path / CREDITS_CHECKPOINT_NAME).read_text(encoding="utf-8"))
+    assert cp["rows_covered"] == 1 and cp["balances"] == {"tenA1a": 10}
+
+    # Completing the row later is picked up from the checkpoint without double counting.
+    with tx_path.open("a", encoding="utf-8") as f:
+        f.write("0,,,\naaaaaaaC,tenA1a,,TOPUP,1\n")
+    recompute_tenants_credits(tmp_path, verify=True)
+    assert _credits(tmp_path) == {"tenA1a": "61"}
+
+    (tmp_path / CREDITS_CHECKPOINT_NAME).unlink()
+    recompute_tenants_credits(tmp_path, incremental=False)
+    assert _credits(tmp_path) == {"tenA1a": "61"}
+    assert not (tmp_path / CREDITS_CHECKPOINT_NAME).exists()
+
+
+def test_empty_and_header_only_transactions(tmp_path: Path) -> None:
+    tx_path = tmp_path / "transactions.csv"
+    header = ",".join(TRANSACTIONS_HEADERS)
+    for content in ("", header, header + "\n"):
+        tx_path.write_text(content, encoding="utf-8")
+        assert compute_tenant_balances(tmp_path, use_checkpoint=False) == {}
+        assert compute_tenant_balances(tmp_path) == {}
+
+
+def test_quoted_multiline_last_row_is_not_split(tmp_path: Path) -> None:
+    tx_path = tmp_path / "transactions.csv"
+    header = ",".join(TRANSACTIONS_HEADERS)
+    # The last row is mid-write inside a quoted note; its first line already ends in "\n".
+    tx_path.write_text(f'{header}\naaaaaaaA,tenA1a,,TOPUP,10,,,"a\n', encoding="utf-8")
+
+    assert compute_tenant_balances(tmp_path) == {"tenA1a": 10}
+    cp = json.loads((tmp_path / CREDITS_CHECKPOINT_NAME).read_text(encoding="utf-8"))
+    assert cp["rows_covered"] == 0 and cp["byte_offset"] == len(header) + 1
+
+    with tx_path.open("a", encoding="utf-8") as f:
+        f.write('b",\naaaaaaaB,tenA1a,,TOPUP,5\n')
+    assert compute_tenant_balances(tmp_path) == {"tenA1a": 15}
+    cp = json.loads((tmp_path / CREDITS_CHECKPOINT_NAME).read_text(encoding="utf-8"))
+    assert cp["rows_covered"] == 2 and cp["byte_offset"] == tx_path.stat().st_size
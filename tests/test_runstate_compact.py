@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+
+def test_compaction_keeps_latest_rows_and_archives_history(tmp_path: Path) -> None:
+    ensure_repo_on_path()
+
+    from platform.infra.adapters.runstate_compact import compact_runstate_logs
+    from platform.infra.adapters.runstate_csv import CsvRunStateStore
+    from platform.utils.csvio import read_csv
+
+    store = CsvRunStateStore(tmp_path)
+    store.create_run(tenant_id="t1", work_order_id="w1")
+    run = store.create_step_run(tenant_id="t1", work_order_id="w1", step_id="s1", module_id="m1", idempotency_key="k1")
+    store.mark_step_run_running(run.module_run_id)
+    store.mark_step_run_succeeded(run.module_run_id, requested_deliverables=["d1"])
+    store.set_run_status(tenant_id="t1", work_order_id="w1", status="COMPLETED")
+    before = store.list_step_runs("t1", "w1")
+
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    report = compact_runstate_logs(tmp_path, archive=True, now=now)
+    assert report["module_runs_log.csv"] == {"rows_before": 3, "rows_after": 1, "compacted": 1}
+    assert report["workorders_log.csv"]["rows_after"] == 1
+    assert report["outputs_log.csv"]["compacted"] == 0
+
+    # Readers resolve exactly the same state, and idempotent lookups still hit.
+    assert store.list_step_runs("t1", "w1") == before
+    again = store.create_step_run(tenant_id="t1", work_order_id="w1", step_id="s1", module_id="m1", idempotency_key="k1")
+    assert again.module_run_id == run.module_run_id
+    assert read_csv(tmp_path / "workorders_log.csv")[0]["status"] == "COMPLETED"
+
+    history = read_csv(tmp_path / "module_runs_log.history-20260301.csv")
+    assert [r["status"] for r in history] == ["CREATED", "RUNNING"]
+
+
+def test_compaction_thresholds_leave_small_logs_alone(tmp_path: Path) -> None:
+    ensure_repo_on_path()
+
+    from platform.infra.adapters.runstate_compact import compact_runstate_logs
+    from platform.infra.adapters.runstate_csv import CsvRunStateStore
+
+    store = CsvRunStateStore(tmp_path)
+    store.create_run(tenant_id="t1", work_order_id="w1")
+    store.set_run_status(tenant_id="t1", work_order_id="w1", status="COMPLETED")
+
+    assert compact_runstate_logs(tmp_path, min_bytes=1024 * 1024) == {}
+    report = compact_runstate_logs(tmp_path, min_superseded_ratio=0.9)
+    assert report["workorders_log.csv"] == {"rows_before": 2, "rows_after": 2, "compacted": 0}
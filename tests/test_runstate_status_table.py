@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from _testutil import ensure_repo_on_path
+
+
+def _stores(tmp_path: Path):
+    ensure_repo_on_path()
+
+    from platform.infra.adapters.runstate_csv import CsvRunStateStore
+    from platform.infra.adapters.runstate_sqlite import SqliteRunStateStore
+
+    return {
+        "csv": CsvRunStateStore(tmp_path / "csv"),
+        "sqlite": SqliteRunStateStore(tmp_path / "sqlite" / "runstate.sqlite"),
+    }
+
+
+@pytest.mark.parametrize("kind", ["csv", "sqlite"])
+def test_status_table_tracks_marks_and_rebuilds(tmp_path: Path, kind: str) -> None:
+    store = _stores(tmp_path)[kind]
+    assert store.get_run_status("t1", "w1") is None
+
+    store.create_run(tenant_id="t1", work_order_id="w1")
+    assert store.get_run_status("t1", "w1")["status"] == "CREATED"
+
+    r1 = store.create_step_run(tenant_id="t1", work_order_id="w1", step_id="s1", module_id="m1", idempotency_key="k1")
+    r2 = store.create_step_run(tenant_id="t1", work_order_id="w1", step_id="s2", module_id="m1", idempotency_key="k2")
+    store.mark_step_run_running(r1.module_run_id)
+    assert store.get_run_status("t1", "w1")["status"] == "RUNNING"
+
+    store.mark_step_run_succeeded(r1.module_run_id, requested_deliverables=[])
+    store.mark_step_run_failed(r2.module_run_id, {"reason_code": "x"})
+    row = store.get_run_status("t1", "w1")
+    assert row["status"] == "FAILED"
+    assert json.loads(row["step_statuses_json"]) == {"s1": "COMPLETED", "s2": "FAILED"}
+
+    store.set_run_status(tenant_id="t1", work_order_id="w1", status="partial")
+    live = store.get_run_status("t1", "w1")
+    assert live["status"] == "PARTIAL"
+
+    assert store.rebuild_status_table() == 1
+    rebuilt = store.get_run_status("t1", "w1")
+    assert (rebuilt["status"], rebuilt["step_statuses_json"]) == (live["status"], live["step_statuses_json"])
+
+
+def test_csv_status_updates_append_and_compact(tmp_path: Path, monkeypatch) -> None:
+    ensure_repo_on_path()
+
+    import platform.infra.adapters.runstate_status as runstate_status
+    from platform.infra.adapters.runstate_status import CsvStatusTable
+    from platform.utils.csvio import read_csv
+
+    monkeypatch.setattr(runstate_status, "COMPACT_MIN_ROWS", 6)
+    monkeypatch.setattr(runstate_status, "COMPACT_RATIO", 2)
+    path = tmp_path / "workorders_status.csv"
+    table = CsvStatusTable(path)
+    for i, st in enumerate(["CREATED", "RUNNING", "FAILED"]):
+        table.on_run_status("t1", "w1", st, f"2026-10-0{i + 1}T00:00:00Z")
+    table.on_run_status("t1", "w2", "RUNNING", "2026-10-01T00:00:00Z")
+    # Updates are appended; the last row per workorder wins.
+    assert len(read_csv(path)) == 4
+    assert CsvStatusTable(path).get("t1", "w1")["status"] == "FAILED"
+
+    for i in range(3):
+        table.on_run_status("t1", "w2", "COMPLETED", f"2026-10-0{i + 2}T00:00:00Z")
+    assert [(r["work_order_id"], r["status"]) for r in read_csv(path)] == [("w1", "FAILED"), ("w2", "COMPLETED")]
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from platform.billing.shard_merge import APPEND_ONLY_TABLES, CACHE_INDEX_HEADERS, TENANTS_CREDITS_HEADERS, merge_shard_states  # noqa: E402
+from platform.orchestration.sharding import in_shard, parse_shard, tenant_shard  # noqa: E402
+from platform.utils.csvio import read_csv, write_csv  # noqa: E402
+
+
+TX_HEADERS = APPEND_ONLY_TABLES["transactions.csv"][0]
+
+
+def _state(root: Path, credits: dict[str, int], txs: list[dict[str, str]], cache: list[dict[str, str]]) -> Path:
+    root.mkdir(parents=True, exist_ok=True)
+    write_csv(
+        root / "tenants_credits.csv",
+        [{"tenant_id": t, "credits_available": str(c), "updated_at": "2026-10-01T00:00:00Z", "status": "active"} for t, c in credits.items()],
+        TENANTS_CREDITS_HEADERS,
+    )
+    write_csv(root / "transactions.csv", txs, TX_HEADERS)
+    write_csv(root / "cache_index.csv", cache, CACHE_INDEX_HEADERS)
+    for name, (headers, _) in APPEND_ONLY_TABLES.items():
+        if not (root / name).exists():
+            write_csv(root / name, [], headers)
+    return root
+
+
+def _spend(tx_id: str, tenant_id: str, wo: str, amount: int, at: str) -> dict[str, str]:
+    meta = json.dumps({"idempotency_key": f"spend:{tenant_id}:{wo}"})
+    return {"transaction_id": tx_id, "tenant_id": tenant_id, "work_order_id": wo, "type": "SPEND",
+            "amount_credits": str(amount), "created_at": at, "metadata_json": meta}
+
+
+def _topup(tx_id: str, tenant_id: str, amount: int) -> dict[str, str]:
+    return {"transaction_id": tx_id, "tenant_id": tenant_id, "work_order_id": "", "type": "TOPUP",
+            "amount_credits": str(amount), "created_at": "2026-09-01T00:00:00Z", "metadata_json": "{}"}
+
+
+def test_parse_shard_and_stable_tenant_hash() -> None:
+    assert parse_shard("") is None
+    assert parse_shard("1/4") == (1, 4)
+    for bad in ("4/4", "x/2", "1"):
+        with pytest.raises(ValueError):
+            parse_shard(bad)
+    assert tenant_shard("tenA1a", 8) == tenant_shard("tenA1a", 8)
+    assert sum(in_shard("tenA1a", (i, 3)) for i in range(3)) == 1
+
+
+def test_merge_shards_matches_single_runner(tmp_path: Path) -> None:
+    base_tx = [
+        _topup("tttttttA", "tenA1a", 105),
+        _topup("tttttttB", "tenB1b", 50),
+        _spend("aaaaaaaA", "tenA1a", "woOldA", 5, "2026-10-01T00:00:00Z"),
+    ]
+    base_cache = [{"place": "cache", "type": "module_run", "ref": "k1", "created_at": "2026-10-01T00:00:00Z", "expires_at": "2026-10-08"}]
+    base = _state(tmp_path / "base", {"tenA1a": 100, "tenB1b": 50}, base_tx, base_cache)
+
+    a_new = _spend("bbbbbbbA", "tenA1a", "woNewA", 10, "2026-10-02T00:00:02Z")
+    b_new = _spend("cccccccC", "tenB1b", "woNewB", 7, "2026-10-02T00:00:01Z")
+    cache_a = base_cache + [{"place": "cache", "type": "module_run", "ref": "kA", "created_at": "2026-10-02T00:00:00Z", "expires_at": "2026-10-09"}]
+    # Shard B retried woOldA's spend (same idempotency key, different id) and pruned k1.
+    shard_a = _state(tmp_path / "a", {"tenA1a": 90, "tenB1b": 50}, base_tx + [a_new], cache_a)
+    shard_b = _state(tmp_path / "b", {"tenA1a": 100, "tenB1b": 43}, base_tx + [b_new, _spend("dddddddD", "tenA1a", "woOldA", 5, "2026-10-02T00:00:00Z")], [])
+
+    out = tmp_path / "merged"
+    merge_shard_states(base, [shard_b, shard_a], out)
+
+    assert [r["transaction_id"] for r in read_csv(out / "transactions.csv")] == ["tttttttA", "tttttttB", "aaaaaaaA", "cccccccC", "bbbbbbbA"]
+    assert {r["tenant_id"]: r["credits_available"] for r in read_csv(out / "tenants_credits.csv")} == {"tenA1a": "90", "tenB1b": "43"}
+    assert [r["ref"] for r in read_csv(out / "cache_index.csv")] == ["kA"]
+
+    # Shard order does not matter.
+    out2 = tmp_path / "merged2"
+    merge_shard_states(base, [shard_a, shard_b], out2)
+    for name in ("transactions.csv", "cache_index.csv"):
+        assert (out / name).read_bytes() == (out2 / name).read_bytes()
+    strip = lambda rows: [{k: v for k, v in r.items() if k != "updated_at"} for r in rows]  # noqa: E731
+    assert strip(read_csv(out / "tenants_credits.csv")) == strip(read_csv(out2 / "tenants_credits.csv"))
+
+
+def test_merge_recomputes_credits_and_unions_evidence(tmp_path: Path) -> None:
+    base = _state(tmp_path / "base", {"tenA1a": 999}, [_topup("tttttttA", "tenA1a", 20)], [])
+    shard = _state(tmp_path / "a", {"tenA1a": 999}, [_topup("tttttttA", "tenA1a", 20), _spend("bbbbbbbA", "tenA1a", "woNewA", 3, "2026-10-02T00:00:00Z")], [])
+    (shard / "runtime_evidence_zips").mkdir()
+    (shard / "runtime_evidence_zips" / "runtime_evidence__tenant=tenA1a__workorder=woNewA__x.zip").write_bytes(b"zip")
+
+    out = tmp_path / "merged"
+    report = merge_shard_states(base, [shard], out)
+
+    # The stale seeded balance is replaced by the ledger replay.
+    assert {r["tenant_id"]: r["credits_available"] for r in read_csv(out / "tenants_credits.csv")} == {"tenA1a": "17"}
+    assert report["runtime_evidence_zips"] == 1
+    assert (out / "runtime_evidence_zips" / "runtime_evidence__tenant=tenA1a__workorder=woNewA__x.zip").read_bytes() == b"zip"
+
+
+def test_merge_rejects_cross_shard_id_collision(tmp_path: Path) -> None:
+    base = _state(tmp_path / "base", {}, [], [])
+    a = _state(tmp_path / "a", {}, [_topup("tttttttX", "tenA1a", 5)], [])
+    b = _state(tmp_path / "b", {}, [_topup("tttttttX", "tenB1b", 9)], [])
+
+    with pytest.raises(ValueError, match="tttttttX"):
+        merge_shard_states(base, [a, b], tmp_path / "merged")
+    assert not (tmp_path / "merged").exists()
+
+
+def test_merge_rejects_conflicting_evidence_without_writing(tmp_path: Path) -> None:
+    base = _state(tmp_path / "base", {}, [], [])
+    shards = [_state(tmp_path / s, {}, [], []) for s in ("a", "b")]
+    for shard, blob in zip(shards, (b"one", b"two")):
+        (shard / "runtime_evidence_zips").mkdir()
+        (shard / "runtime_evidence_zips" / "runtime_evidence__x.zip").write_bytes(blob)
+
+    with pytest.raises(ValueError, match="runtime_evidence__x.zip"):
+        merge_shard_states(base, shards, tmp_path / "merged")
+    assert not (tmp_path / "merged").exists()
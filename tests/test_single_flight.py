@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+from platform.orchestration.single_flight import StepFlights  # noqa: E402
+
+
+def test_concurrent_identical_steps_execute_once(tmp_path: Path) -> None:
+    flights = StepFlights()
+    calls = []
+    results = {}
+
+    def step(i: int) -> None:
+        out_dir = tmp_path / f"run{i}"
+        out_dir.mkdir()
+
+        def execute() -> dict:
+            calls.append(i)
+            time.sleep(0.05)
+            (out_dir / "out.txt").write_text("payload", encoding="utf-8")
+            return {"status": "COMPLETED", "reason_slug": "", "report_path": "", "output_ref": ""}
+
+        results[i] = flights.run("v1|tenant=tenA1a|module=m|type=outputs|hash=abc", out_dir, execute)
+
+    threads = [threading.Thread(target=step, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sum(bool(r.get("_cache_hit")) for r in results.values()) == 3
+    assert all((tmp_path / f"run{i}" / "out.txt").read_text(encoding="utf-8") == "payload" for i in range(4))
+
+
+def test_failed_step_is_not_shared(tmp_path: Path) -> None:
+    flights = StepFlights()
+    statuses = iter(["FAILED", "COMPLETED"])
+    first = flights.run("k", tmp_path, lambda: {"status": next(statuses)})
+    second = flights.run("k", tmp_path, lambda: {"status": next(statuses)})
+    assert (first["status"], second["status"]) == ("FAILED", "COMPLETED")
+    assert flights.run("k", tmp_path / "again", lambda: {"status": "FAILED"})["_cache_hit"] is True
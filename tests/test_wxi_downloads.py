@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+
+import modules.wxi.src.run as wxi  # noqa: E402
+
+
+IMAGE_DELAY_S = 0.3
+
+
+class _Fixture(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:  # keep test output quiet
+        pass
+
+    def do_GET(self) -> None:
+        parts = urlsplit(self.path)
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        if parts.path == "/customsearch/v1":
+            start = int(parse_qs(parts.query)["start"][0])
+            items = []
+            if start == 1:
+                for i in range(10):
+                    link = f"{base}/img/{i}.jpg"
+                    if i == 9:
+                        link = f"{base}/img/0.jpg#again"  # same image as result 0
+                    if i == 8:
+                        link = f"{base}/huge.jpg"
+                    items.append({"title": f"r{i}", "link": link, "image": {"thumbnailLink": f"{base}/thumb/{i}.jpg"}})
+            body = json.dumps({"items": items}).encode("utf-8")
+            ctype = "application/json"
+        elif parts.path == "/huge.jpg":
+            body, ctype = b"x" * 5000, "image/jpeg"
+        else:
+            time.sleep(IMAGE_DELAY_S)
+            body, ctype = f"bytes of {parts.path}".encode("utf-8"), "image/jpeg"
+        self.server.hits.append(parts.path)  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def fixture_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Fixture)
+    server.hits = []  # type: ignore[attr-defined]
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_downloads_are_concurrent_deduplicated_and_ordered(tmp_path: Path, fixture_server, monkeypatch) -> None:
+    monkeypatch.setenv("GOOGLE_SEARCH_API_KEY", "k")
+    monkeypatch.setenv("GOOGLE_SEARCH_ENGINE_ID", "cx")
+    monkeypatch.setattr(wxi, "SEARCH_ENDPOINT", f"http://127.0.0.1:{fixture_server.server_port}/customsearch/v1")
+    monkeypatch.setattr(wxi, "MAX_DOWNLOAD_BYTES", 1000)
+
+    t0 = time.monotonic()
+    res = wxi.run(
+        params={"queries": ["cats"], "max_items_per_query": 10, "download_thumbnails": True, "download_images": True},
+        outputs_dir=tmp_path,
+    )
+    elapsed = time.monotonic() - t0
+    assert res["status"] == "COMPLETED"
+    # 18 delayed fetches (8 distinct images + 10 thumbnails) at 4 per host, not one at a time.
+    assert elapsed < 18 * IMAGE_DELAY_S / 2
+
+    images = [json.loads(line) for line in (tmp_path / "images" / "index.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [Path(e["url"]).name for e in images] == [f"{i}.jpg" for i in range(8)] + ["0.jpg#again"]
+    assert images[-1]["path"] == images[0]["path"]
+    assert fixture_server.hits.count("/img/0.jpg") == 1
+    assert not list((tmp_path / "images").glob("*.part"))
+
+    thumbs = [json.loads(line) for line in (tmp_path / "thumbnails" / "index.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [Path(e["url"]).name for e in thumbs] == [f"{i}.jpg" for i in range(10)]
+    assert (tmp_path / thumbs[3]["path"]).read_bytes() == b"bytes of /thumb/3.jpg"
+
+    report = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    assert report["downloaded_images"] == 9 and report["downloaded_thumbnails"] == 10
+
+
+def test_canonical_url() -> None:
+    assert wxi._canonical_url("HTTPS://Example.COM:443/a.jpg?x=1#f") == "https://example.com/a.jpg?x=1"
+    assert wxi._canonical_url("http://example.com:8080") == "http://example.com:8080/"
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from _testutil import ensure_repo_on_path
+
+ensure_repo_on_path()
+# run.py imports its sibling helper (wxz_paging.py) from src/, as module_exec arranges.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "modules" / "wxz" / "src"))
+
+import modules.wxz.src.run as wxz  # noqa: E402
+
+
+PAGE_DELAY_S = 0.3
+
+
+def _results(query: str) -> list:
+    # Query "b" starts with query "a"'s first ten pages, tagged with tracking params.
+    urls = [f"https://site.test/{query}/{i}" for i in range(30)]
+    if query == "b":
+        urls[:10] = [f"https://SITE.test/a/{i}?utm_source=x" for i in range(10)]
+    return urls
+
+
+class _FakeSearch(BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        qs = parse_qs(urlsplit(self.path).query)
+        query, start = qs["q"][0], int(qs["start"][0])
+        time.sleep(PAGE_DELAY_S)
+        page = _results(query)[start - 1 : start - 1 + 10]
+        body = json.dumps({"items": [{"link": u, "title": u} for u in page]}).encode("utf-8")
+        self.server.requests.append((query, start))  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture()
+def fake_search(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FakeSearch)
+    server.requests = []  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv("GOOGLE_SEARCH_API_KEY", "k")
+    monkeypatch.setenv("GOOGLE_SEARCH_ENGINE_ID", "cx")
+    monkeypatch.setattr(wxz, "SEARCH_ENDPOINT", f"http://127.0.0.1:{server.server_port}/customsearch/v1")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_queries_are_paged_concurrently_with_sequential_results(tmp_path: Path, fake_search) -> None:
+    t0 = time.monotonic()
+    wxz.run({"queries": ["a", "b", "c"], "max_items_per_query": 12}, str(tmp_path))
+    elapsed = time.monotonic() - t0
+
+    # Seven pages one after another would take 7 * PAGE_DELAY_S.
+    assert len(fake_search.requests) == 7
+    assert elapsed < 4 * PAGE_DELAY_S + 0.4
+
+    rows = [json.loads(line) for line in (tmp_path / "results.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [r["canonical_url"] for r in rows] == (
+        [f"https://site.test/a/{i}" for i in range(12)]
+        + [f"https://site.test/b/{i}" for i in range(10, 22)]
+        + [f"https://site.test/c/{i}" for i in range(12)]
+    )
+    stats = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))["per_query"]
+    assert [(s["written"], s["pages_requested"], s["fetched_items_total"]) for s in stats] == [
+        (12, 2, 13),
+        (12, 3, 23),
+        (12, 2, 13),
+    ]
+
+
+def test_token_bucket_spaces_requests_after_burst() -> None:
+    bucket = wxz.TokenBucket(rate=20.0, burst=2)
+    t0 = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - t0 >= 4 / 20.0 - 0.02
+
+
+def test_search_responses_are_served_from_the_shared_cache(tmp_path: Path, fake_search) -> None:
+    plat = {"search_cache_dir": str(tmp_path / "search_cache"), "cache_ttl_enabled": True, "cache_ttl_days": {"cache:search_response": 1}}
+    wxz.run({"queries": ["a"], "max_items_per_query": 12, "_platform": plat}, str(tmp_path / "first"))
+    assert len(fake_search.requests) == 2
+
+    # Same query modulo case and whitespace, different run: no API calls, same results.
+    wxz.run({"queries": ["  A "], "max_items_per_query": 12, "_platform": plat}, str(tmp_path / "second"))
+    assert len(fake_search.requests) == 2
+    first = [json.loads(line)["url"] for line in (tmp_path / "first" / "results.jsonl").read_text(encoding="utf-8").splitlines()]
+    second = [json.loads(line)["url"] for line in (tmp_path / "second" / "results.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert first == second
+    report = json.loads((tmp_path / "second" / "report.json").read_text(encoding="utf-8"))
+    assert report["search_cache"] == {"hits": 2, "misses": 0}
+    # The API key is not part of the stored request.
+    assert all("key" not in json.loads(p.read_text(encoding="utf-8"))["params"] for p in (tmp_path / "search_cache").rglob("*.json"))
+
+    # Expired entries go back to the API; no TTL rule means no cache at all.
+    for p in (tmp_path / "search_cache").rglob("*.json"):
+        entry = json.loads(p.read_text(encoding="utf-8"))
+        entry["stored_at"] -= 2 * 86400
+        p.write_text(json.dumps(entry), encoding="utf-8")
+    wxz.run({"queries": ["a"], "max_items_per_query": 12, "_platform": plat}, str(tmp_path / "third"))
+    assert len(fake_search.requests) == 4
+    wxz.run({"queries": ["a"], "max_items_per_query": 12, "_platform": {"search_cache_dir": plat["search_cache_dir"]}}, str(tmp_path / "fourth"))
+    assert len(fake_search.requests) == 6
+    # cache_ttl_policy.enabled=false disables the cache even with a TTL rule.
+    wxz.run({"queries": ["a"], "max_items_per_query": 12, "_platform": {**plat, "cache_ttl_enabled": False}}, str(tmp_path / "fifth"))
+    assert len(fake_search.requests) == 8
+
+
+def test_prune_removes_expired_search_responses(tmp_path: Path) -> None:
+    from platform.cache.search_responses import SearchResponseCache, prune_search_responses, search_ttl_days
+
+    cache = SearchResponseCache(tmp_path, ttl_days=1)
+    cache.put("/search", {"q": "old"}, {"items": []})
+    cache.put("/search", {"q": "new"}, {"items": []})
+    (old,) = [p for p in tmp_path.rglob("*.json") if json.loads(p.read_text(encoding="utf-8"))["params"]["q"] == "old"]
+    os.utime(old, (time.time() - 2 * 86400,) * 2)
+
+    assert prune_search_responses(tmp_path, 1) == 1
+    assert not old.exists() and len(list(tmp_path.rglob("*.json"))) == 1
+
+    rules = {"ttl_days_by_place_type": ["cache:module_run=7", "cache:search_response=3"]}
+    assert search_ttl_days({"cache_ttl_policy": {"enabled": True, **rules}}) == 3
+    assert search_ttl_days({"cache_ttl_policy": {"enabled": False, **rules}}) == 0
+    # Same parser as the orchestrator: malformed rules are rejected, not skipped.
+    with pytest.raises(ValueError):
+        search_ttl_days({"cache_ttl_policy": {"enabled": True, "ttl_days_by_place_type": ["cache:*=3"]}})
+
+
+def test_only_new_results_skips_urls_from_earlier_runs(tmp_path: Path, fake_search) -> None:
+    def _run(name: str, max_items: int) -> list:
+        params = {"queries": ["a"], "max_items_per_query": max_items, "only_new_results": True, "_platform": {"cache_dir": str(tmp_path / "state")}}
+        wxz.run(params, str(tmp_path / name))
+        lines = (tmp_path / name / "results.jsonl").read_text(encoding="utf-8").splitlines()
+        return [json.loads(line)["canonical_url"] for line in lines]
+
+    assert _run("first", 5) == [f"https://site.test/a/{i}" for i in range(5)]
+    assert (tmp_path / "state" / wxz.SEEN_URLS_FILE).stat().st_size == 5 * 8
+
+    # Known results are skipped and paging continues to fill the request with new ones.
+    assert _run("second", 12) == [f"https://site.test/a/{i}" for i in range(5, 17)]
+    assert len(fake_search.requests) == 3
+
+    # Page 1 is now entirely known, so the recurring run stops there.
+    assert _run("third", 12) == []
+    assert len(fake_search.requests) == 4
+    report = json.loads((tmp_path / "third" / "report.json").read_text(encoding="utf-8"))
+    assert report["only_new_results"] == {"requested": True, "active": True, "known_before": 17, "added": 0}
+    assert report["per_query"][0]["previously_seen"] == 10